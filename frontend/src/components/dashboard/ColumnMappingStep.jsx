@@ -31,7 +31,11 @@ export const ColumnMappingStep = ({ previewData, onSubmit, onBack, fileName }) =
         refine_name: true,
         keyword: true,
         category: true,
-        coupang: true
+        coupang: true,
+        economy: false,
+        cluster_variants: false,
+        fused_llm: false,
+        local_category: false
     });
     const [error, setError] = useState('');
     const [showSaveSuccess, setShowSaveSuccess] = useState(false);
@@ -260,6 +264,62 @@ export const ColumnMappingStep = ({ previewData, onSubmit, onBack, fileName }) =
                             <span className="text-sm font-medium text-foreground">쿠팡 카테고리 (신규)</span>
                         </label>
                     </div>
+                    <label className="flex items-start space-x-2 cursor-pointer pt-2 border-t border-border">
+                        <input
+                            type="checkbox"
+                            checked={processingOptions.economy}
+                            onChange={(e) => setProcessingOptions({ ...processingOptions, economy: e.target.checked })}
+                            className="w-4 h-4 mt-0.5 rounded border-gray-300 text-primary focus:ring-primary"
+                        />
+                        <span>
+                            <span className="text-sm font-medium text-foreground">절약 모드 (배치 처리)</span>
+                            <span className="block text-xs text-muted-foreground">
+                                50행 이상 작업의 AI 호출을 모아서 처리합니다. 비용이 줄지만 완료까지 오래 걸릴 수 있습니다.
+                            </span>
+                        </span>
+                    </label>
+                    <label className="flex items-start space-x-2 cursor-pointer">
+                        <input
+                            type="checkbox"
+                            checked={processingOptions.cluster_variants}
+                            onChange={(e) => setProcessingOptions({ ...processingOptions, cluster_variants: e.target.checked })}
+                            className="w-4 h-4 mt-0.5 rounded border-gray-300 text-primary focus:ring-primary"
+                        />
+                        <span>
+                            <span className="text-sm font-medium text-foreground">옵션 상품 묶어서 처리</span>
+                            <span className="block text-xs text-muted-foreground">
+                                색상/사이즈/수량만 다른 상품은 한 번만 분석하고 결과를 함께 적용합니다.
+                            </span>
+                        </span>
+                    </label>
+                    <label className="flex items-start space-x-2 cursor-pointer">
+                        <input
+                            type="checkbox"
+                            checked={processingOptions.fused_llm}
+                            onChange={(e) => setProcessingOptions({ ...processingOptions, fused_llm: e.target.checked })}
+                            className="w-4 h-4 mt-0.5 rounded border-gray-300 text-primary focus:ring-primary"
+                        />
+                        <span>
+                            <span className="text-sm font-medium text-foreground">AI 요청 합치기</span>
+                            <span className="block text-xs text-muted-foreground">
+                                상품명 가공과 검색용 변형 상품명 생성을 한 번의 AI 요청으로 처리해 속도를 높입니다.
+                            </span>
+                        </span>
+                    </label>
+                    <label className="flex items-start space-x-2 cursor-pointer">
+                        <input
+                            type="checkbox"
+                            checked={processingOptions.local_category}
+                            onChange={(e) => setProcessingOptions({ ...processingOptions, local_category: e.target.checked })}
+                            className="w-4 h-4 mt-0.5 rounded border-gray-300 text-primary focus:ring-primary"
+                        />
+                        <span>
+                            <span className="text-sm font-medium text-foreground">카테고리 자체 예측</span>
+                            <span className="block text-xs text-muted-foreground">
+                                확신이 높은 상품은 네이버 검색 없이 카테고리를 예측합니다. 빠르지만 드물게 다른 카테고리가 선택될 수 있습니다.
+                            </span>
+                        </span>
+                    </label>
                 </div>
 
                 <p className="text-foreground font-medium">열 선택</p>
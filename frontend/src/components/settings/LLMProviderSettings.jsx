@@ -13,6 +13,18 @@ export const LLMProviderSettings = ({ preferences, onChange, onSave, isSaving })
 
     const handleProviderChange = (provider) => {
         const updated = { ...localPreferences, llm_provider: provider };
+        if (localPreferences.llm_fallback_provider) {
+            // Failover 사용 중이면 보조 제공자를 항상 선택되지 않은 쪽으로 유지
+            updated.llm_fallback_provider = provider === 'gemini' ? 'openai' : 'gemini';
+        }
+        setLocalPreferences(updated);
+        setHasChanges(true);
+        if (onChange) onChange(updated);
+    };
+
+    const handleFallbackChange = (enabled) => {
+        const fallback = enabled ? (currentProvider === 'gemini' ? 'openai' : 'gemini') : null;
+        const updated = { ...localPreferences, llm_fallback_provider: fallback };
         setLocalPreferences(updated);
         setHasChanges(true);
         if (onChange) onChange(updated);
@@ -106,6 +118,22 @@ export const LLMProviderSettings = ({ preferences, onChange, onSave, isSaving })
                 ))}
             </div>
 
+            <label className="flex items-start gap-3 p-4 rounded-xl border border-border bg-card cursor-pointer">
+                <input
+                    type="checkbox"
+                    checked={!!localPreferences.llm_fallback_provider && localPreferences.llm_fallback_provider !== currentProvider}
+                    onChange={(e) => handleFallbackChange(e.target.checked)}
+                    className="w-4 h-4 mt-0.5 rounded border-gray-300 text-primary focus:ring-primary"
+                />
+                <div>
+                    <p className="text-sm font-semibold text-foreground">다른 제공자로 자동 전환 (Failover)</p>
+                    <p className="text-xs text-muted-foreground mt-1">
+                        선택한 제공자가 느리거나 오류가 반복되면 {currentProvider === 'gemini' ? 'OpenAI' : 'Gemini'} API 키로 자동 전환합니다.
+                        두 제공자의 API 키가 모두 설정되어 있어야 합니다.
+                    </p>
+                </div>
+            </label>
+
             <div className="flex items-center justify-end gap-3 pt-4 border-t border-border">
                 {hasChanges && (
                     <motion.div
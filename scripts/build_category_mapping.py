@@ -0,0 +1,26 @@
+"""
+카테고리 매핑 컴파일 명령
+- 매핑 엑셀 파일을 워커가 바로 로드할 수 있는 바이너리 파일로 변환 (배포/매핑 갱신 후 실행)
+
+실행: python scripts/build_category_mapping.py [매핑 파일 경로 ...]
+"""
+import os
+import sys
+import time
+
+# Add parent directory to path to import src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.category_mapping import compile_mapping, parse_mapping_file
+
+
+def build(source_path: str):
+    start = time.time()
+    mapping = parse_mapping_file(source_path)
+    target = compile_mapping(source_path, mapping)
+    print(f"{source_path} → {target}: {len(mapping)}개 카테고리 ({time.time() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or ["naver_category_mapping.xls"]:
+        build(path)
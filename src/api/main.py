@@ -27,6 +27,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("shutdown")
+def close_client_pool():
+    from src.client_pool import close_all
+    close_all()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Auto-Selp API"}
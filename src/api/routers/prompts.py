@@ -4,6 +4,7 @@ from typing import List, Optional, Dict
 from sqlalchemy.orm import Session
 from src.api.deps import get_current_user, get_db
 from src.api.models import User, Prompt
+from src.product_name_processor import get_refine_cache, refine_cache_scope
 
 router = APIRouter(prefix="/api/prompts", tags=["prompts"])
 
@@ -100,6 +101,18 @@ def validate_template_variables(prompt_type: str, content: str):
         )
 
 
+def invalidate_refine_cache(prompt_type: str, old_content: str):
+    """
+    상품명 프롬프트 내용이 바뀌거나 삭제되면 이전 내용으로 만든 정제 결과 캐시를 무효화.
+    기본 템플릿은 여러 사용자가 공유하므로 무효화하지 않음 (새 내용은 캐시 범위가 달라 자동으로 다시 정제됨)
+    """
+    if prompt_type != "product_name":
+        return
+    if any(d["content"] == old_content for d in DEFAULT_PROMPTS):
+        return
+    get_refine_cache().invalidate(refine_cache_scope(old_content))
+
+
 # ─── CRUD 엔드포인트 ─────────────────────────────────────────────
 
 @router.post("/", response_model=PromptResponse)
@@ -191,11 +204,15 @@ def update_prompt(prompt_id: str, prompt: PromptUpdate, user: User = Depends(get
         prompt_type = update_data.get("type", existing.type)
         validate_template_variables(prompt_type, update_data["content"])
 
+    old_type, old_content = existing.type, existing.content
     for key, value in update_data.items():
         setattr(existing, key, value)
         
     db.commit()
     db.refresh(existing)
+
+    if existing.content != old_content or existing.type != old_type:
+        invalidate_refine_cache(old_type, old_content)
     
     return {
         "id": str(existing.id), "user_id": str(existing.user_id), "type": existing.type,
@@ -211,8 +228,10 @@ def delete_prompt(prompt_id: str, user: User = Depends(get_current_user), db: Se
         raise HTTPException(status_code=404, detail="Prompt not found")
 
     # Delete
+    prompt_type, old_content = existing.type, existing.content
     db.delete(existing)
     db.commit()
+    invalidate_refine_cache(prompt_type, old_content)
     
     return {"message": "Prompt deleted"}
 
@@ -264,10 +283,12 @@ def reset_prompt_to_default(prompt_id: str, user: User = Depends(get_current_use
         raise HTTPException(status_code=404, detail="해당 타입의 기본 템플릿이 없습니다.")
 
     # 3. Update to default content
+    old_content = existing.content
     existing.title = default["title"]
     existing.content = default["content"]
     db.commit()
     db.refresh(existing)
+    invalidate_refine_cache(prompt_type, old_content)
 
     return {
         "id": str(existing.id), "user_id": str(existing.user_id), "type": existing.type,
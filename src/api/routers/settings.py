@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
 from src.api.deps import get_current_user, get_db
 from src.api.models import User, UserSettings
+from src.client_pool import attach_gemini_client, unpooled_client
 import os
 import google.generativeai as genai
 from cryptography.fernet import Fernet
@@ -252,10 +253,10 @@ async def test_api_connection(
             if not api_key:
                 raise HTTPException(status_code=400, detail="API 키가 필요합니다.")
             
-            # Gemini API 테스트
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel('gemini-flash-latest')
-            response = model.generate_content("Hello, test connection")
+            # Gemini API 테스트 (전역 설정을 바꾸지 않도록 키별 클라이언트 사용, 입력한 키는 풀에 보관하지 않음)
+            with unpooled_client("gemini", api_key) as client:
+                model = attach_gemini_client(genai.GenerativeModel('gemini-flash-latest'), client, api_key)
+                response = model.generate_content("Hello, test connection")
             
             return {"success": True, "message": "Gemini API 연결 성공"}
         except Exception as e:
@@ -279,23 +280,17 @@ async def test_api_connection(
                 if not api_key:
                     raise HTTPException(status_code=400, detail="유효한 API 키가 아닙니다.")
             
-            # OpenAI API 테스트
-            from openai import OpenAI
-            import httpx
-            
-            http_client = httpx.Client(
-                headers={"Content-Type": "application/json; charset=utf-8"},
-                timeout=10.0
-            )
-            
-            client = OpenAI(api_key=api_key, http_client=http_client)            # 테스트 요청
-            response = client.chat.completions.create(
-                model="gpt-5-nano",
-                messages=[
-                    {"role": "user", "content": "Hello"}
-                ],
-                max_completion_tokens=50
-            )
+            # OpenAI API 테스트 (입력한 키는 풀에 보관하지 않고 테스트 후 연결 종료)
+            with unpooled_client("openai", api_key) as client:
+                # 테스트 요청
+                response = client.chat.completions.create(
+                    model="gpt-5-nano",
+                    messages=[
+                        {"role": "user", "content": "Hello"}
+                    ],
+                    max_completion_tokens=50,
+                    timeout=10.0
+                )
             
             return {"success": True, "message": "OpenAI API 연결 성공"}
         except Exception as e:
@@ -1,19 +1,48 @@
 from src.api.database import get_db, SessionLocal
 from src.api.models import Job, Prompt, UserSettings
 from src.excel_handler import ExcelHandler
-from src.product_name_processor import ProductNameProcessor
-from src.keyword_processor import KeywordProcessor
-from src.category_processor import CategoryProcessor
-from src.coupang_category_processor import CoupangCategoryProcessor
-from src.llm_provider import get_llm_provider
-from src.user_settings_utils import get_user_api_key
+from src.name_clustering import cluster_rows, expand_cluster_results
+from src.product_name_processor import REFINE_BATCH_SIZE, REFINE_SCHEMA, ProductNameProcessor, RefineStats, get_refine_cache
+from src.keyword_processor import CURATION_SCHEMA, KeywordProcessor
+from src.category_processor import DEFAULT_CATEGORY_CONCURRENCY, CategoryProcessor, CategoryStats, get_naver_category_cache
+from src.coupang_category_processor import CoupangCategoryProcessor, CoupangStats, get_coupang_category_cache
+from src.llm_batch import BatchCancelled, LLMBatch, get_batch_backend
+from src.llm_metrics import METRICS_REGISTRY
+from src.llm_provider import TASK_CURATION, TASK_REFINE, FailoverLLMProvider, get_llm_provider, resolve_routing
+from src.user_settings_utils import decrypt_api_keys, get_user_api_key
 import os
 import time
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
-def process_chunk(chunk_id, data_chunk, job_id, user_id, meta_data, pn_prompt, kw_prompt, cat_processor, coupang_processor, llm_provider, processing_options=None, api_keys=None):
+# economy(배치) 처리를 적용할 최소 행 수. 이보다 작은 작업은 실시간 처리가 더 빠름
+ECONOMY_MIN_ROWS = 50
+
+
+def _build_result_item(item, refined_name, keywords, category_code, coupang_category_code, processing_options):
+    """활성화된 처리 옵션에 해당하는 결과 열만 담은 결과 행을 만듭니다."""
+    result_item = {
+        'row_index': item['row_index'],
+        'image_url': ''
+    }
+    
+    if processing_options.get("refine_name", True):
+         result_item['refined_name'] = refined_name
+         
+    if processing_options.get("keyword", True):
+         result_item['keywords'] = keywords
+         
+    if processing_options.get("category", True):
+         result_item['category_code'] = category_code
+
+    if processing_options.get("coupang", False):
+         result_item['coupang_category_code'] = coupang_category_code
+
+    return result_item
+
+
+def process_chunk(chunk_id, data_chunk, job_id, user_id, meta_data, pn_prompt, kw_prompt, cat_processor, coupang_processor, llm_provider, processing_options=None, api_keys=None, refine_stats=None):
     """
     Process a single chunk of data and update progress in the database.
     
@@ -27,16 +56,19 @@ def process_chunk(chunk_id, data_chunk, job_id, user_id, meta_data, pn_prompt, k
         kw_prompt: Keyword prompt
         cat_processor: Category processor instance
         llm_provider: LLM provider instance
+        refine_stats: 작업 전체에서 공유하는 상품명 정제 경로 집계기
     
     Returns:
         List of processed results
     """
     db = SessionLocal()
     try:
-        pn_processor = ProductNameProcessor(llm_provider=llm_provider)
-        kw_processor = KeywordProcessor(llm_provider=llm_provider, api_keys=api_keys)
+        pn_processor = ProductNameProcessor(llm_provider=llm_provider, stats=refine_stats, cache=get_refine_cache())
+        kw_processor = KeywordProcessor(llm_provider=llm_provider, api_keys=api_keys, shopping_search=cat_processor.shopping_search)
         
         results = []
+        refined_by_row = {}
+        category_by_row = {}
         total_in_chunk = len(data_chunk)
         
         # Update chunk status to processing
@@ -55,6 +87,10 @@ def process_chunk(chunk_id, data_chunk, job_id, user_id, meta_data, pn_prompt, k
         if processing_options is None:
             processing_options = {"refine_name": True, "keyword": True, "category": True, "coupang": False}
 
+        # fused 모드: 행마다 정제 + 변형 생성을 한 번의 요청으로 처리 (키워드 변형 생성 호출 생략)
+        fused = (processing_options.get("fused_llm", False) and processing_options.get("refine_name", True)
+                 and processing_options.get("keyword", True))
+
         for index, item in enumerate(data_chunk):
             # Check if job has been cancelled
             job = db.query(Job).filter(Job.id == job_id).first()
@@ -62,46 +98,46 @@ def process_chunk(chunk_id, data_chunk, job_id, user_id, meta_data, pn_prompt, k
                 print(f"Job {job_id} was cancelled by user (chunk {chunk_id})")
                 return results
             
+            # 다음 REFINE_BATCH_SIZE개 행의 상품명을 한 번에 정제 (LLM 요청 수 절감)
+            if not fused and processing_options.get("refine_name", True) and index % REFINE_BATCH_SIZE == 0:
+                window = [row for row in data_chunk[index:index + REFINE_BATCH_SIZE] if row.get('product_name', '').strip()]
+                refined_names = pn_processor.refine_many([row['product_name'] for row in window], prompt_template=pn_prompt)
+                refined_by_row.update(zip([row['row_index'] for row in window], refined_names))
+
+            # 같은 구간의 카테고리를 동시에 조회 (중복 상품명은 한 번만 검색)
+            if not fused and processing_options.get("category", True) and index % REFINE_BATCH_SIZE == 0:
+                window = [row for row in data_chunk[index:index + REFINE_BATCH_SIZE] if row.get('product_name', '').strip()]
+                names = [refined_by_row.get(row['row_index'], row['product_name']) for row in window]
+                category_by_row.update(zip([row['row_index'] for row in window], cat_processor.get_category_codes(names)))
+            
             p_name = item.get('product_name', '')
             current_row = item['row_index']
             
             if not p_name.strip():
                 continue
             
-            refined_name = p_name
-            if processing_options.get("refine_name", True):
-                refined_name = pn_processor.refine_product_name(p_name, prompt_template=pn_prompt)
+            variations = None
+            if fused:
+                refined_name, variations = pn_processor.refine_with_variations(p_name, prompt_template=pn_prompt)
+            else:
+                refined_name = refined_by_row.get(current_row, p_name)
             
             keywords = ""
             if processing_options.get("keyword", True):
-                keywords = kw_processor.process_keywords(refined_name, prompt_template=kw_prompt)
+                keywords = kw_processor.process_keywords(refined_name, prompt_template=kw_prompt, variations=variations)
             
             category_code = ""
             if processing_options.get("category", True):
-                category_code = cat_processor.get_category_code(refined_name)
+                category_code = category_by_row.get(current_row)
+                if category_code is None:
+                    category_code = cat_processor.get_category_code(refined_name)
 
             coupang_category_code = ""
             if processing_options.get("coupang", False) and coupang_processor:
                 coupang_category_code = coupang_processor.get_category_code(refined_name)
             
-            result_item = {
-                'row_index': item['row_index'],
-                'image_url': ''
-            }
-            
-            if processing_options.get("refine_name", True):
-                 result_item['refined_name'] = refined_name
-                 
-            if processing_options.get("keyword", True):
-                 result_item['keywords'] = keywords
-                 
-            if processing_options.get("category", True):
-                 result_item['category_code'] = category_code
-
-            if processing_options.get("coupang", False):
-                 result_item['coupang_category_code'] = coupang_category_code
-                 
-            results.append(result_item)
+            results.append(_build_result_item(item, refined_name, keywords, category_code,
+                                              coupang_category_code, processing_options))
             
             # Update chunk progress every 5 rows or at the end
             if (index + 1) % 5 == 0 or index == total_in_chunk - 1:
@@ -141,9 +177,242 @@ def process_chunk(chunk_id, data_chunk, job_id, user_id, meta_data, pn_prompt, k
         db.close()
 
 
+class JobCancelled(Exception):
+    """사용자가 작업을 취소함 (결과 파일을 만들지 않고 작업을 cancelled 상태로 끝냄)"""
+
+
+def _run_batch(db, job, meta_data, stage, batch, provider):
+    """
+    배치를 실행합니다. 배치 자체가 실패하면 빈 결과를 반환하여 실시간 호출로 보완하게 합니다.
+    제출한 배치 ID는 결과를 반영할 때까지(_clear_batch_id) meta_data["llm_batches"][stage]에 보관하여
+    그 사이 작업이 다시 실행되면 새로 제출하지 않고 이어서 기다립니다.
+
+    Raises:
+        JobCancelled: 기다리는 동안 작업이 취소된 경우 (배치도 취소)
+    """
+    batches = meta_data.setdefault("llm_batches", {})
+
+    def save_batch_id(batch_id):
+        batches[stage] = batch_id
+        job.meta_data = dict(meta_data)
+        db.commit()
+
+    def is_cancelled():
+        db.refresh(job)
+        return job.status == "cancelled"
+
+    backend = get_batch_backend(provider, should_cancel=is_cancelled, on_submit=save_batch_id,
+                                resume_batch_id=batches.get(stage))
+    try:
+        return batch.run(backend)
+    except BatchCancelled as e:
+        batches.pop(stage, None)
+        raise JobCancelled(f"economy batch: {e}") from e
+    except Exception as e:
+        # 실패/만료된 배치는 재실행 시 다시 제출
+        batches.pop(stage, None)
+        print(f"[WARNING] 배치 실행 실패, 실시간 호출로 처리합니다: {e}")
+        return {}
+
+
+def _clear_batch_id(db, job, meta_data, stage):
+    """배치 결과를 반영한 뒤 배치 ID를 지웁니다. (작업을 다시 실행하거나 재시도할 때 이전 배치 결과를 재사용하지 않도록)"""
+    if meta_data.get("llm_batches", {}).pop(stage, None) is not None:
+        job.meta_data = dict(meta_data)
+        db.commit()
+
+
+def _set_economy_progress(db, job, meta_data, progress):
+    """
+    economy 처리 진행률을 작업 및 청크 메타데이터에 반영합니다. (청크 구분 없이 작업 전체를 한 단위로 처리)
+
+    Raises:
+        JobCancelled: 작업이 취소된 경우
+    """
+    db.refresh(job)
+    if job.status == "cancelled":
+        raise JobCancelled("economy")
+
+    status = "completed" if progress >= 100 else "processing"
+    for chunk in meta_data.get("chunks", []):
+        chunk.update(status=status, progress=progress, last_updated=datetime.now().isoformat())
+    job.meta_data = dict(meta_data)
+    job.progress = progress
+    db.commit()
+    return True
+
+
+def process_economy(db, job, meta_data, data_list, pn_prompt, kw_prompt, cat_processor, coupang_processor, llm_provider, processing_options, api_keys, parallel_count=1, refine_stats=None):
+    """
+    economy 처리: 작업 전체의 상품명 정제/키워드 큐레이션 LLM 호출을 배치로 제출합니다.
+    
+    1) 정제 프롬프트 배치 → 2) 행별 키워드 후보 수집(네이버/쿠팡, 병렬) →
+    3) 큐레이션 프롬프트 배치 → 4) 카테고리 매칭 및 결과 조립.
+    배치 결과가 없는 행은 기존 실시간 호출로 처리합니다.
+    
+    Returns:
+        List of processed results
+
+    Raises:
+        JobCancelled: 처리 중 작업이 취소된 경우
+    """
+    pn_processor = ProductNameProcessor(llm_provider=llm_provider, stats=refine_stats, cache=get_refine_cache())
+    kw_processor = KeywordProcessor(llm_provider=llm_provider, api_keys=api_keys, shopping_search=cat_processor.shopping_search)
+    rows = [item for item in data_list if item.get('product_name', '').strip()]
+    use_llm = llm_provider.is_configured()
+    print(f"[ECONOMY] 배치 모드로 {len(rows)}행 처리")
+
+    # 1. 상품명 정제 배치 (규칙 정제만으로 끝나거나 캐시에 있는 행은 배치에서 제외)
+    refined = {item['row_index']: item['product_name'] for item in rows}
+    if processing_options.get("refine_name", True):
+        pending = {}
+        for item in rows:
+            cleaned_name, needs_llm = pn_processor.rule_refine(item['product_name'])
+            if not needs_llm:
+                refined[item['row_index']] = cleaned_name
+                continue
+            name = cleaned_name or item['product_name']
+            cached_name = pn_processor.get_cached(name, pn_prompt)
+            if cached_name is not None:
+                refined[item['row_index']] = cached_name
+            else:
+                pending[item['row_index']] = name
+
+        batch = LLMBatch()
+        if use_llm:
+            for row_index, name in pending.items():
+                batch.add(str(row_index), pn_processor.build_refine_prompt(name, pn_prompt), REFINE_SCHEMA)
+        results = _run_batch(db, job, meta_data, TASK_REFINE, batch, llm_provider.for_task(TASK_REFINE))
+        for row_index, name in pending.items():
+            result = results.get(str(row_index))
+            if result is not None:
+                refined[row_index] = pn_processor.parse_refined_name(result, name)
+                pn_processor.put_cached(name, refined[row_index], pn_prompt)
+            else:
+                refined[row_index] = pn_processor.refine_with_llm(name, prompt_template=pn_prompt, lookup_cache=False)
+        _clear_batch_id(db, job, meta_data, TASK_REFINE)
+
+    _set_economy_progress(db, job, meta_data, 30)
+
+    # 2~3. 키워드 후보 수집 후 큐레이션 배치
+    keywords = {}
+    if processing_options.get("keyword", True):
+        with ThreadPoolExecutor(max_workers=parallel_count) as executor:
+            candidates = dict(zip(
+                [item['row_index'] for item in rows],
+                executor.map(lambda item: kw_processor.prepare_keywords(refined[item['row_index']]), rows),
+            ))
+
+        _set_economy_progress(db, job, meta_data, 60)
+
+        batch = LLMBatch()
+        if use_llm:
+            for row_index, safe_data in candidates.items():
+                if safe_data:
+                    batch.add(str(row_index), kw_processor.build_curation_prompt(refined[row_index], safe_data, kw_prompt), CURATION_SCHEMA)
+        results = _run_batch(db, job, meta_data, TASK_CURATION, batch, llm_provider.for_task(TASK_CURATION))
+        for row_index, safe_data in candidates.items():
+            result = results.get(str(row_index))
+            if not safe_data:
+                keywords[row_index] = ""
+            elif result is not None:
+                keywords[row_index] = kw_processor.format_keywords(kw_processor.finalize_curation(safe_data, result))
+            else:
+                keywords[row_index] = kw_processor.curate_keywords(refined[row_index], safe_data, prompt_template=kw_prompt)
+        _clear_batch_id(db, job, meta_data, TASK_CURATION)
+
+    _set_economy_progress(db, job, meta_data, 80)
+
+    # 4. 카테고리 매칭 (LLM 미사용, 작업 전체를 한 번에 동시 조회) 및 결과 조립
+    category_codes = {}
+    if processing_options.get("category", True):
+        category_codes = dict(zip(
+            [item['row_index'] for item in rows],
+            cat_processor.get_category_codes([refined[item['row_index']] for item in rows], concurrency=max(parallel_count, DEFAULT_CATEGORY_CONCURRENCY)),
+        ))
+
+    def finish_row(item):
+        refined_name = refined[item['row_index']]
+        category_code = category_codes.get(item['row_index'], "")
+        coupang_category_code = ""
+        if processing_options.get("coupang", False) and coupang_processor:
+            coupang_category_code = coupang_processor.get_category_code(refined_name)
+        return _build_result_item(item, refined_name, keywords.get(item['row_index'], ""), category_code,
+                                  coupang_category_code, processing_options)
+
+    with ThreadPoolExecutor(max_workers=parallel_count) as executor:
+        all_results = list(executor.map(finish_row, rows))
+
+    _set_economy_progress(db, job, meta_data, 100)
+    return all_results
+
+
+def _job_api_key_names(processing_options):
+    """작업에서 켠 처리 단계가 사용하는 사용자 API 키 이름 (나머지 제공자의 키는 복호화하지 않음)"""
+    names = []
+    if processing_options.get("keyword", True):
+        # 검색광고 API + 시드 키워드용 쇼핑 검색
+        names += ["naver_api_key", "naver_secret_key", "naver_customer_id", "naver_client_id", "naver_client_secret"]
+    if processing_options.get("category", True):
+        names += ["naver_client_id", "naver_client_secret"]
+    if processing_options.get("coupang", False):
+        names += ["coupang_access_key", "coupang_secret_key"]
+    return list(dict.fromkeys(names))
+
+
+def _plan_variant_clusters(data_list, processing_options, meta_data):
+    """
+    옵션(색상/사이즈/수량)만 다른 행을 묶어 대표 행만 처리하도록 작업 목록을 만듭니다.
+    processing_options["cluster_variants"]를 켠 작업만 묶고, 기본은 모든 행을 각각 처리합니다.
+
+    Returns:
+        (클러스터 목록 또는 None, 처리할 행 목록)
+    """
+    if not processing_options.get("cluster_variants", False):
+        return None, data_list
+    clusters = cluster_rows(data_list)
+    work_list = [cluster.representative for cluster in clusters]
+    meta_data["stats"] = dict(meta_data.get("stats") or {},
+                              variants={"rows": len(data_list), "clusters": len(clusters)})
+    print(f"[CLUSTER] {len(data_list)}행 → 대표 {len(work_list)}행 처리")
+    return clusters, work_list
+
+
+def _update_job_stats(meta_data, llm_provider, refine_stats=None, category_stats=None, coupang_stats=None):
+    """작업 중 수집된 지표를 meta_data["stats"]에 기록합니다."""
+    stats = dict(meta_data.get("stats") or {})
+    if llm_provider is not None and llm_provider.metrics is not None:
+        stats["llm"] = llm_provider.metrics.snapshot()
+        print(f"[METRICS] LLM 호출 {stats['llm']['calls']}회, 오류 {stats['llm']['errors']}회, "
+              f"재시도 {stats['llm']['retries']}회, 토큰 {stats['llm']['prompt_tokens']}/{stats['llm']['completion_tokens']}")
+    # 워커 프로세스 누적 지표 (이 작업 이전 작업 포함, 모델별 p95/오류 추이 확인용)
+    stats["llm_process"] = METRICS_REGISTRY.snapshot()
+    if refine_stats is not None:
+        stats["product_name"] = refine_stats.snapshot()
+        print(f"[METRICS] 상품명 정제 {stats['product_name']['total']}건 중 "
+              f"규칙 정제 {stats['product_name']['rule_only']}건 (LLM 생략률 {stats['product_name']['skip_rate']:.1%}), "
+              f"캐시 적중 {stats['product_name']['cache_hits']}건")
+    if category_stats is not None:
+        stats["category"] = category_stats.snapshot()
+        print(f"[METRICS] 네이버 쇼핑 검색 {stats['category']['api_calls']}회, "
+              f"캐시 적중 {stats['category']['cache_hits']}건 (결과 없음 {stats['category']['negative_hits']}건), "
+              f"로컬 분류 {stats['category']['local_hits']}건")
+    if coupang_stats is not None and coupang_stats.lookups:
+        stats["coupang"] = coupang_stats.snapshot()
+        print(f"[METRICS] 쿠팡 카테고리 API {stats['coupang']['api_calls']}회, 재시도 {stats['coupang']['retries']}회, "
+              f"오류 {stats['coupang']['errors']}건, 평균 {stats['coupang']['latency_avg']}s, "
+              f"캐시 적중 {stats['coupang']['cache_hits']}건 (매칭실패 {stats['coupang']['negative_hits']}건), "
+              f"미스 {stats['coupang']['cache_misses']}건")
+    meta_data["stats"] = stats
+
+
 def process_excel_job(job_id: str, user_id: str, file_path: str):
     db = SessionLocal()
     start_time = time.time()
+    llm_provider = None
+    refine_stats = RefineStats()
+    category_stats = CategoryStats()
+    coupang_stats = CoupangStats()
     
     # 1. Fetch existing job metadata first
     job = db.query(Job).filter(Job.id == job_id).first()
@@ -204,35 +473,58 @@ def process_excel_job(job_id: str, user_id: str, file_path: str):
         user_settings = db.query(UserSettings).filter(UserSettings.user_id == user_id).first()
         llm_provider_type = "gemini"  # default
         llm_api_key = None
+        llm_fallback_type = None
+        llm_routing = None
         api_keys = {}
         
         if user_settings:
             preferences = user_settings.preferences or {}
-            api_keys = user_settings.api_keys or {}
+            # 처리기에는 이 작업에서 쓰는 사용자 키만 복호화해 전달 (없는 키는 각 처리기가 환경변수로 폴백)
+            api_keys = decrypt_api_keys(user_settings.api_keys, _job_api_key_names(processing_options))
             
             # Get LLM provider preference
             llm_provider_type = preferences.get("llm_provider", "gemini")
+            llm_fallback_type = preferences.get("llm_fallback_provider")
+            llm_routing = preferences.get("llm_routing")
             
             # Get API key based on provider type
             if llm_provider_type == "openai":
                 llm_api_key = get_user_api_key(db, user_id, "openai_api_key")
-                print(f"[DEBUG] OpenAI API Key 획득: {llm_api_key[:10] if llm_api_key and len(llm_api_key) >= 10 else llm_api_key}... (길이: {len(llm_api_key) if llm_api_key else 0})")
+                print(f"[DEBUG] OpenAI API Key 획득 (길이: {len(llm_api_key) if llm_api_key else 0})")
             elif llm_provider_type == "gemini":
                 llm_api_key = get_user_api_key(db, user_id, "gemini_api_key")
-                print(f"[DEBUG] Gemini API Key 획득: {llm_api_key[:10] if llm_api_key and len(llm_api_key) >= 10 else llm_api_key}... (길이: {len(llm_api_key) if llm_api_key else 0})")
+                print(f"[DEBUG] Gemini API Key 획득 (길이: {len(llm_api_key) if llm_api_key else 0})")
         
         # Create LLM provider instance
-        llm_provider = get_llm_provider(provider_type=llm_provider_type, api_key=llm_api_key)
-        print(f"Using LLM provider: {llm_provider_type}")
+        # 작업 종류(정제/변형/큐레이션)별 모델 라우팅 (preferences["llm_routing"]로 켠 경우에만, 기본은 선택한 모델)
+        llm_provider = get_llm_provider(provider_type=llm_provider_type, api_key=llm_api_key,
+                                        routing=resolve_routing(llm_provider_type, llm_routing))
+        print(f"Using LLM provider: {llm_provider_type} (routing: {getattr(llm_provider, 'routes', None)})")
+
+        # 보조 제공자가 설정되어 있으면 Hedged Request/Failover로 묶음
+        if llm_fallback_type and llm_fallback_type != llm_provider_type:
+            fallback_api_key = get_user_api_key(db, user_id, f"{llm_fallback_type}_api_key")
+            fallback_provider = get_llm_provider(provider_type=llm_fallback_type, api_key=fallback_api_key,
+                                                 routing=resolve_routing(llm_fallback_type, llm_routing))
+            if fallback_provider.is_configured():
+                llm_provider = FailoverLLMProvider([llm_provider, fallback_provider])
+                print(f"Using LLM fallback provider: {llm_fallback_type}")
+            else:
+                print(f"[WARNING] 보조 LLM 제공자({llm_fallback_type}) API 키가 없어 Failover를 사용하지 않습니다.")
 
         # 6. Initialize Processors
         excel_handler = ExcelHandler()
-        cat_processor = CategoryProcessor(mapping_file_path="naver_category_mapping.xls", api_keys=api_keys)
+        cat_processor = CategoryProcessor(mapping_file_path="naver_category_mapping.xls", api_keys=api_keys,
+                                          cache=get_naver_category_cache(), stats=category_stats,
+                                          use_classifier=processing_options.get("local_category", False))
         
-        # Initialize Coupang Processor
-        coupang_access_key = get_user_api_key(db, user_id, "coupang_access_key")
-        coupang_secret_key = get_user_api_key(db, user_id, "coupang_secret_key")
-        coupang_processor = CoupangCategoryProcessor(coupang_access_key, coupang_secret_key)
+        # Initialize Coupang Processor (쿠팡 매칭을 켠 작업만 키 조회)
+        coupang_access_key = coupang_secret_key = None
+        if processing_options.get("coupang", False):
+            coupang_access_key = api_keys.get("coupang_access_key") or get_user_api_key(db, user_id, "coupang_access_key")
+            coupang_secret_key = api_keys.get("coupang_secret_key") or get_user_api_key(db, user_id, "coupang_secret_key")
+        coupang_processor = CoupangCategoryProcessor(coupang_access_key, coupang_secret_key, stats=coupang_stats,
+                                                     cache=get_coupang_category_cache())
         
         # 6. Load Data
         data_list = excel_handler.load_excel(
@@ -247,56 +539,76 @@ def process_excel_job(job_id: str, user_id: str, file_path: str):
         job.meta_data = meta_data
         db.commit()
         
-        # 7. Split data into chunks
-        chunk_size = (total_rows + parallel_count - 1) // parallel_count  # Ceiling division
-        chunks_data = []
-        for i in range(parallel_count):
-            start_idx = i * chunk_size
-            end_idx = min((i + 1) * chunk_size, total_rows)
-            if start_idx < total_rows:
-                chunks_data.append(data_list[start_idx:end_idx])
-            else:
-                chunks_data.append([])
+        clusters, work_list = _plan_variant_clusters(data_list, processing_options, meta_data)
+        work_rows = len(work_list)
         
-        # 8. Process chunks in parallel
-        all_results = []
-        with ThreadPoolExecutor(max_workers=parallel_count) as executor:
-            futures = []
-            for chunk_id, data_chunk in enumerate(chunks_data):
-                if len(data_chunk) > 0:
-                    future = executor.submit(
-                        process_chunk,
-                        chunk_id,
-                        data_chunk,
-                        job_id,
-                        user_id,
-                        meta_data,
-                        pn_prompt,
-                        kw_prompt,
-                        cat_processor,
-                        coupang_processor,
-                        llm_provider,
-                        processing_options,
-                        api_keys
-                    )
-                    futures.append((chunk_id, future))
+        if processing_options.get("economy", False) and work_rows >= ECONOMY_MIN_ROWS:
+            # 7~8. economy: 정제/큐레이션 LLM 호출을 작업 단위 배치로 제출
+            meta_data["processing_mode"] = "economy"
+            all_results = process_economy(
+                db, job, meta_data, work_list, pn_prompt, kw_prompt, cat_processor, coupang_processor,
+                llm_provider, processing_options, api_keys, parallel_count, refine_stats
+            )
+        else:
+            # 7. Split data into chunks
+            chunk_size = (work_rows + parallel_count - 1) // parallel_count  # Ceiling division
+            chunks_data = []
+            for i in range(parallel_count):
+                start_idx = i * chunk_size
+                end_idx = min((i + 1) * chunk_size, work_rows)
+                if start_idx < work_rows:
+                    chunks_data.append(work_list[start_idx:end_idx])
+                else:
+                    chunks_data.append([])
+        
+            # 8. Process chunks in parallel
+            all_results = []
+            with ThreadPoolExecutor(max_workers=parallel_count) as executor:
+                futures = []
+                for chunk_id, data_chunk in enumerate(chunks_data):
+                    if len(data_chunk) > 0:
+                        future = executor.submit(
+                            process_chunk,
+                            chunk_id,
+                            data_chunk,
+                            job_id,
+                            user_id,
+                            meta_data,
+                            pn_prompt,
+                            kw_prompt,
+                            cat_processor,
+                            coupang_processor,
+                            llm_provider,
+                            processing_options,
+                            api_keys,
+                            refine_stats
+                        )
+                        futures.append((chunk_id, future))
             
-            # Wait for all chunks to complete and collect results
-            for chunk_id, future in futures:
-                try:
-                    chunk_results = future.result()
-                    all_results.extend(chunk_results)
+                # Wait for all chunks to complete and collect results
+                for chunk_id, future in futures:
+                    try:
+                        chunk_results = future.result()
+                        all_results.extend(chunk_results)
                     
-                    # Update overall progress
-                    completed_chunks = sum(1 for _, f in futures if f.done())
-                    overall_progress = int((completed_chunks / len(futures)) * 100)
+                        # Update overall progress
+                        completed_chunks = sum(1 for _, f in futures if f.done())
+                        overall_progress = int((completed_chunks / len(futures)) * 100)
                     
-                    job.progress = overall_progress
-                    db.commit()
+                        job.progress = overall_progress
+                        db.commit()
                     
-                except Exception as e:
-                    print(f"Error processing chunk {chunk_id}: {e}")
-                    raise
+                    except Exception as e:
+                        print(f"Error processing chunk {chunk_id}: {e}")
+                        raise
+
+        # 처리 중 취소된 작업은 일부 결과로 파일을 만들지 않음
+        db.refresh(job)
+        if job.status == "cancelled":
+            raise JobCancelled("chunks")
+
+        if clusters is not None:
+            all_results = expand_cluster_results(clusters, all_results)
 
         # 9. Sort results by row_index to maintain order
         all_results.sort(key=lambda x: x['row_index'])
@@ -305,15 +617,25 @@ def process_excel_job(job_id: str, user_id: str, file_path: str):
         output_path = excel_handler.save_results(file_path, all_results, column_mapping)
 
         meta_data["completed_at"] = datetime.now().isoformat()
+        _update_job_stats(meta_data, llm_provider, refine_stats, category_stats, coupang_stats)
         job.status = "completed"
         job.progress = 100
         job.output_file_path = output_path
         job.meta_data = meta_data
         db.commit()
 
+    except JobCancelled as e:
+        print(f"Job {job_id} was cancelled by user ({e})")
+        meta_data["cancelled_at"] = datetime.now().isoformat()
+        _update_job_stats(meta_data, llm_provider, refine_stats, category_stats, coupang_stats)
+        job.status = "cancelled"
+        job.meta_data = meta_data
+        db.commit()
+
     except Exception as e:
         print(f"Job Failed: {e}")
         meta_data["failed_at"] = datetime.now().isoformat()
+        _update_job_stats(meta_data, llm_provider, refine_stats, category_stats, coupang_stats)
         job.status = "failed"
         job.error_message = str(e)
         job.meta_data = meta_data
@@ -0,0 +1,199 @@
+"""
+로컬 카테고리 분류기
+- 카테고리 경로(매핑 파일)와 지금까지 확정된 (상품명 → 카테고리 코드) 예시로 문자 n-gram TF-IDF 색인을 만들고
+  가장 비슷한 문서들의 코드를 신뢰도와 함께 예측
+- 신뢰도가 충분하면 네이버 쇼핑 검색 없이 코드를 반환하고, 낮은 행만 API로 확인
+- 외부 라이브러리 없이 역색인(n-gram → 문서별 가중치)으로 구현
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.category_mapping import split_path
+from src.result_cache import normalize_key
+
+NGRAM_SIZES = (2, 3)
+# 예측 결과를 그대로 사용하는 최소 신뢰도 (이보다 낮으면 네이버 검색으로 확인)
+MIN_CONFIDENCE = float(os.getenv("CATEGORY_CLASSIFIER_MIN_CONFIDENCE", "0.6"))
+# 상위 몇 개 문서로 코드별 투표를 할지
+TOP_K = 5
+# 코드당 보관하는 상품명 예시 수 (색인 크기 제한)
+MAX_EXAMPLES_PER_CODE = 50
+# 새 예시가 이만큼 쌓이면 다음 예측 전에 색인을 다시 만듦
+REBUILD_EVERY = 200
+
+CATEGORY_EXAMPLES_PATH = os.getenv("CATEGORY_EXAMPLES_PATH", os.path.join("cache", "category_examples.sqlite3"))
+
+
+def char_ngrams(text: str) -> Counter:
+    """단어별 문자 2~3-gram 빈도 (단어 경계를 공백으로 표시)"""
+    grams = Counter()
+    for word in normalize_key(text).split():
+        padded = f" {word} "
+        for n in NGRAM_SIZES:
+            for i in range(len(padded) - n + 1):
+                grams[padded[i:i + n]] += 1
+    return grams
+
+
+class CategoryExampleStore:
+    """확정된 (상품명 → 카테고리 코드) 예시 저장소 (SQLite)"""
+
+    def __init__(self, path: str = CATEGORY_EXAMPLES_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS examples (name TEXT PRIMARY KEY, code TEXT, updated_at REAL)")
+
+    def add(self, name: str, code: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO examples VALUES (?, ?, ?)", (name, code, time.time()))
+
+    def all(self) -> List[Tuple[str, str]]:
+        """최근 예시부터 (상품명, 코드) 목록을 반환합니다."""
+        with self._lock:
+            return self._conn.execute("SELECT name, code FROM examples ORDER BY updated_at DESC").fetchall()
+
+
+class CategoryClassifier:
+    """문자 n-gram TF-IDF 최근접 문서 분류기"""
+
+    def __init__(self, categories: Iterable[Tuple[str, str]], store: Optional[CategoryExampleStore] = None):
+        """
+        Args:
+            categories: ("대>중>소>세", 코드) 목록 (공유 색인의 items() 등, 한 번만 순회)
+            store: 상품명 예시 저장소 (None이면 카테고리 경로만으로 분류)
+        """
+        self.store = store
+        self._lock = threading.Lock()
+        self._path_documents = []
+        for path, code in categories:
+            parts = split_path(path)
+            if parts:
+                # 말단 분류 이름이 가장 구체적이므로 한 번 더 넣어 가중치를 높임
+                self._path_documents.append((code, " ".join(parts + parts[-1:])))
+        self._examples: Dict[str, str] = {}
+        if store is not None:
+            try:
+                for name, code in reversed(store.all()):
+                    self._examples[normalize_key(name)] = code
+            except Exception as e:
+                print(f"[WARNING] 카테고리 예시 로드 실패: {e}")
+        self._pending = 0
+        self._build()
+
+    def _documents(self) -> Iterable[Tuple[str, str]]:
+        yield from self._path_documents
+        per_code = Counter()
+        for name, code in reversed(list(self._examples.items())):
+            per_code[code] += 1
+            if per_code[code] <= MAX_EXAMPLES_PER_CODE:
+                yield code, name
+
+    def _build(self):
+        """역색인을 만듭니다. (문서 벡터는 L2 정규화한 1+log(tf) × idf)"""
+        documents = list(self._documents())
+        doc_grams = [char_ngrams(text) for _, text in documents]
+        df = Counter()
+        for grams in doc_grams:
+            df.update(grams.keys())
+        total = len(documents)
+        idf = {gram: math.log((total + 1) / (count + 1)) + 1 for gram, count in df.items()}
+
+        postings = defaultdict(list)
+        for doc_id, grams in enumerate(doc_grams):
+            weights = {gram: (1 + math.log(tf)) * idf[gram] for gram, tf in grams.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for gram, weight in weights.items():
+                postings[gram].append((doc_id, weight / norm))
+
+        self._codes = [code for code, _ in documents]
+        self._idf = idf
+        self._postings = dict(postings)
+        self._pending = 0
+
+    def predict(self, product_name: str) -> Tuple[Optional[str], float]:
+        """
+        카테고리 코드를 예측합니다.
+
+        Returns:
+            (코드, 신뢰도 0~1) - 신뢰도는 최고 유사도 × 상위 문서 중 해당 코드의 유사도 비중
+        """
+        with self._lock:
+            if self._pending >= REBUILD_EVERY:
+                self._build()
+            postings, idf, codes = self._postings, self._idf, self._codes
+
+        grams = char_ngrams(product_name)
+        weights = {gram: (1 + math.log(tf)) * idf[gram] for gram, tf in grams.items() if gram in idf}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if not norm:
+            return None, 0.0
+
+        scores = defaultdict(float)
+        for gram, weight in weights.items():
+            for doc_id, doc_weight in postings[gram]:
+                scores[doc_id] += weight * doc_weight
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:TOP_K]
+
+        votes = defaultdict(float)
+        for doc_id, score in top:
+            votes[codes[doc_id]] += score
+        code = max(votes, key=votes.get)
+        best = max(score / norm for doc_id, score in top if codes[doc_id] == code)
+        return code, round(min(1.0, best) * votes[code] / sum(votes.values()), 3)
+
+    def add_example(self, product_name: str, code: str):
+        """API로 확정된 결과를 예시로 저장합니다. (색인에는 REBUILD_EVERY건마다 반영)"""
+        key = normalize_key(product_name)
+        if not key or self._examples.get(key) == code:
+            return
+        with self._lock:
+            self._examples.pop(key, None)
+            self._examples[key] = code
+            self._pending += 1
+        if self.store is not None:
+            try:
+                self.store.add(key, code)
+            except Exception as e:
+                print(f"[WARNING] 카테고리 예시 저장 실패: {e}")
+
+
+_classifiers: Dict[str, Tuple[int, CategoryClassifier]] = {}
+_classifiers_lock = threading.Lock()
+
+
+def get_category_classifier(mapping_key: str, categories: Callable[[], Iterable[Tuple[str, str]]],
+                            generation: int = 0) -> CategoryClassifier:
+    """
+    프로세스 공용 분류기를 반환합니다. (매핑별로 한 번만 색인을 만들고, 매핑 파일이 교체되면 다시 만듦)
+
+    Args:
+        mapping_key: 매핑 구분 키 (매핑 파일 경로)
+        categories: (경로, 코드) 목록을 반환하는 함수 (색인을 새로 만들 때만 호출)
+        generation: 매핑 색인 세대 (SharedCategoryIndex.generation, 바뀌면 색인을 다시 만듦)
+    """
+    with _classifiers_lock:
+        cached = _classifiers.get(mapping_key)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        if cached is not None:
+            # 학습한 예시 저장소는 그대로 사용
+            store = cached[1].store
+        else:
+            store = None
+            try:
+                store = CategoryExampleStore()
+            except Exception as e:
+                print(f"[WARNING] 카테고리 예시 저장소를 열 수 없습니다: {e}")
+        classifier = CategoryClassifier(categories(), store)
+        _classifiers[mapping_key] = (generation, classifier)
+        return classifier
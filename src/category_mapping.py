@@ -0,0 +1,396 @@
+"""
+네이버 카테고리 매핑 컴파일
+- naver_category_mapping.xls(카테고리번호, 대분류~세분류)를 {"대>중>소>세": 코드} 딕셔너리로 변환
+- 변환 결과와 조회 색인(경로, 말단 이름)을 원본 파일 옆 SQLite 파일(.mapping.sqlite3)로 저장해 두고,
+  원본의 mtime/크기/해시가 같으면 엑셀 파싱 없이 바로 사용 (워커 재시작 후 첫 작업의 수 초 지연 제거)
+- 워커 프로세스들은 이 파일을 읽기 전용 mmap으로 열어 페이지를 공유 (SharedCategoryIndex),
+  원본이 바뀌면 새 파일을 만든 뒤 os.replace로 교체하고 각 프로세스가 교체를 감지해 다시 엶
+- 빌드 명령: python scripts/build_category_mapping.py [매핑 파일 경로]
+- CategoryIndex: 경로 트리/말단 이름 색인으로 완전 일치하지 않는 경로를 O(깊이)로 조회
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 컴파일 결과 형식이 바뀌면 올려서 기존 파일을 다시 빌드
+ARTIFACT_VERSION = 2
+
+CATEGORY_COLUMNS = ['대분류', '중분류', '소분류', '세분류']
+
+# 공유 색인이 파일 교체 여부를 확인하는 간격(초)
+SWAP_CHECK_INTERVAL = 5.0
+# 읽기 전용 mmap 크기 (매핑 파일 전체가 들어가는 크기)
+MMAP_SIZE = 64 * 1024 * 1024
+
+
+def artifact_path(source_path: str) -> str:
+    """매핑 원본 파일에 대응하는 컴파일 결과 파일 경로"""
+    return f"{os.path.splitext(source_path)[0]}.mapping.sqlite3"
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_info(path: str) -> Dict:
+    stat = os.stat(path)
+    return {"mtime": repr(stat.st_mtime), "size": str(stat.st_size)}
+
+
+def parse_mapping_file(source_path: str) -> Dict[str, str]:
+    """매핑 엑셀 파일을 파싱합니다. (pandas/xlrd 필요, 수 초 소요)"""
+    import pandas as pd
+
+    # 컬럼: 카테고리번호, 대분류, 중분류, 소분류, 세분류
+    df = pd.read_excel(source_path)
+
+    mapping = {}
+    for row in df.to_dict("records"):
+        # 각 분류 컬럼을 가져와서 깨끗하게 정리
+        parts = []
+        for col in CATEGORY_COLUMNS:
+            val = row.get(col)
+            if pd.notna(val) and str(val).strip():
+                parts.append(str(val).strip())
+
+        if parts:
+            # 카테고리번호는 숫자인 경우가 많으므로 문자로 변환
+            code = str(row.get('카테고리번호', '')).strip()
+            if code:
+                mapping[">".join(parts)] = code
+    return mapping
+
+
+def compile_mapping(source_path: str, mapping: Optional[Dict[str, str]] = None) -> str:
+    """
+    매핑 파일을 컴파일해 저장합니다. (임시 파일에 쓴 뒤 교체하므로 읽는 프로세스는 항상 완전한 파일을 봄)
+
+    Args:
+        source_path: 매핑 엑셀 파일 경로
+        mapping: 이미 파싱한 매핑 (None이면 원본을 파싱)
+
+    Returns:
+        컴파일 결과 파일 경로
+    """
+    if mapping is None:
+        mapping = parse_mapping_file(source_path)
+    target = artifact_path(source_path)
+    temp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    meta = dict(_source_info(source_path), sha256=_file_hash(source_path), version=str(ARTIFACT_VERSION))
+
+    try:
+        conn = sqlite3.connect(temp_path)
+        try:
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE TABLE categories (path TEXT PRIMARY KEY, code TEXT, leaf TEXT)")
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+            rows = []
+            for path, code in mapping.items():
+                parts = split_path(path)
+                if parts:
+                    rows.append((">".join(parts), code, parts[-1]))
+            conn.executemany("INSERT OR REPLACE INTO categories VALUES (?, ?, ?)", rows)
+            conn.execute("CREATE INDEX categories_leaf ON categories (leaf)")
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(temp_path, target)
+    except BaseException:
+        # 쓰다 만 임시 파일은 남기지 않음
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return target
+
+
+def _try_compile(source_path: str, mapping: Dict[str, str]) -> Optional[str]:
+    """컴파일 결과를 저장합니다. (디렉터리에 쓸 수 없는 등 저장에 실패하면 경고 후 None)"""
+    try:
+        return compile_mapping(source_path, mapping)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARNING] 카테고리 매핑 컴파일 파일 저장 실패: {e}")
+        return None
+
+
+def _read_meta(target: str) -> Optional[Dict[str, str]]:
+    try:
+        conn = sqlite3.connect(f"file:{target}?mode=ro", uri=True)
+        try:
+            return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[WARNING] 카테고리 매핑 컴파일 파일을 읽을 수 없습니다: {e}")
+        return None
+
+
+def is_artifact_fresh(source_path: str) -> bool:
+    """원본과 일치하는 컴파일 결과가 있는지 확인합니다."""
+    target = artifact_path(source_path)
+    if not os.path.exists(target):
+        return False
+    meta = _read_meta(target)
+    if meta is None or meta.get("version") != str(ARTIFACT_VERSION):
+        return False
+
+    info = _source_info(source_path)
+    if info == {"mtime": meta["mtime"], "size": meta["size"]}:
+        return True
+    # 배포 등으로 mtime만 바뀐 경우 내용 해시로 한 번 더 확인
+    return info["size"] == meta["size"] and _file_hash(source_path) == meta["sha256"]
+
+
+def prepare_mapping(source_path: str) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+    """
+    조회 색인을 만들 재료를 준비합니다. 컴파일 결과가 없거나 원본이 바뀌었으면 엑셀을 한 번 파싱해 다시 만듭니다.
+
+    Returns:
+        (컴파일 결과 파일 경로, None) 또는 컴파일 파일을 저장할 수 없으면 (None, 파싱한 매핑)
+    """
+    if is_artifact_fresh(source_path):
+        return artifact_path(source_path), None
+    print(f"[LOAD] 매핑 파일 컴파일 시작: {source_path}")
+    mapping = parse_mapping_file(source_path)
+    target = _try_compile(source_path, mapping)
+    return (target, None) if target is not None else (None, mapping)
+
+
+def _read_mapping(target: str) -> Dict[str, str]:
+    conn = sqlite3.connect(f"file:{target}?mode=ro", uri=True)
+    try:
+        return dict(conn.execute("SELECT path, code FROM categories").fetchall())
+    finally:
+        conn.close()
+
+
+def load_mapping(source_path: str) -> Dict[str, str]:
+    """
+    카테고리 매핑을 딕셔너리로 로드합니다. 컴파일 결과가 최신이면 그대로 쓰고,
+    없거나 원본이 바뀌었으면 엑셀을 파싱한 뒤 다시 컴파일해 둡니다.
+    """
+    if is_artifact_fresh(source_path):
+        print(f"[LOAD] 컴파일된 카테고리 매핑 사용: {artifact_path(source_path)}")
+        return _read_mapping(artifact_path(source_path))
+
+    print(f"[LOAD] 매핑 파일 로드 시작: {source_path}")
+    mapping = parse_mapping_file(source_path)
+    _try_compile(source_path, mapping)
+    return mapping
+
+
+class _TrieNode:
+    __slots__ = ("children", "code")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.code: Optional[str] = None
+
+
+def split_path(path: str) -> List[str]:
+    """카테고리 경로("대>중>소>세")를 분류 이름 리스트로 나눕니다."""
+    return [part.strip() for part in path.split(">") if part.strip()]
+
+
+def _shared_prefix(candidate_parts: List[str], parts: List[str]) -> int:
+    count = 0
+    for a, b in zip(candidate_parts, parts):
+        if a != b:
+            break
+        count += 1
+    return count
+
+
+class _CategoryLookup(ABC):
+    """카테고리 경로 → 코드 조회 규칙 (저장 방식은 하위 클래스에서 구현)"""
+
+    # 색인 세대 (교체되는 색인만 덮어씀, 바뀌면 전체 목록으로 만든 파생 데이터를 다시 만듦)
+    generation: int = 0
+
+    @abstractmethod
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """(경로, 코드) 목록"""
+        pass
+
+    @abstractmethod
+    def exact(self, path: str) -> Optional[str]:
+        """경로가 완전히 일치하는 카테고리 코드 (없으면 None)"""
+        pass
+
+    @abstractmethod
+    def leaf_candidates(self, leaf: str) -> List[Tuple[List[str], str]]:
+        """말단 이름이 leaf인 카테고리의 (분류 이름 리스트, 코드) 목록 (매핑 파일 순서)"""
+        pass
+
+    @abstractmethod
+    def longest_prefix(self, parts: List[str]) -> Tuple[Optional[str], int]:
+        """경로상 코드가 있는 가장 깊은 카테고리 (코드, 깊이)"""
+        pass
+
+    def resolve(self, path: str) -> Optional[str]:
+        """
+        네이버 쇼핑 카테고리 경로에 해당하는 코드를 찾습니다.
+
+        1) 경로 완전 일치
+        2) 말단 이름이 같은 카테고리 중 대분류부터 일치하는 단계가 가장 많은 것
+           (같으면 매핑 파일에서 먼저 나온 것)
+        3) 경로상 가장 깊은 상위 카테고리
+
+        Returns:
+            카테고리 코드 (찾지 못하면 None)
+        """
+        parts = split_path(path)
+        if not parts:
+            return None
+        code = self.exact(">".join(parts))
+        if code is not None:
+            return code
+
+        ancestor_code, _ = self.longest_prefix(parts)
+        candidates = self.leaf_candidates(parts[-1])
+        if candidates:
+            # min은 같은 값 중 처음 것을 반환하므로 동수면 매핑 파일 순서
+            best_parts, best_code = min(candidates, key=lambda c: -_shared_prefix(c[0], parts))
+            # 대분류부터 다른 동명 카테고리보다는 같은 대분류의 상위 카테고리를 우선
+            if _shared_prefix(best_parts, parts) > 0 or ancestor_code is None:
+                return best_code
+        return ancestor_code
+
+
+class CategoryIndex(_CategoryLookup):
+    """
+    카테고리 매핑 메모리 조회 색인 (로드 시 1회 생성)
+    - 경로 트리(trie): 일치하는 가장 깊은 상위 카테고리를 O(깊이)로 찾음
+    - 말단 이름 → (경로, 코드) 목록: 중간 분류 이름만 다른 같은 카테고리를 찾음
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping = mapping
+        self.root = _TrieNode()
+        self.by_leaf: Dict[str, List[Tuple[List[str], str]]] = {}
+        for path, code in mapping.items():
+            parts = split_path(path)
+            if not parts:
+                continue
+            node = self.root
+            for part in parts:
+                node = node.children.setdefault(part, _TrieNode())
+            node.code = code
+            self.by_leaf.setdefault(parts[-1], []).append((parts, code))
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        return iter(self.mapping.items())
+
+    def exact(self, path: str) -> Optional[str]:
+        return self.mapping.get(path)
+
+    def leaf_candidates(self, leaf: str) -> List[Tuple[List[str], str]]:
+        return self.by_leaf.get(leaf, [])
+
+    def longest_prefix(self, parts: List[str]) -> Tuple[Optional[str], int]:
+        """경로를 따라 내려가며 코드가 있는 가장 깊은 카테고리를 찾습니다. (코드, 깊이)"""
+        node, best = self.root, (None, 0)
+        for depth, part in enumerate(parts, start=1):
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.code is not None:
+                best = (node.code, depth)
+        return best
+
+
+class SharedCategoryIndex(_CategoryLookup):
+    """
+    컴파일된 SQLite 파일을 읽기 전용 mmap으로 조회하는 색인.
+    여러 워커 프로세스가 같은 파일 페이지를 공유하므로 프로세스마다 매핑을 복사해 두지 않음.
+    파일이 os.replace로 교체되면 (SWAP_CHECK_INTERVAL마다 확인) 스레드별 연결을 다시 엶.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._file_id = self._stat_id()
+        self._checked_at = time.monotonic()
+        self._generation = 0
+        self._mapping: Optional[Dict[str, str]] = None
+
+    def _stat_id(self) -> Tuple[int, float]:
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime
+
+    def _check_swap(self):
+        now = time.monotonic()
+        if now - self._checked_at < SWAP_CHECK_INTERVAL:
+            return
+        with self._lock:
+            self._checked_at = now
+            file_id = self._stat_id()
+            if file_id != self._file_id:
+                print(f"[LOAD] 카테고리 매핑 파일 교체 감지: {self.path}")
+                self._file_id = file_id
+                self._generation += 1
+                self._mapping = None
+
+    def _conn(self) -> sqlite3.Connection:
+        self._check_swap()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            if conn is not None:
+                conn.close()
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            self._local.conn, self._local.generation = conn, self._generation
+        return conn
+
+    @property
+    def mapping(self) -> Dict[str, str]:
+        """전체 매핑 딕셔너리 (분류기 학습 등 전체 목록이 필요할 때만 읽음)"""
+        conn = self._conn()
+        if self._mapping is None:
+            self._mapping = dict(conn.execute("SELECT path, code FROM categories").fetchall())
+        return self._mapping
+
+    @property
+    def generation(self) -> int:
+        """파일 교체 횟수 (교체를 감지하면 증가, 전체 목록으로 만든 파생 데이터의 갱신 기준)"""
+        self._check_swap()
+        return self._generation
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM categories").fetchone()[0]
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """(경로, 코드) 목록을 딕셔너리로 복사하지 않고 파일에서 차례로 읽습니다."""
+        yield from self._conn().execute("SELECT path, code FROM categories")
+
+    def exact(self, path: str) -> Optional[str]:
+        row = self._conn().execute("SELECT code FROM categories WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def leaf_candidates(self, leaf: str) -> List[Tuple[List[str], str]]:
+        # rowid는 컴파일 시 매핑 순서대로 부여됨
+        rows = self._conn().execute("SELECT path, code FROM categories WHERE leaf = ? ORDER BY rowid",
+                                    (leaf,)).fetchall()
+        return [(split_path(path), code) for path, code in rows]
+
+    def longest_prefix(self, parts: List[str]) -> Tuple[Optional[str], int]:
+        """가장 긴 경로부터 상위로 올라가며 코드가 있는 카테고리를 찾습니다. (코드, 깊이)"""
+        for depth in range(len(parts), 0, -1):
+            code = self.exact(">".join(parts[:depth]))
+            if code is not None:
+                return code, depth
+        return None, 0
@@ -1,111 +1,196 @@
-import pandas as pd
-import requests
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
+from src.category_classifier import MIN_CONFIDENCE, CategoryClassifier, get_category_classifier
+from src.category_mapping import CategoryIndex, SharedCategoryIndex, load_mapping, prepare_mapping
+from src.result_cache import ResultCache, get_result_cache
+from src.shopping_search import SHOPPING_SEARCH_CACHE_TTL, ShoppingSearch
 
 load_dotenv()
 
+# 네이버 쇼핑 검색 결과 캐시 (ShoppingSearch가 카테고리/키워드 시드용으로 공유)
+NAVER_CATEGORY_CACHE_NAMESPACE = "naver_category"
+# get_category_codes 기본 동시 요청 수
+DEFAULT_CATEGORY_CONCURRENCY = 4
+
+# 로컬 분류기 학습에 함께 쓰는 추가 카테고리 파일 (매핑 파일과 같은 컬럼 형식)
+CLASSIFIER_EXTRA_MAPPINGS = ["naver_mycate.xls"]
+
+
+class CategoryStats:
+    """카테고리 검색 경로별 처리 건수 (스레드 안전, 작업 단위로 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.api_calls = 0      # 네이버 쇼핑 검색 API 호출 건수
+        self.cache_hits = 0     # 캐시에서 카테고리를 찾은 건수
+        self.negative_hits = 0  # "검색 결과 없음"으로 캐시되어 호출을 생략한 건수
+        self.local_hits = 0     # 로컬 분류기 예측으로 검색을 생략한 건수
+
+    def record(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self) -> Dict:
+        """meta_data["stats"]["category"]에 기록할 딕셔너리를 반환합니다."""
+        with self._lock:
+            return {
+                "api_calls": self.api_calls,
+                "cache_hits": self.cache_hits,
+                "negative_hits": self.negative_hits,
+                "local_hits": self.local_hits,
+            }
+
+
 class CategoryProcessor:
     # Class-level cache for mapping data to avoid reloading heavily
     _mapping_cache = {}
+    _mapping_lock = threading.Lock()
 
-    def __init__(self, mapping_file_path: str = "naver_category_mapping.xls", api_keys: dict = None):
+    def __init__(self, mapping_file_path: str = "naver_category_mapping.xls", api_keys: dict = None,
+                 cache: Optional[ResultCache] = None, stats: Optional[CategoryStats] = None,
+                 use_classifier: bool = False, shopping_search: Optional[ShoppingSearch] = None):
+        """
+        Args:
+            mapping_file_path: 네이버 카테고리 매핑 파일 경로
+            api_keys: 사용자 API 키 (naver_client_id, naver_client_secret)
+            cache: 쇼핑 검색 결과 캐시 (None이면 캐시 사용 안 함, 작업에서는 get_naver_category_cache())
+            stats: 검색 경로 집계기 (None이면 새로 생성)
+            use_classifier: 로컬 분류기 예측 신뢰도가 높으면 네이버 검색을 생략
+            shopping_search: KeywordProcessor와 공유하는 쇼핑 검색 조회기 (None이면 api_keys/cache로 생성)
+        """
         if api_keys is None:
             api_keys = {}
         self.naver_client_id = api_keys.get("naver_client_id") or os.getenv("NAVER_CLIENT_ID")
         self.naver_client_secret = api_keys.get("naver_client_secret") or os.getenv("NAVER_CLIENT_SECRET")
         
         self.mapping_file_path = mapping_file_path
-        self.category_mapping = self._load_mapping_file()
+        self._category_index = None
+        self.stats = stats or CategoryStats()
+        if shopping_search is None:
+            shopping_search = ShoppingSearch(self.naver_client_id, self.naver_client_secret, cache=cache, stats=self.stats)
+        self.shopping_search = shopping_search
+        self.use_classifier = use_classifier
+
+    @property
+    def category_index(self):
+        """매핑 조회 색인 (카테고리 매칭을 처음 사용할 때 로드)"""
+        if self._category_index is None:
+            self._category_index = self._load_mapping_file()
+        return self._category_index
+
+    @property
+    def category_mapping(self):
+        """매핑 딕셔너리 {"대>중>소>세": 코드}"""
+        return self.category_index.mapping
+
+    @property
+    def classifier(self) -> CategoryClassifier:
+        """로컬 카테고리 분류기 (프로세스 공용, 처음 사용할 때와 매핑 파일이 교체됐을 때 색인 생성)"""
+        index = self.category_index
+        return get_category_classifier(self.mapping_file_path, lambda: self._classifier_categories(index),
+                                       index.generation)
+
+    def _classifier_categories(self, index) -> Iterator[Tuple[str, str]]:
+        """분류기 학습용 (경로, 코드) 목록 (매핑 색인 + 추가 카테고리 파일 중 색인에 없는 경로)"""
+        yield from index.items()
+        for path in CLASSIFIER_EXTRA_MAPPINGS:
+            if os.path.exists(path) and path != self.mapping_file_path:
+                try:
+                    extra = load_mapping(path)
+                except Exception as e:
+                    print(f"[WARNING] 분류기용 카테고리 파일 로드 실패 ({path}): {e}")
+                    continue
+                for category_path, code in extra.items():
+                    if index.exact(category_path) is None:
+                        yield category_path, code
 
     def _load_mapping_file(self):
-        """매핑 엑셀 파일을 로드하여 딕셔너리로 변환 (캐싱 적용)"""
+        """
+        매핑 조회 색인을 로드합니다.
+        컴파일 파일(읽기 전용 mmap, 워커 프로세스 간 공유)을 우선 사용하고, 만들 수 없으면 메모리 색인을 사용합니다.
+        """
         if not os.path.exists(self.mapping_file_path):
             print(f"[WARNING] 매핑 파일이 없습니다: {self.mapping_file_path}")
-            return {}
-            
-        # Check cache first
-        if self.mapping_file_path in CategoryProcessor._mapping_cache:
-            print(f"[CACHE] 매핑 파일 캐시 사용: {self.mapping_file_path}")
-            return CategoryProcessor._mapping_cache[self.mapping_file_path]
-            
-        try:
-            print(f"[LOAD] 매핑 파일 로드 시작: {self.mapping_file_path}")
-            # 엑셀 파일 로드 (파일명: naver_category_mapping.xls)
-            # 컬럼: 카테고리번호, 대분류, 중분류, 소분류, 세분류
-            df = pd.read_excel(self.mapping_file_path)
+            return CategoryIndex({})
             
-            mapping = {}
-            for _, row in df.iterrows():
-                # 각 분류 컬럼을 가져와서 깨끗하게 정리
-                parts = []
-                for col in ['대분류', '중분류', '소분류', '세분류']:
-                    val = row.get(col)
-                    if pd.notna(val) and str(val).strip():
-                        parts.append(str(val).strip())
+        with CategoryProcessor._mapping_lock:
+            cached = CategoryProcessor._mapping_cache.get(self.mapping_file_path)
+            if isinstance(cached, CategoryIndex):
+                # 컴파일 파일 없이 메모리에 로드한 색인은 그대로 사용 (엑셀 재파싱 방지)
+                return cached
+
+            try:
+                # 원본이 바뀌었으면 다시 컴파일해 교체 (다른 프로세스의 공유 색인은 교체를 감지해 다시 엶)
+                # 컴파일 파일을 저장할 수 없으면 이미 파싱한 매핑으로 메모리 색인을 만듦
+                artifact, mapping = prepare_mapping(self.mapping_file_path)
+                if artifact is not None and cached is not None:
+                    return cached
+                index = SharedCategoryIndex(artifact) if artifact is not None else CategoryIndex(mapping)
+                print(f"카테고리 매핑 {len(index)}개 로드 완료")
                 
-                if parts:
-                    full_path = ">".join(parts)
-                    # 카테고리번호는 숫자인 경우가 많으므로 문자로 변환
-                    code = str(row.get('카테고리번호', '')).strip()
-                    if code:
-                        mapping[full_path] = code
-            
-            print(f"카테고리 매핑 {len(mapping)}개 로드 완료")
-            
-            # Save to cache
-            CategoryProcessor._mapping_cache[self.mapping_file_path] = mapping
-            return mapping
-        except Exception as e:
-            print(f"매핑 파일 로드 실패: {e}")
-            return {}
+                # Save to cache
+                CategoryProcessor._mapping_cache[self.mapping_file_path] = index
+                return index
+            except Exception as e:
+                print(f"매핑 파일 로드 실패: {e}")
+                return cached if cached is not None else CategoryIndex({})
+
+    def get_category_codes(self, names: List[str], concurrency: int = DEFAULT_CATEGORY_CONCURRENCY) -> List[str]:
+        """
+        여러 상품명의 카테고리 코드를 한 번에 찾습니다.
+        중복 상품명은 한 번만 조회하고, 캐시/로컬 분류로 끝나지 않는 상품명은
+        공용 세션과 속도 제한을 거쳐 concurrency개씩 동시에 검색합니다.
+
+        Args:
+            names: 상품명 리스트
+            concurrency: 동시 검색 수
+
+        Returns:
+            names와 같은 순서의 카테고리 코드 리스트 (빈 상품명은 "")
+        """
+        unique = [name for name in dict.fromkeys(names) if name.strip()]
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            codes = dict(zip(unique, executor.map(self.get_category_code, unique)))
+        return [codes.get(name, "") for name in names]
 
     def get_category_code(self, product_name: str) -> str:
         """상품명을 기반으로 코드 반환"""
+        # 0. 로컬 분류기 예측 (신뢰도가 높으면 검색 API 호출 생략)
+        predicted_code = None
+        if self.use_classifier:
+            predicted_code, confidence = self.classifier.predict(product_name)
+            if predicted_code and confidence >= MIN_CONFIDENCE:
+                self.stats.record("local_hits")
+                return predicted_code
+
         # 1. 네이버 쇼핑 API로 카테고리 찾기
         naver_cat = self._search_naver_category(product_name)
         if not naver_cat:
+            # 신뢰도가 낮은 로컬 예측은 확인 없이 쓰지 않음
             return "매핑실패(검색불가)"
             
         # 2. 매핑 테이블에서 코드 찾기
         # naver_cat 예: "디지털/가전>휴대폰악세서리>휴대폰케이스>아이폰케이스"
-        
-        # 완전 일치 시도
-        if naver_cat in self.category_mapping:
-            return self.category_mapping[naver_cat]
-            
-        # 부분 일치 시도 (세분류부터 역순으로 시도)
-        target_last_cat = naver_cat.split(">")[-1].strip()
-        
-        for path, code in self.category_mapping.items():
-            path_last_cat = path.split(">")[-1].strip()
-            if path_last_cat == target_last_cat:
-                 return code
+        # 완전 일치 → 같은 말단 이름 → 가장 깊은 상위 카테고리 순으로 색인 조회
+        code = self.category_index.resolve(naver_cat)
+        if code is not None:
+            if self.use_classifier:
+                self.classifier.add_example(product_name, code)
+            return code
 
         return f"확인필요({naver_cat})"
 
     def _search_naver_category(self, query: str) -> str:
-        """네이버 검색 API (쇼핑) 호출"""
-        url = "https://openapi.naver.com/v1/search/shop.json"
-        
-        # Search API requires Client ID/Secret, distinct from Ad API.
-        # Using ENV vars or placeholders if missing.
-        headers = {
-            "X-Naver-Client-Id": os.getenv("NAVER_CLIENT_ID", ""),
-            "X-Naver-Client-Secret": os.getenv("NAVER_CLIENT_SECRET", "")
-        }
-        
-        if not headers["X-Naver-Client-Id"]:
-            return ""
-
-        try:
-            res = requests.get(url, headers=headers, params={"query": query, "display": 1}, timeout=5)
-            if res.status_code == 200:
-                items = res.json().get("items")
-                if items:
-                    item = items[0]
-                    cats = [item.get(f"category{i}") for i in range(1, 5)]
-                    return ">".join([c for c in cats if c])
-            return ""
-        except:
-            return ""
+        """
+        네이버 쇼핑 검색 상위 결과의 카테고리 다수결 경로를 반환합니다.
+        (검색 결과는 ShoppingSearch에 보관되어 키워드 시드 수집에서 다시 사용)
+        """
+        return self.shopping_search.category_path(query) or ""
+
+
+def get_naver_category_cache() -> ResultCache:
+    """작업 간에 공유하는 네이버 쇼핑 검색 결과 캐시를 반환합니다."""
+    return get_result_cache(NAVER_CATEGORY_CACHE_NAMESPACE, SHOPPING_SEARCH_CACHE_TTL)
@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_shutdown
 
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
 
@@ -19,3 +20,11 @@ celery_app.conf.update(
     task_track_started=True,
     worker_prefetch_multiplier=1, # Excel processing is heavy, one at a time per worker process
 )
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def close_client_pool(**kwargs):
+    """워커 종료 시 풀에 보관된 API 클라이언트 연결을 정리합니다."""
+    from src.client_pool import close_all
+    close_all()
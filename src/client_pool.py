@@ -0,0 +1,222 @@
+"""
+외부 API 클라이언트 풀
+- 프로세스 전역에서 API 키별로 클라이언트를 재사용하여 TLS 연결(keep-alive)을 유지
+- 워커/서버 종료 시 close_all()로 연결 정리
+- 연결 테스트처럼 임의의 키로 한 번만 쓰는 클라이언트는 unpooled_client()로 만들어 풀에 쌓이지 않도록 함
+"""
+
+import atexit
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict
+
+# 1회 요청 기본 타임아웃(초)
+DEFAULT_TIMEOUT = 60.0
+
+# 동시 처리 스레드(parallel_count x Celery concurrency)를 수용할 수 있는 연결 한도
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_EXPIRY = 120.0
+
+_lock = threading.Lock()
+_openai_clients: Dict[str, object] = {}
+_gemini_clients: Dict[str, object] = {}
+_http_sessions: Dict[str, object] = {}
+
+
+def _key_id(api_key: str) -> str:
+    """풀 키로 원본 API 키 대신 해시를 사용합니다."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def _http2_available() -> bool:
+    """httpx의 HTTP/2 지원 패키지(h2) 설치 여부"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _create_openai_client(api_key: str):
+    """keep-alive 연결 한도를 설정한 OpenAI 클라이언트를 새로 만듭니다."""
+    from openai import OpenAI
+    import httpx
+
+    # Custom HTTP client with enforced UTF-8 headers
+    http_client = httpx.Client(
+        headers={"Content-Type": "application/json; charset=utf-8"},
+        timeout=DEFAULT_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        http2=_http2_available(),
+    )
+
+    # SDK 자체 재시도는 끄고 RetryPolicy 한 곳에서만 재시도 (중첩 재시도 방지)
+    return OpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+
+
+def get_openai_client(api_key: str):
+    """
+    API 키에 해당하는 OpenAI 클라이언트를 반환합니다. (없으면 생성 후 풀에 보관)
+
+    Args:
+        api_key: 정제된 OpenAI API 키
+
+    Returns:
+        openai.OpenAI 인스턴스
+
+    Raises:
+        ImportError: openai 또는 httpx 패키지가 설치되지 않은 경우
+    """
+    key_id = _key_id(api_key)
+    with _lock:
+        client = _openai_clients.get(key_id)
+        if client is not None:
+            return client
+
+        client = _create_openai_client(api_key)
+        _openai_clients[key_id] = client
+        return client
+
+
+def _create_gemini_client(api_key: str):
+    """API 키 전용 Gemini GenerativeServiceClient를 새로 만듭니다."""
+    from google.ai import generativelanguage as glm
+    from google.api_core import client_options as client_options_lib
+
+    return glm.GenerativeServiceClient(
+        client_options=client_options_lib.ClientOptions(api_key=api_key)
+    )
+
+
+def get_gemini_client(api_key: str):
+    """
+    API 키에 해당하는 Gemini GenerativeServiceClient를 반환합니다.
+
+    genai.configure()는 프로세스 전역 설정이라 여러 사용자의 작업이 같은
+    프로세스에서 동시에 실행되면 서로의 키를 덮어씁니다. 키별로 독립된
+    클라이언트(전송 계층 포함)를 만들어 GenerativeModel에 주입합니다.
+
+    Args:
+        api_key: Gemini API 키
+
+    Returns:
+        google.ai.generativelanguage.GenerativeServiceClient 인스턴스
+    """
+    key_id = _key_id(api_key)
+    with _lock:
+        client = _gemini_clients.get(key_id)
+        if client is not None:
+            return client
+
+        client = _create_gemini_client(api_key)
+        _gemini_clients[key_id] = client
+        return client
+
+
+def get_http_session(name: str, credential: str = ""):
+    """
+    외부 REST API(네이버 검색 등)용 requests.Session을 반환합니다. (API/자격 증명별로 재사용하여 keep-alive 유지)
+
+    Args:
+        name: API 구분 이름 (예: "naver_search")
+        credential: 자격 증명 구분 값 (예: 클라이언트 ID, 풀 키로는 해시만 사용)
+
+    Returns:
+        requests.Session 인스턴스
+    """
+    key_id = f"{name}:{_key_id(credential)}"
+    with _lock:
+        session = _http_sessions.get(key_id)
+        if session is not None:
+            return session
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_KEEPALIVE_CONNECTIONS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _http_sessions[key_id] = session
+        return session
+
+
+def attach_gemini_client(model, client, api_key: str):
+    """
+    genai.GenerativeModel이 키별 클라이언트를 사용하도록 주입합니다.
+
+    SDK에는 클라이언트를 넘기는 공개 인자가 없어 비공개 속성(_client)을 덮어쓰므로
+    이 함수 한 곳에서만 다룹니다. 속성이 없는 SDK 버전이면 genai.configure()로 대체하는데,
+    프로세스 전역 설정이라 다른 키의 작업과 섞일 수 있어 경고를 출력합니다.
+
+    Args:
+        model: genai.GenerativeModel 인스턴스
+        client: 주입할 GenerativeServiceClient (get_gemini_client 또는 unpooled_client("gemini", ...))
+        api_key: 대체 경로에서 사용할 Gemini API 키
+
+    Returns:
+        model (같은 인스턴스)
+    """
+    if hasattr(model, "_client"):
+        model._client = client
+    else:
+        import google.generativeai as genai
+
+        print("[WARNING] GenerativeModel에 _client 속성이 없어 genai.configure()로 API 키를 설정합니다. "
+              "(프로세스 전역 설정)")
+        genai.configure(api_key=api_key)
+    return model
+
+
+@contextmanager
+def unpooled_client(provider: str, api_key: str):
+    """
+    풀에 보관하지 않는 일회용 클라이언트 (블록을 벗어나면 연결을 닫음).
+    설정 화면의 연결 테스트처럼 사용자가 입력한 임의의 키로 만드는 클라이언트가 풀에 계속 쌓이지 않도록 합니다.
+
+    Args:
+        provider: "openai" 또는 "gemini"
+        api_key: API 키
+    """
+    if provider == "openai":
+        client = _create_openai_client(api_key)
+        close = client.close
+    elif provider == "gemini":
+        client = _create_gemini_client(api_key)
+        # Gemini 클라이언트는 전송 계층을 닫아야 연결이 정리됨
+        close = client.transport.close
+    else:
+        raise ValueError(f"지원하지 않는 제공자: {provider}")
+    try:
+        yield client
+    finally:
+        try:
+            close()
+        except Exception as e:
+            print(f"[WARNING] 클라이언트 종료 중 오류: {e}")
+
+
+def close_all():
+    """풀에 보관된 모든 클라이언트의 연결을 닫습니다."""
+    with _lock:
+        clients = list(_openai_clients.values())
+        _openai_clients.clear()
+        clients += [client.transport for client in _gemini_clients.values()]
+        _gemini_clients.clear()
+        clients += list(_http_sessions.values())
+        _http_sessions.clear()
+
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"[WARNING] 클라이언트 종료 중 오류: {e}")
+
+
+atexit.register(close_all)
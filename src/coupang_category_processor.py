@@ -2,21 +2,107 @@ import hmac
 import hashlib
 import requests
 import json
-import time
 import os
+import threading
+import time
 from datetime import datetime
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 
+from src.client_pool import get_http_session
+from src.llm_retry import RetryError, RetryPolicy
+from src.rate_limiter import get_rate_limiter
+from src.result_cache import ResultCache, get_result_cache, hash_key
+from src.single_flight import SingleFlight
+
+PREDICT_PATH = "/v2/providers/openapi/apis/api/v1/categorization/predict"
+
+# 쿠팡 API 게이트웨이 초당 호출 한도 (액세스 키별, 프로세스 내 모든 스레드 합산)
+COUPANG_API_RATE = float(os.getenv("COUPANG_API_RATE", "5"))
+# 쿠팡 API 타임아웃 (연결, 응답 대기 초)
+COUPANG_API_TIMEOUT = (
+    float(os.getenv("COUPANG_API_CONNECT_TIMEOUT", "3")),
+    float(os.getenv("COUPANG_API_READ_TIMEOUT", "5")),
+)
+
+# 추천 결과 캐시 (응답은 요청 본문(productName/brand/attributes)에만 의존)
+COUPANG_CATEGORY_CACHE_NAMESPACE = "coupang_category"
+COUPANG_CATEGORY_CACHE_TTL = int(os.getenv("COUPANG_CATEGORY_CACHE_TTL", str(30 * 24 * 3600)))
+# "매칭실패" 결과는 짧게 보관 (쿠팡 분류 모델이 갱신되면 달라질 수 있음)
+COUPANG_CATEGORY_NEGATIVE_TTL = int(os.getenv("COUPANG_CATEGORY_NEGATIVE_TTL", str(24 * 3600)))
+_PREDICT_SCOPE = "predict"
+
+# 429/5xx/네트워크 오류 재시도 (일시적 오류로 "API오류" 행이 생기지 않도록)
+COUPANG_RETRY_POLICY = RetryPolicy(max_attempts=4, base_delay=0.5, max_delay=8.0, deadline=30.0)
+
+
+class CoupangStats:
+    """쿠팡 카테고리 API 호출 지표 (스레드 안전, 작업 단위로 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.api_calls = 0   # HTTP 요청 수 (재시도 포함)
+        self.retries = 0     # 재시도 횟수
+        self.errors = 0      # 재시도 후에도 실패한 행 수
+        self.cache_hits = 0     # 캐시에서 카테고리 코드를 찾은 건수
+        self.negative_hits = 0  # "매칭실패"로 캐시되어 호출을 생략한 건수
+        self.cache_misses = 0   # 캐시에 없어 API로 조회한 건수
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def record_latency(self, seconds: float):
+        with self._lock:
+            self.latency_total += seconds
+            self.latency_max = max(self.latency_max, seconds)
+
+    @property
+    def lookups(self) -> int:
+        """카테고리 조회 건수 (캐시 적중 포함)"""
+        return self.cache_hits + self.negative_hits + self.cache_misses
+
+    def snapshot(self) -> Dict:
+        """meta_data["stats"]["coupang"]에 기록할 딕셔너리를 반환합니다."""
+        with self._lock:
+            return {
+                "api_calls": self.api_calls,
+                "cache_hits": self.cache_hits,
+                "negative_hits": self.negative_hits,
+                "cache_misses": self.cache_misses,
+                "retries": self.retries,
+                "errors": self.errors,
+                "latency_avg": round(self.latency_total / self.api_calls, 3) if self.api_calls else 0.0,
+                "latency_max": round(self.latency_max, 3),
+            }
+
+
 class CoupangCategoryProcessor:
-    def __init__(self, access_key: str, secret_key: str):
+    def __init__(self, access_key: str, secret_key: str, stats: Optional[CoupangStats] = None,
+                 retry_policy: Optional[RetryPolicy] = None, cache: Optional[ResultCache] = None):
+        """
+        Args:
+            access_key: 쿠팡 Open API 액세스 키
+            secret_key: 쿠팡 Open API 시크릿 키
+            stats: 호출 지표 집계기 (None이면 새로 생성)
+            retry_policy: 재시도 정책 (None이면 COUPANG_RETRY_POLICY)
+            cache: 추천 결과 캐시 (None이면 캐시 사용 안 함, 작업에서는 get_coupang_category_cache())
+        """
         self.access_key = access_key
         self.secret_key = secret_key
         self.base_url = "https://api-gateway.coupang.com"
+        self.stats = stats or CoupangStats()
+        self.retry_policy = retry_policy or COUPANG_RETRY_POLICY
+        self.cache = cache
+        # 같은 요청 본문의 동시 조회는 한 번만 호출
+        self._inflight = SingleFlight()
 
     def _generate_signature(self, method, path, query=""):
         datetime_str = datetime.utcnow().strftime('%y%m%dT%H%M%SZ')
         message = datetime_str + method + path + (query if query else "")
-        
+
         signature = hmac.new(
             self.secret_key.encode('utf-8'),
             message.encode('utf-8'),
@@ -25,53 +111,103 @@ class CoupangCategoryProcessor:
 
         return f"CEA algorithm=HmacSHA256, access-key={self.access_key}, signed-date={datetime_str}, signature={signature}"
 
+    def _post_predict(self, body: dict) -> dict:
+        """
+        카테고리 추천 API를 호출합니다. (액세스 키별 공용 세션/속도 제한, 429/5xx 재시도)
+        서명에 요청 시각이 들어가므로 시도마다 다시 만듭니다.
+        """
+        url = f"{self.base_url}{PREDICT_PATH}"
+        session = get_http_session("coupang", self.access_key)
+        limiter = get_rate_limiter(("coupang", self.access_key), COUPANG_API_RATE)
+
+        def attempt(remaining):
+            limiter.acquire()
+            headers = {
+                "Content-Type": "application/json",
+                "Authorization": self._generate_signature("POST", PREDICT_PATH)
+            }
+            timeout = COUPANG_API_TIMEOUT
+            if remaining is not None:
+                timeout = (COUPANG_API_TIMEOUT[0], max(0.1, min(COUPANG_API_TIMEOUT[1], remaining)))
+
+            self.stats.record("api_calls")
+            started = time.monotonic()
+            try:
+                response = session.post(url, headers=headers, json=body, timeout=timeout)
+            finally:
+                self.stats.record_latency(time.monotonic() - started)
+            if response.status_code != 200:
+                print(f"[ERROR] Coupang API Failed: {response.status_code} {response.text}")
+            response.raise_for_status()
+            return response.json()
+
+        return self.retry_policy.call(attempt, on_retry=lambda attempt_no, e, delay: self.stats.record("retries"))
+
     def get_category_code(self, product_name: str, brand: str = "", attributes: dict = None) -> str:
         """
         쿠팡 카테고리 추천 API를 호출하여 최적의 카테고리 코드를 반환합니다.
-        
+
         Args:
             product_name: 상품명
             brand: (옵션) 브랜드
             attributes: (옵션) 상품 속성 딕셔너리
-            
+
         Returns:
             str: 추천 카테고리 코드 (실패 시 에러 메시지 또는 "매칭실패")
         """
-        path = "/v2/providers/openapi/apis/api/v1/categorization/predict"
-        url = f"{self.base_url}{path}"
-        
         # Request Body
         body = {
             "productName": product_name,
             "brand": brand,
             "attributes": attributes if attributes else {}
         }
-        
-        # Authentication
-        authorization = self._generate_signature("POST", path)
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": authorization
-        }
-        
+        key = hash_key(json.dumps(body, ensure_ascii=False, sort_keys=True))
+        return self._inflight.do(key, lambda: self._get_category_code_cached(body, key))
+
+    def _get_category_code_cached(self, body: dict, key: str) -> str:
+        """
+        캐시를 먼저 확인하고, 없으면 API로 조회해 결과를 저장합니다.
+        성공과 실제 추천 실패(응답 code 200 + 비SUCCESS)만 저장하고, 게이트웨이/한도 오류 응답과 호출 오류는 저장하지 않습니다.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(_PREDICT_SCOPE, key)
+            if cached is not None:
+                self.stats.record("negative_hits" if cached.startswith("매칭실패") else "cache_hits")
+                return cached
+        self.stats.record("cache_misses")
+
+        code, cacheable = self._request_category_code(body)
+        if self.cache is not None and cacheable:
+            ttl = COUPANG_CATEGORY_NEGATIVE_TTL if code.startswith("매칭실패") else COUPANG_CATEGORY_CACHE_TTL
+            self.cache.set(_PREDICT_SCOPE, key, code, ttl=ttl)
+        return code
+
+    def _request_category_code(self, body: dict) -> Tuple[str, bool]:
+        """
+        추천 API 응답을 카테고리 코드 또는 실패 문자열로 변환합니다.
+
+        Returns:
+            (코드 또는 실패 문자열, 캐시 저장 가능 여부)
+        """
         try:
-            response = requests.post(url, headers=headers, json=body, timeout=5)
-            # print(f"[DEBUG] Coupang Response: {response.status_code} {response.text}") 
-            # Uncommenting above for more debug if needed, but error handling below should catch it.
-            if response.status_code != 200:
-                 print(f"[ERROR] Coupang API Failed: {response.status_code} {response.text}")
-            response.raise_for_status()
-            
-            data = response.json()
-            if data['code'] == 200 and data['data']['autoCategorizationPredictionResultType'] == 'SUCCESS':
-                return data['data']['predictedCategoryId']
-            else:
-                return f"매칭실패({data.get('message', 'Unknown Error')})"
-                
-        except requests.exceptions.RequestException as e:
+            data = self._post_predict(body)
+            if data['code'] != 200:
+                # 응답 본문의 게이트웨이/호출 한도 오류는 일시적일 수 있어 캐시하지 않음
+                return f"매칭실패({data.get('message', 'Unknown Error')})", False
+            if data['data']['autoCategorizationPredictionResultType'] == 'SUCCESS':
+                return str(data['data']['predictedCategoryId']), True
+            return f"매칭실패({data.get('message', 'Unknown Error')})", True
+
+        except (RetryError, requests.exceptions.RequestException) as e:
+            self.stats.record("errors")
             print(f"[ERROR] Coupang API Error: {e}")
-            return f"API오류"
+            return f"API오류", False
         except Exception as e:
+            self.stats.record("errors")
             print(f"[ERROR] Coupang Processing Error: {e}")
-            return f"처리실패"
+            return f"처리실패", False
+
+
+def get_coupang_category_cache() -> ResultCache:
+    """작업 간에 공유하는 쿠팡 카테고리 추천 결과 캐시를 반환합니다."""
+    return get_result_cache(COUPANG_CATEGORY_CACHE_NAMESPACE, COUPANG_CATEGORY_CACHE_TTL)
@@ -0,0 +1,180 @@
+"""
+부하 테스트용 가짜 LLM 제공자
+- 실제 API 호출 없이 상품명 정제/변형/큐레이션 프롬프트에 그럴듯한 결정적 응답 반환
+- 응답 지연 분포(로그정규), 오류율, 429(Rate Limit) 주입을 설정 가능
+- RetryPolicy/SingleFlight/지표 수집 경로는 실제 제공자와 동일하게 통과
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.llm_metrics import METRICS_REGISTRY, LLMMetrics
+from src.llm_provider import BaseLLMProvider
+from src.llm_retry import RetryPolicy, DEFAULT_RETRY_POLICY
+from src.single_flight import SingleFlight
+
+_QUOTED_PATTERN = re.compile(r"""['"]([^'"]+)['"]""")
+_LIST_PATTERN = re.compile(r"List:\s*(.+)")
+_INDEXED_PATTERN = re.compile(r"^Names:\s*(\[.*\])$", re.MULTILINE)
+
+
+class FakeAPIError(Exception):
+    """가짜 제공자가 주입하는 API 오류 (status_code/response.headers를 실제 SDK와 동일하게 노출)"""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Error code: {status_code} (fake)")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = type("FakeResponse", (), {"status_code": status_code, "headers": headers})()
+
+
+def _simple_refine(name: str) -> str:
+    """괄호/특수문자 제거와 수량 표기 정리만 수행하는 결정적 정제"""
+    name = re.sub(r"\[[^\]]*\]|\([^)]*\)", " ", name)
+    name = re.sub(r"\b1\s*(p|P|개|set|SET)\b", " ", name)
+    name = re.sub(r"\b(\d+)\s*(p|P|pcs|ea|EA)\b", r"\1개", name)
+    name = re.sub(r"[^\w\s가-힣]", " ", name)
+    return re.sub(r"\s+", " ", name).strip() or "상품"
+
+
+class FakeLLMProvider(BaseLLMProvider):
+    """설정 가능한 지연/오류 분포를 가진 가짜 LLM 제공자"""
+
+    provider_name = "Fake"
+
+    def __init__(
+        self,
+        model: str = "fake-model",
+        latency_median: float = 0.3,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: Optional[float] = 1.0,
+        seed: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        Args:
+            model: 지표에 기록될 모델명
+            latency_median: 응답 지연 중앙값(초)
+            latency_sigma: 로그정규 분포의 sigma (0이면 고정 지연)
+            error_rate: 503 오류 주입 확률 (0~1)
+            rate_limit_rate: 429 오류 주입 확률 (0~1)
+            retry_after: 429 응답의 Retry-After 값(초, None이면 헤더 없음)
+            seed: 지연/오류 난수 시드 (None이면 비결정적)
+            retry_policy: 재시도 정책 (None이면 기본 정책)
+        """
+        self.model_name = model
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.metrics = LLMMetrics(parent=METRICS_REGISTRY)
+        self._inflight = SingleFlight()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, model: Optional[str] = None, retry_policy: Optional[RetryPolicy] = None) -> "FakeLLMProvider":
+        """FAKE_LLM_* 환경변수로 설정된 가짜 제공자를 생성합니다."""
+        seed = os.getenv("FAKE_LLM_SEED")
+        retry_after = os.getenv("FAKE_LLM_RETRY_AFTER", "1.0")
+        return cls(
+            model=model or "fake-model",
+            latency_median=float(os.getenv("FAKE_LLM_LATENCY_MEDIAN", "0.3")),
+            latency_sigma=float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.5")),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0")),
+            retry_after=float(retry_after) if retry_after else None,
+            seed=int(seed) if seed else None,
+            retry_policy=retry_policy,
+        )
+
+    def is_configured(self) -> bool:
+        return True
+
+    def generate_content(self, prompt: str) -> str:
+        return self._run(prompt, lambda: self._fake_text(prompt), json_mode=False)
+
+    def _generate_json(self, prompt: str, schema: Dict) -> str:
+        return self._run(
+            prompt,
+            lambda: json.dumps(self._fake_value(schema, prompt, "result"), ensure_ascii=False),
+            json_mode=True,
+        )
+
+    # ------------------------------------------------------------
+    # 지연/오류 주입
+    # ------------------------------------------------------------
+
+    def _run(self, prompt: str, render: Callable[[], str], json_mode: bool) -> str:
+        def request(timeout: float):
+            with self._rng_lock:
+                roll = self._rng.random()
+                if self.latency_sigma > 0:
+                    latency = self._rng.lognormvariate(0, self.latency_sigma) * self.latency_median
+                else:
+                    latency = self.latency_median
+            time.sleep(min(latency, timeout))
+            if latency > timeout:
+                raise TimeoutError(f"fake request timed out after {timeout:.1f}s")
+            if roll < self.rate_limit_rate:
+                raise FakeAPIError(429, retry_after=self.retry_after)
+            if roll < self.rate_limit_rate + self.error_rate:
+                raise FakeAPIError(503)
+            return render(), None
+
+        return self._inflight.do((prompt, json_mode), lambda: self._call_with_retry(request, prompt))
+
+    # ------------------------------------------------------------
+    # 결정적 응답 생성
+    # ------------------------------------------------------------
+
+    def _product_name(self, prompt: str) -> str:
+        match = _QUOTED_PATTERN.search(prompt)
+        return match.group(1) if match else prompt.strip().splitlines()[0][:40]
+
+    def _candidate_keywords(self, prompt: str) -> List[str]:
+        match = _LIST_PATTERN.search(prompt)
+        if match:
+            return [k.strip() for k in match.group(1).split(",") if k.strip()]
+        return _simple_refine(self._product_name(prompt)).split()
+
+    def _fake_text(self, prompt: str) -> str:
+        name = _simple_refine(self._product_name(prompt))
+        if "변형" in prompt:
+            words = name.split()
+            variations = [" ".join(reversed(words)), f"{words[-1]} 추천"] if words else []
+            return "\n".join(v for v in variations if v and v != name)
+        if "keyword" in prompt.lower():
+            return ", ".join(self._candidate_keywords(prompt)[:10])
+        return name
+
+    def _fake_value(self, schema: Dict, prompt: str, field: str) -> Any:
+        kind = schema.get("type")
+        if kind == "object":
+            return {key: self._fake_value(sub, prompt, key) for key, sub in schema.get("properties", {}).items()}
+        if kind == "array":
+            item_schema = schema.get("items", {})
+            indexed = _INDEXED_PATTERN.search(prompt)
+            if field == "keywords":
+                items = self._candidate_keywords(prompt)[:10]
+            elif indexed and "index" in item_schema.get("properties", {}):
+                # 번호가 붙은 일괄 요청: 입력 순번을 유지하여 항목별로 응답
+                items = [{"index": e["index"], "name": _simple_refine(e["name"])} for e in json.loads(indexed.group(1))]
+            else:
+                items = [self._fake_value(item_schema or {"type": "string"}, prompt, field)
+                         for _ in range(max(1, schema.get("minItems", 1)))]
+            return items
+        if kind in ("integer", "number"):
+            return 0
+        if kind == "boolean":
+            return True
+        return _simple_refine(self._product_name(prompt))
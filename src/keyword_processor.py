@@ -8,13 +8,25 @@ import re
 from typing import List, Optional, Dict, Tuple
 from curl_cffi import requests as cffi_requests
 from dotenv import load_dotenv
-from src.llm_provider import BaseLLMProvider, get_llm_provider
+from src.llm_provider import TASK_CURATION, TASK_VARIATION, BaseLLMProvider, get_llm_provider
+from src.shopping_search import ShoppingSearch
 from src.trademark_blacklist import contains_trademark, filter_trademarked_keywords
 
 from src.keyword_stop_words import KEYWORD_STOP_WORDS
 
 load_dotenv()
 
+# LLM 최종 큐레이션 결과 스키마
+CURATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "keywords": {"type": "array", "items": {"type": "string"}, "minItems": 1, "maxItems": 15},
+    },
+    "required": ["keywords"],
+    "additionalProperties": False,
+}
+
+
 class KeywordProcessor:
     """
     강화된 키워드 프로세서.
@@ -25,7 +37,8 @@ class KeywordProcessor:
         Phase 3: 상표권 이중 검증 + LLM 최종 큐레이션
     """
     
-    def __init__(self, llm_provider: Optional[BaseLLMProvider] = None, api_keys: dict = None):
+    def __init__(self, llm_provider: Optional[BaseLLMProvider] = None, api_keys: dict = None,
+                 shopping_search: Optional[ShoppingSearch] = None):
         if api_keys is None:
             api_keys = {}
         # Naver Ad API Config (검색광고 API)
@@ -34,6 +47,9 @@ class KeywordProcessor:
         self.naver_secret_key = api_keys.get("naver_secret_key") or os.getenv("NAVER_SECRET_KEY")
         self.naver_customer_id = api_keys.get("naver_customer_id") or os.getenv("NAVER_CUSTOMER_ID")
         
+        # 네이버 쇼핑 검색 결과 (CategoryProcessor와 공유, 있으면 검색 결과 상품명을 시드로 추가)
+        self.shopping_search = shopping_search
+        
         # LLM Provider
         if llm_provider is None:
             self.llm_provider = get_llm_provider("gemini")
@@ -44,28 +60,59 @@ class KeywordProcessor:
     # Public API (기존 시그니처 유지)
     # ============================================================
 
-    def process_keywords(self, product_name: str, prompt_template: str = None) -> str:
+    def process_keywords(self, product_name: str, prompt_template: str = None, variations: Optional[List[str]] = None) -> str:
         """
         강화된 키워드 생성 워크플로우.
         
         Args:
             product_name: 가공된 상품명
             prompt_template: (옵션) 사용자 커스텀 프롬프트 (최종 큐레이션용)
+            variations: (옵션) 상품명 정제와 함께 생성한 변형 상품명 (있으면 변형 생성 LLM 호출 생략)
             
         Returns:
             콤마로 구분된 키워드 문자열
         """
+        safe_data = self.prepare_keywords(product_name, variations)
+        if not safe_data:
+            return ""
+        return self.curate_keywords(product_name, safe_data, prompt_template)
+
+    def curate_keywords(self, product_name: str, safe_data: List[Dict], prompt_template: str = None) -> str:
+        """
+        prepare_keywords 결과로 LLM 상표권 2차 검증 + 최종 큐레이션을 수행합니다. (Phase 3 Step 2)
+
+        Returns:
+            콤마로 구분된 키워드 문자열
+        """
+        if not self.llm_provider.is_configured():
+            final_keywords = [item["keyword"] for item in safe_data][:10]
+        else:
+            final_keywords = self._curate_with_llm(product_name, safe_data, prompt_template)
+
+        return self.format_keywords(final_keywords)
+
+    def prepare_keywords(self, product_name: str, variations: Optional[List[str]] = None) -> List[Dict]:
+        """
+        LLM 최종 큐레이션 직전 단계까지 수행합니다. (Phase 1, 2, 3의 블랙리스트 필터)
+        배치 모드에서는 이 결과로 큐레이션 프롬프트를 모아 한 번에 제출합니다.
+
+        Args:
+            variations: (옵션) 미리 생성한 변형 상품명 (None이면 LLM으로 생성)
+
+        Returns:
+            상표 블랙리스트를 통과한 후보 키워드 데이터 (없으면 빈 리스트)
+        """
         print(f"\n{'='*60}")
         print(f"[키워드 생성 시작] 상품명: {product_name}")
         print(f"{'='*60}")
         
         # ── Phase 1: 다각도 시드 수집 ──
         print("\n📌 Phase 1: 다각도 시드 수집")
-        seed_keywords_with_data = self._collect_seeds_multi_round(product_name)
+        seed_keywords_with_data = self._collect_seeds_multi_round(product_name, variations)
         
         if not seed_keywords_with_data:
             print("⚠️ 시드 키워드를 수집하지 못했습니다.")
-            return ""
+            return []
         
         print(f"   → 총 {len(seed_keywords_with_data)}개 후보 키워드 수집 완료")
         
@@ -82,11 +129,12 @@ class KeywordProcessor:
                 for item in seed_keywords_with_data
             ]
         
-        # ── Phase 3: 상표권 검증 + LLM 큐레이션 ──
+        # ── Phase 3: 상표권 검증 (LLM 큐레이션은 호출 측에서 수행) ──
         print("\n📌 Phase 3: 상표권 검증 + LLM 큐레이션")
-        final_keywords = self._finalize_keywords(product_name, filtered_keywords, prompt_template)
-        
-        # 최대 10개로 제한
+        return self._filter_trademarks(filtered_keywords)
+
+    def format_keywords(self, final_keywords: List[str]) -> str:
+        """최종 키워드를 최대 10개로 제한하여 콤마 구분 문자열로 만듭니다."""
         final_keywords = final_keywords[:10]
         
         print(f"\n{'='*60}")
@@ -99,9 +147,10 @@ class KeywordProcessor:
     # Phase 1: 다각도 시드 수집
     # ============================================================
 
-    def _collect_seeds_multi_round(self, product_name: str) -> List[Dict]:
+    def _collect_seeds_multi_round(self, product_name: str, variations: Optional[List[str]] = None) -> List[Dict]:
         """
         원본 상품명 + LLM 변형 상품명으로 다회 검색하여 시드 키워드를 수집합니다.
+        (variations가 주어지면 변형 생성 LLM 호출을 생략)
         
         Returns:
             List[Dict]: [{"keyword": "...", "monthlyPcQcCnt": N, "monthlyMobileQcCnt": N, "compIdx": "높음/중간/낮음"}, ...]
@@ -123,8 +172,17 @@ class KeywordProcessor:
         
         print(f"      → {len(round1_results)}개 (네이버) + {len(round1_coupang)}개 (쿠팡)")
         
+        # 쇼핑 검색 결과 상품명에서 자주 쓰는 단어 (카테고리 매칭과 같은 검색 결과 재사용)
+        if self.shopping_search is not None:
+            title_seeds = self.shopping_search.seed_keywords(product_name)
+            for kw in title_seeds:
+                if kw not in all_keywords:
+                    all_keywords[kw] = {"keyword": kw, "monthlyPcQcCnt": 0, "monthlyMobileQcCnt": 0, "compIdx": "불명"}
+            print(f"      → {len(title_seeds)}개 (쇼핑 검색 상품명)")
+        
         # Round 2~3: LLM으로 상품명 변형 후 재검색
-        variations = self._generate_product_name_variations(product_name)
+        if variations is None:
+            variations = self._generate_product_name_variations(product_name)
         
         for i, variation in enumerate(variations, start=2):
             print(f"   [Round {i}] 변형 상품명: '{variation}'")
@@ -163,7 +221,7 @@ class KeywordProcessor:
 상품명: "{product_name}"
 변형:"""
             
-            result = self.llm_provider.generate_content(prompt)
+            result = self.llm_provider.for_task(TASK_VARIATION).generate_content(prompt)
             variations = [v.strip().strip('-').strip('•').strip() for v in result.strip().split('\n') if v.strip()]
             # 최대 3개까지만
             variations = variations[:3]
@@ -318,9 +376,9 @@ class KeywordProcessor:
     # Phase 3: 상표권 검증 + LLM 최종 큐레이션
     # ============================================================
 
-    def _finalize_keywords(self, product_name: str, keywords_data: List[Dict], prompt_template: str = None) -> List[str]:
+    def _filter_trademarks(self, keywords_data: List[Dict]) -> List[Dict]:
         """
-        상표권 이중 검증 + LLM 최종 큐레이션을 수행합니다.
+        상표권 블랙리스트 1차 필터를 적용합니다.
         """
         keyword_names = [item["keyword"] for item in keywords_data]
         
@@ -332,99 +390,59 @@ class KeywordProcessor:
         
         print(f"   [블랙리스트] {len(safe_keywords)}개 키워드 통과")
         
-        if not safe_keywords:
-            return []
-        
         # 안전한 키워드에 대한 데이터 재매핑
-        safe_data = [item for item in keywords_data if item["keyword"] in safe_keywords]
-        
-        # ── Step 2: LLM 상표권 2차 검증 + 최종 큐레이션 ──
-        if not self.llm_provider.is_configured():
-            return safe_keywords[:10]
-        
-        final_keywords = self._curate_with_llm(product_name, safe_data, prompt_template)
-        
-        return final_keywords
+        return [item for item in keywords_data if item["keyword"] in safe_keywords]
+
+    def build_curation_prompt(self, product_name: str, keywords_data: List[Dict], prompt_template: str = None) -> str:
+        """최종 큐레이션 프롬프트를 만듭니다. (CURATION_SCHEMA 구조화 응답용, 배치 모드에서도 사용)"""
+        all_keyword_names = ", ".join([item["keyword"] for item in keywords_data])
+        return f"""Select 10 safe keywords from this list for '{product_name}'.
+List: {all_keyword_names}
+Constraint:
+- No generic terms like 'Option', 'Random', 'Unit' (e.g. 1개, 1Set), 'Shipping' terms.
+- No trademarks/brands.
+Put the selected keywords in the "keywords" array."""
+
+    def finalize_curation(self, keywords_data: List[Dict], result: Optional[Dict]) -> List[str]:
+        """
+        CURATION_SCHEMA 응답에서 상표/불용어를 다시 걸러 최종 키워드를 만듭니다.
+        응답이 없거나(None) 남는 키워드가 없으면 후보 상위 10개로 대체합니다.
+        """
+        final = []
+        for kw in (result or {}).get("keywords", []):
+            # Basic cleanup
+            kw = re.sub(r'^[\d+\.\-\*\•\s]+', '', kw).strip()
+            if not kw or contains_trademark(kw) or self._is_stop_word(kw):
+                continue
+            final.append(kw)
+
+        # Fallback if all LLM attempts fail
+        if not final:
+            print("   ⚠️ LLM Failed all attempts. Using Top 10 by logic.")
+            # Simple logic fallback
+            final = [item["keyword"] for item in keywords_data[:10] if not contains_trademark(item["keyword"]) and not self._is_stop_word(item["keyword"])]
+
+        print(f"   [LLM] 최종 선별 ({len(final)}개): {final}")
+        return final
 
     def _curate_with_llm(self, product_name: str, keywords_data: List[Dict], prompt_template: str = None) -> List[str]:
         """
         LLM으로 상표권 2차 검증 + 최종 키워드 큐레이션을 동시에 수행합니다.
         """
         try:
-            # 키워드 + 경쟁도 데이터를 함께 포맷
-            keyword_info_lines = []
-            for item in keywords_data:
-                kw = item["keyword"]
-                comp = item.get("compIdx", "불명")
-                total = item.get("totalQcCnt", 0)
-                keyword_info_lines.append(f"- {kw} (경쟁도: {comp}, 월 검색수: {total})")
-            
-            keywords_info = "\n".join(keyword_info_lines)
-            # gpt-5-nano is unstable. Use Simple Prompt + Retry Logic.
-            all_keyword_names = ", ".join([item["keyword"] for item in keywords_data])
-            
-            prompt_v1 = f"""Select 10 safe keywords from this list for '{product_name}'.
-List: {all_keyword_names}
-Constraint:
-- No generic terms like 'Option', 'Random', 'Unit' (e.g. 1개, 1Set), 'Shipping' terms.
-- No trademarks/brands.
-Return comma-separated string."""
+            prompt = self.build_curation_prompt(product_name, keywords_data, prompt_template)
+            result = None
 
-            prompt_v2 = f"""Extract 10 keywords for '{product_name}' from: {all_keyword_names}.
-Safety: No brands. No generic options (color/size/unit).
-Format: Comma separated."""
+            try:
+                # 구조화(JSON) 응답으로 번호/JSON 혼입 등 형식 오류에 따른 재요청 제거
+                # 후보가 많을 때만 상위 모델로 라우팅
+                llm = self.llm_provider.for_task(TASK_CURATION, len(keywords_data))
+                result = llm.generate_structured(prompt, CURATION_SCHEMA)
+            except Exception as e:
+                # Provider의 RetryPolicy/스키마 수리까지 소진한 상태
+                print(f"   ⚠️ LLM Error: {e}")
 
-            prompts = [prompt_v1, prompt_v2, prompt_v1] # Retry sequence
-            
-            final = []
-            
-            for attempt, attempt_prompt in enumerate(prompts):
-                if attempt > 0:
-                    print(f"   ⚠️ LLM Attempt {attempt+1} (Retrying)...")
-                
-                try:
-                    result = self.llm_provider.generate_content(attempt_prompt)
-                    # print(f"   [DEBUG] LLM Result: {result}") # Verbose debug
-                    
-                    if not result:
-                        continue
-                        
-                    # Normalize and split
-                    normalized = result.replace('\n', ',')
-                    candidates = [k.strip() for k in normalized.split(',') if k.strip()]
-                    
-                    # Filter trademarks and stop words
-                    temp_final = []
-                    for kw in candidates:
-                        # Basic cleanup
-                        kw = re.sub(r'^[\d+\.\-\*\•\s]+', '', kw).strip()
-                        if not kw: continue
-                        
-                        if contains_trademark(kw):
-                            # print(f"   ⚠️ Removed Brand: {kw}")
-                            pass
-                        elif self._is_stop_word(kw):
-                             # print(f"   ⚠️ Removed Stop Word: {kw}")
-                             pass
-                        else:
-                            temp_final.append(kw)
-                    
-                    if temp_final:
-                        final = temp_final
-                        break # Success
-                        
-                except Exception as e:
-                    print(f"   ⚠️ LLM Error: {e}")
-                    continue
-
-            # Fallback if all LLM attempts fail
-            if not final:
-                print("   ⚠️ LLM Failed all attempts. Using Top 10 by logic.")
-                # Simple logic fallback
-                final = [item["keyword"] for item in keywords_data[:10] if not contains_trademark(item["keyword"]) and not self._is_stop_word(item["keyword"])]
-            
-            print(f"   [LLM] 최종 선별 ({len(final)}개): {final}")
-            return final
+            return self.finalize_curation(keywords_data, result)
             
         except Exception as e:
             print(f"   ⚠️ LLM 큐레이션 중 오류: {e}")
@@ -0,0 +1,259 @@
+"""
+LLM 배치 실행 모드 (대용량 작업용 "economy" 처리)
+- 작업 전체의 정제/큐레이션 프롬프트를 모아 한 번에 제출하고 결과를 행(custom_id)에 매핑
+- OpenAIBatchBackend: OpenAI Batch API (JSONL 업로드 → 제출 → 폴링 → 결과 다운로드)
+- ProviderBatchBackend: 배치 API가 없는 제공자(Gemini, Fake)는 제한된 동시성으로 직접 호출
+- 결과가 없거나 스키마 검증에 실패한 항목은 결과에서 빠지므로 호출 측에서 실시간 호출로 보완합니다.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.llm_metrics import LLMMetrics, METRICS_REGISTRY, estimate_tokens
+from src.llm_provider import BaseLLMProvider, OpenAIProvider
+from src.llm_structured import build_json_prompt, extract_json, validate
+
+# OpenAI Batch API 완료 기한 (API가 허용하는 값)
+BATCH_COMPLETION_WINDOW = "24h"
+# 워커가 배치 완료를 기다리는 한도(초). 초과하면 배치를 취소하고 남은 행은 실시간 호출로 처리
+# (Celery 워커 슬롯을 completion_window 내내 붙잡지 않도록 짧게 유지)
+BATCH_TIMEOUT = float(os.getenv("LLM_BATCH_TIMEOUT", str(2 * 3600)))
+BATCH_POLL_INTERVAL = 30.0
+
+# 배치 상태 중 더 이상 바뀌지 않는 상태
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchError(Exception):
+    """배치 제출/폴링/결과 다운로드 실패"""
+
+
+class BatchCancelled(BatchError):
+    """작업이 취소되어 배치 대기를 중단한 경우"""
+
+
+class BatchItem:
+    """배치에 포함되는 요청 1건"""
+
+    def __init__(self, custom_id: str, prompt: str, schema: Optional[Dict] = None):
+        self.custom_id = custom_id
+        self.prompt = prompt
+        self.schema = schema
+
+
+class LLMBatch:
+    """배치로 제출할 프롬프트 모음"""
+
+    def __init__(self):
+        self.items: List[BatchItem] = []
+
+    def add(self, custom_id: str, prompt: str, schema: Optional[Dict] = None):
+        """
+        요청을 추가합니다.
+
+        Args:
+            custom_id: 결과를 행에 다시 매핑할 식별자 (배치 내에서 고유해야 함)
+            prompt: 프롬프트
+            schema: 구조화(JSON) 응답 스키마 (None이면 자유 텍스트)
+        """
+        self.items.append(BatchItem(custom_id, prompt, schema))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def run(self, backend) -> Dict[str, Any]:
+        """
+        배치를 실행하고 custom_id별 결과를 반환합니다.
+        스키마가 있는 요청은 JSON을 파싱/검증하여 통과한 값만 포함합니다.
+
+        Returns:
+            {custom_id: 텍스트 또는 파싱된 JSON 값} (실패한 항목은 제외)
+        """
+        if not self.items:
+            return {}
+
+        raw_results = backend.run(self.items)
+        results = {}
+        for item in self.items:
+            raw = raw_results.get(item.custom_id)
+            if not raw:
+                continue
+            if item.schema is None:
+                results[item.custom_id] = raw
+                continue
+            try:
+                value = extract_json(raw)
+                errors = validate(value, item.schema)
+            except ValueError as e:
+                errors = [str(e)]
+            if errors:
+                print(f"   ⚠️ 배치 응답 검증 실패 ({item.custom_id}): {errors[:3]}")
+                continue
+            results[item.custom_id] = value
+
+        print(f"[BATCH] {len(results)}/{len(self.items)}건 결과 수신")
+        return results
+
+
+class ProviderBatchBackend:
+    """배치 API가 없는 제공자를 제한된 동시성으로 직접 호출하는 백엔드"""
+
+    def __init__(self, provider: BaseLLMProvider, max_workers: int = 4):
+        self.provider = provider
+        self.max_workers = max_workers
+
+    def _call(self, item: BatchItem) -> Optional[str]:
+        try:
+            if item.schema is None:
+                return self.provider.generate_content(item.prompt)
+            return self.provider._generate_json(item.prompt, item.schema)
+        except Exception as e:
+            print(f"   ⚠️ 배치 항목 호출 실패 ({item.custom_id}): {e}")
+            return None
+
+    def run(self, items: List[BatchItem]) -> Dict[str, str]:
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm-batch") as executor:
+            texts = list(executor.map(self._call, items))
+        return {item.custom_id: text for item, text in zip(items, texts) if text}
+
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API 백엔드 (/v1/chat/completions 요청을 JSONL로 제출)"""
+
+    provider_name = "OpenAI Batch"
+
+    def __init__(
+        self,
+        client,
+        model: str,
+        metrics: Optional[LLMMetrics] = None,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        timeout: float = BATCH_TIMEOUT,
+        sleep: Callable[[float], None] = time.sleep,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        on_submit: Optional[Callable[[str], None]] = None,
+        resume_batch_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            client: openai.OpenAI 인스턴스 (client_pool.get_openai_client)
+            model: 배치 전체에 사용할 모델 (Batch API는 파일당 단일 모델)
+            metrics: 항목별 토큰 사용량을 기록할 집계기 (None이면 전역 레지스트리)
+            poll_interval: 상태 확인 간격(초)
+            timeout: 완료 대기 한도(초). 초과하면 배치를 취소합니다.
+            sleep: 대기 함수 (테스트에서 교체)
+            should_cancel: 폴링마다 호출되어 True를 반환하면 배치를 취소하고 BatchCancelled 발생 (작업 취소 확인)
+            on_submit: 배치를 제출한 직후 배치 ID로 호출 (작업 meta_data에 보관해 재실행 시 이어서 대기)
+            resume_batch_id: 이전 실행에서 제출한 배치 ID (있으면 다시 제출하지 않고 그 배치를 기다림)
+        """
+        self.client = client
+        self.model = model
+        self.metrics = metrics
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.sleep = sleep
+        self.should_cancel = should_cancel
+        self.on_submit = on_submit
+        self.resume_batch_id = resume_batch_id
+
+    def _request_line(self, item: BatchItem) -> str:
+        body = {"model": self.model, "messages": [{"role": "user", "content": item.prompt}]}
+        if item.schema is not None:
+            body["messages"][0]["content"] = build_json_prompt(item.prompt, item.schema)
+            body["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "result", "schema": item.schema},
+            }
+        return json.dumps(
+            {"custom_id": item.custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body},
+            ensure_ascii=False,
+        )
+
+    def submit(self, items: List[BatchItem]) -> str:
+        """JSONL 파일을 업로드하고 배치를 생성한 뒤 배치 ID를 반환합니다."""
+        payload = "\n".join(self._request_line(item) for item in items).encode("utf-8")
+        input_file = self.client.files.create(file=("batch.jsonl", payload), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=BATCH_COMPLETION_WINDOW,
+        )
+        print(f"[BATCH] OpenAI 배치 제출: {batch.id} ({len(items)}건, 모델 {self.model})")
+        return batch.id
+
+    def wait(self, batch_id: str):
+        """배치가 종료 상태가 될 때까지 폴링합니다. (작업 취소/대기 한도 초과 시 배치 취소)"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in _TERMINAL_STATUSES:
+                return batch
+            if self.should_cancel is not None and self.should_cancel():
+                self.client.batches.cancel(batch_id)
+                raise BatchCancelled(f"작업 취소로 배치 {batch_id} 대기 중단")
+            if time.monotonic() >= deadline:
+                self.client.batches.cancel(batch_id)
+                raise BatchError(f"배치 {batch_id} 완료 대기 시간 초과 (상태: {batch.status})")
+            self.sleep(self.poll_interval)
+
+    def download(self, batch) -> Dict[str, str]:
+        """결과 파일을 내려받아 custom_id별 응답 텍스트를 반환합니다."""
+        if not batch.output_file_id:
+            return {}
+
+        results = {}
+        content = self.client.files.content(batch.output_file_id).text
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                print(f"   ⚠️ 배치 항목 실패 ({record.get('custom_id')}): {record.get('error') or response.get('status_code')}")
+                continue
+            body = response["body"]
+            text = body["choices"][0]["message"]["content"].strip()
+            usage = body.get("usage")
+            self._record(text, usage)
+            results[record["custom_id"]] = text
+        return results
+
+    def _record(self, text: str, usage: Optional[Dict]):
+        metrics = self.metrics or METRICS_REGISTRY
+        if usage:
+            prompt_tokens, completion_tokens = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+        else:
+            prompt_tokens, completion_tokens = 0, estimate_tokens(text)
+        # 항목별 지연은 배치 전체 대기 시간에 묻히므로 0으로 기록 (토큰/호출 수만 의미 있음)
+        metrics.record(self.provider_name, self.model, 0.0, prompt_tokens=prompt_tokens,
+                       completion_tokens=completion_tokens, estimated=not usage)
+
+    def run(self, items: List[BatchItem]) -> Dict[str, str]:
+        batch_id = self.resume_batch_id
+        if batch_id:
+            print(f"[BATCH] 이전에 제출한 OpenAI 배치 이어서 대기: {batch_id}")
+        else:
+            batch_id = self.submit(items)
+            if self.on_submit is not None:
+                self.on_submit(batch_id)
+        batch = self.wait(batch_id)
+        if batch.status != "completed":
+            raise BatchError(f"배치 {batch_id} 실패 (상태: {batch.status})")
+        return self.download(batch)
+
+
+def get_batch_backend(provider: BaseLLMProvider, **kwargs):
+    """
+    제공자에 맞는 배치 백엔드를 반환합니다.
+    OpenAI 제공자는 Batch API를, 그 외 제공자는 직접 호출 백엔드를 사용합니다.
+
+    Args:
+        provider: 작업별로 라우팅된 제공자 (provider.for_task(...))
+        **kwargs: OpenAIBatchBackend 옵션 (poll_interval, timeout, should_cancel, on_submit, resume_batch_id 등)
+    """
+    if isinstance(provider, OpenAIProvider) and provider.is_configured():
+        return OpenAIBatchBackend(provider.client, provider.model_name, metrics=provider.metrics, **kwargs)
+    return ProviderBatchBackend(provider)
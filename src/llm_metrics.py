@@ -0,0 +1,136 @@
+"""
+LLM 호출 지표 수집
+- 호출별 응답 시간, 프롬프트/완료 토큰 수, 재시도 횟수, 오류 종류 기록
+- 작업(Job) 단위 집계기와 프로세스 전역 레지스트리(METRICS_REGISTRY) 제공
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+# p95 계산용으로 보관하는 최근 응답 시간 표본 수
+LATENCY_SAMPLE_SIZE = 5000
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    제공자가 usage를 반환하지 않을 때 사용하는 토큰 수 추정치.
+    영문/숫자는 약 4자당 1토큰, 한글 등 비-ASCII 문자는 약 1.5자당 1토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return max(1, int(round(ascii_chars / 4 + other_chars / 1.5)))
+
+
+class _ModelStats:
+    """제공자/모델 하나의 누적 지표"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.estimated_calls = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latencies = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self.errors_by_class: Dict[str, int] = {}
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.latencies)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else 0.0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "estimated_token_calls": self.estimated_calls,
+            "latency_avg": round(self.latency_total / self.calls, 3) if self.calls else 0.0,
+            "latency_p95": round(p95, 3),
+            "latency_max": round(self.latency_max, 3),
+            "errors_by_class": dict(self.errors_by_class),
+        }
+
+
+class LLMMetrics:
+    """LLM 호출 지표 집계기 (스레드 안전)"""
+
+    def __init__(self, parent: Optional["LLMMetrics"] = None):
+        """
+        Args:
+            parent: 같은 기록을 함께 전달할 상위 집계기 (예: METRICS_REGISTRY)
+        """
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _ModelStats] = {}
+        self._parent = parent
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        latency: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        retries: int = 0,
+        error: Optional[Exception] = None,
+        estimated: bool = False,
+    ):
+        """
+        LLM 호출 1건(재시도 포함)의 결과를 기록합니다.
+
+        Args:
+            provider: 제공자 이름 (예: "Gemini")
+            model: 모델명
+            latency: 재시도 대기를 포함한 전체 소요 시간(초)
+            prompt_tokens: 프롬프트 토큰 수
+            completion_tokens: 완료 토큰 수
+            retries: 재시도 횟수
+            error: 최종 실패한 경우 그 예외
+            estimated: 토큰 수가 추정치인지 여부
+        """
+        key = f"{provider}:{model}" if model else provider
+        with self._lock:
+            stats = self._stats.setdefault(key, _ModelStats())
+            stats.calls += 1
+            stats.retries += retries
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            stats.latency_total += latency
+            stats.latency_max = max(stats.latency_max, latency)
+            stats.latencies.append(latency)
+            if estimated:
+                stats.estimated_calls += 1
+            if error is not None:
+                stats.errors += 1
+                error_class = type(error).__name__
+                stats.errors_by_class[error_class] = stats.errors_by_class.get(error_class, 0) + 1
+
+        if self._parent is not None:
+            self._parent.record(provider, model, latency, prompt_tokens, completion_tokens,
+                                retries, error, estimated)
+
+    def snapshot(self) -> Dict:
+        """
+        현재까지의 집계 결과를 JSON 직렬화 가능한 딕셔너리로 반환합니다.
+
+        Returns:
+            Dict: {"calls": N, "errors": N, "retries": N, "prompt_tokens": N,
+                   "completion_tokens": N, "by_model": {"Gemini:gemini-2.0-flash": {...}}}
+        """
+        with self._lock:
+            by_model = {key: stats.to_dict() for key, stats in self._stats.items()}
+
+        totals = {"calls": 0, "errors": 0, "retries": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        for stats in by_model.values():
+            for field in totals:
+                totals[field] += stats[field]
+        totals["by_model"] = by_model
+        return totals
+
+
+# 프로세스 전역 지표 레지스트리 (모든 작업의 기록이 함께 누적됨)
+METRICS_REGISTRY = LLMMetrics()
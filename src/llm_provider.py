@@ -4,13 +4,78 @@ LLM Provider 추상화 레이어
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import copy
 import os
-import google.generativeai as genai
+import threading
+import time
+
+from src.client_pool import attach_gemini_client, get_gemini_client, get_openai_client
+from src.llm_metrics import METRICS_REGISTRY, LLMMetrics, estimate_tokens
+from src.llm_retry import DEFAULT_RETRY_POLICY, RetryError, RetryPolicy
+from src.llm_structured import StructuredOutputError, build_json_prompt, build_repair_prompt, extract_json, validate
+from src.single_flight import SingleFlight
+
+# 1회 시도당 HTTP 타임아웃 상한(초). 남은 데드라인이 더 짧으면 그 값을 사용
+REQUEST_TIMEOUT = 60.0
+
+# 제공자별 기본 모델
+DEFAULT_MODELS = {
+    "gemini": "gemini-2.0-flash",
+    "openai": "gpt-5-nano",
+    "fake": "fake-model",
+}
+
+# 파이프라인 작업 종류 (모델 라우팅 단위)
+TASK_REFINE = "refine"
+TASK_VARIATION = "variation"
+TASK_CURATION = "curation"
+# 후보 키워드가 LONG_CURATION_SIZE개 이상인 큐레이션
+TASK_CURATION_LONG = "curation_long"
+LONG_CURATION_SIZE = 40
+
+# 작업별 기본 라우팅 표: 호출량이 많고 단순한 변형 생성은 가장 빠른 모델,
+# 후보가 많은 큐레이션만 상위 모델로 보냄 (표에 없는 작업은 기본 모델 사용)
+# 사용자가 라우팅을 켠 경우에만 적용 (resolve_routing 참고)
+DEFAULT_ROUTES = {
+    "gemini": {
+        TASK_REFINE: "gemini-2.0-flash",
+        TASK_VARIATION: "gemini-2.0-flash-lite",
+        TASK_CURATION: "gemini-2.0-flash",
+        TASK_CURATION_LONG: "gemini-2.5-flash",
+    },
+    "openai": {
+        TASK_REFINE: "gpt-5-nano",
+        TASK_VARIATION: "gpt-5-nano",
+        TASK_CURATION: "gpt-5-nano",
+        TASK_CURATION_LONG: "gpt-5-mini",
+    },
+}
+
+
+class LLMError(Exception):
+    """
+    LLM 호출 실패 예외.
+    재시도 정책을 모두 소진했거나 재시도 불가능한 오류가 발생한 경우 발생합니다.
+    """
+
+    def __init__(self, message: str, cause: Optional[Exception] = None, attempts: int = 1):
+        super().__init__(message)
+        self.cause = cause
+        self.attempts = attempts
 
 
 class BaseLLMProvider(ABC):
     """LLM 제공자 추상 베이스 클래스"""
+
+    # 하위 클래스가 생성자에서 덮어쓰지 않으면 공용 기본 정책 사용
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY
+    provider_name: str = "llm"
+    model_name: str = ""
+    # 작업 단위 호출 지표 (생성자에서 제공자별로 생성, 전역 레지스트리에도 함께 기록)
+    metrics: Optional[LLMMetrics] = None
     
     @abstractmethod
     def generate_content(self, prompt: str) -> str:
@@ -35,22 +100,146 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    def generate_structured(self, prompt: str, schema: Dict, max_repairs: int = 1) -> Any:
+        """
+        JSON Schema에 맞는 구조화된 결과를 생성합니다.
+        제공자의 JSON 응답 모드를 사용하고, 로컬 검증에 실패한 경우에만
+        오류 내용을 담은 수리 프롬프트로 다시 요청합니다.
+
+        Args:
+            prompt: 작업 지시 프롬프트
+            schema: 기대하는 결과의 JSON Schema (type/properties/required/items 등)
+            max_repairs: 스키마 검증 실패 시 최대 재요청 횟수
+
+        Returns:
+            스키마를 만족하는 파싱된 JSON 값
+
+        Raises:
+            StructuredOutputError: 재요청 후에도 스키마를 만족하지 못한 경우
+            LLMError: API 호출 자체가 실패한 경우
+        """
+        request_prompt = prompt
+        for attempt in range(max_repairs + 1):
+            raw = self._generate_json(request_prompt, schema)
+            try:
+                value = extract_json(raw)
+                errors = validate(value, schema)
+            except ValueError as e:
+                errors = [str(e)]
+            if not errors:
+                return value
+            print(f"   ⚠️ {self.provider_name} 구조화 응답 검증 실패 ({attempt + 1}/{max_repairs + 1}): {errors[:3]}")
+            request_prompt = build_repair_prompt(prompt, schema, raw, errors)
+
+        raise StructuredOutputError(f"{self.provider_name} 구조화 응답이 스키마를 만족하지 않습니다: {errors[:3]}",
+                                    raw=raw, errors=errors)
+
+    def _generate_json(self, prompt: str, schema: Dict) -> str:
+        """
+        JSON 응답 텍스트를 생성합니다. 제공자별 JSON 모드가 있으면 하위 클래스에서 재정의합니다.
+        """
+        return self.generate_content(build_json_prompt(prompt, schema))
+
+    def for_task(self, task: str, size: int = 0) -> "BaseLLMProvider":
+        """
+        작업 종류/입력 크기에 맞는 제공자를 반환합니다.
+        라우팅을 지원하지 않는 제공자는 자기 자신을 반환합니다.
+
+        Args:
+            task: 작업 종류 (TASK_REFINE, TASK_VARIATION, TASK_CURATION)
+            size: 작업 입력 크기 (예: 큐레이션 후보 키워드 수)
+        """
+        return self
+
+    def _call_with_retry(self, request: Callable[[float], Tuple[str, Optional[Tuple[int, int]]]], prompt: str = "") -> str:
+        """
+        재시도 정책에 따라 단일 요청 함수를 호출하고 호출 지표를 기록합니다.
+
+        Args:
+            request: 1회 시도를 수행하는 함수 (인자: 이번 시도의 타임아웃 초,
+                     반환: (생성된 텍스트, (프롬프트 토큰, 완료 토큰) 또는 None))
+            prompt: 토큰 수 추정용 프롬프트 (usage가 없을 때 사용)
+
+        Returns:
+            생성된 텍스트
+
+        Raises:
+            LLMError: 재시도 불가능한 오류이거나 재시도를 모두 소진한 경우
+        """
+        started = time.monotonic()
+        retries = 0
+
+        def attempt(remaining: Optional[float]):
+            timeout = REQUEST_TIMEOUT if remaining is None else max(1.0, min(REQUEST_TIMEOUT, remaining))
+            return request(timeout)
+
+        def log_retry(attempt_no: int, error: Exception, delay: float):
+            nonlocal retries
+            retries += 1
+            print(f"[WARNING] {self.provider_name} 일시적 오류 ({type(error).__name__}). "
+                  f"{delay:.1f}s 후 재시도 ({attempt_no}/{self.retry_policy.max_attempts - 1})")
+
+        try:
+            text, usage = self.retry_policy.call(attempt, on_retry=log_retry)
+        except RetryError as e:
+            self._record_call(started, prompt, "", None, retries, e.last_exception)
+            raise LLMError(f"{self.provider_name} 컨텐츠 생성 중 오류: {e.last_exception}",
+                           cause=e.last_exception, attempts=e.attempts)
+        except Exception as e:
+            self._record_call(started, prompt, "", None, retries, e)
+            raise LLMError(f"{self.provider_name} 컨텐츠 생성 중 오류: {e}", cause=e)
+
+        self._record_call(started, prompt, text, usage, retries)
+        return text
+
+    def _record_call(self, started: float, prompt: str, text: str, usage: Optional[Tuple[int, int]],
+                     retries: int, error: Optional[Exception] = None):
+        """호출 1건의 지표를 작업 집계기(없으면 전역 레지스트리)에 기록합니다."""
+        metrics = self.metrics or METRICS_REGISTRY
+        if usage is not None:
+            prompt_tokens, completion_tokens = usage
+        else:
+            prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+        metrics.record(
+            self.provider_name,
+            self.model_name,
+            time.monotonic() - started,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            retries=retries,
+            error=error,
+            estimated=usage is None,
+        )
+
 
 class GeminiProvider(BaseLLMProvider):
     """Google Gemini LLM 제공자"""
+
+    provider_name = "Gemini"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, retry_policy: Optional[RetryPolicy] = None,
+                 model: str = DEFAULT_MODELS["gemini"]):
         """
         Gemini Provider를 초기화합니다.
         
         Args:
             api_key: Gemini API 키 (None이면 환경변수에서 로드)
+            retry_policy: 재시도 정책 (None이면 기본 정책)
+            model: 사용할 모델 (기본값: gemini-2.0-flash)
         """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self.model_name = model
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.metrics = LLMMetrics(parent=METRICS_REGISTRY)
+        self._inflight = SingleFlight()
         
         if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            import google.generativeai as genai
+
+            # 전역 genai.configure() 대신 키별 클라이언트를 주입하여
+            # 같은 프로세스의 다른 사용자 작업과 API 키가 섞이지 않도록 함
+            self.model = attach_gemini_client(genai.GenerativeModel(self.model_name),
+                                              get_gemini_client(self.api_key), self.api_key)
         else:
             self.model = None
             print("[WARNING] GEMINI_API_KEY not found")
@@ -59,20 +248,29 @@ class GeminiProvider(BaseLLMProvider):
         """Gemini로 컨텐츠를 생성합니다."""
         if not self.is_configured():
             raise ValueError("Gemini API key is not configured")
-        
-        import time
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = self.model.generate_content(prompt)
-                return response.text.strip()
-            except Exception as e:
-                if "429" in str(e) and attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 5  # 5s, 10s, 15s
-                    print(f"[WARNING] Gemini Qualta Exceeded. Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                raise Exception(f"Gemini 컨텐츠 생성 중 오류: {e}")
+        return self._run(prompt)
+
+    def _generate_json(self, prompt: str, schema: Dict) -> str:
+        """Gemini JSON 응답 모드(response_mime_type)로 생성합니다."""
+        if not self.is_configured():
+            raise ValueError("Gemini API key is not configured")
+        return self._run(build_json_prompt(prompt, schema), json_mode=True)
+
+    def _run(self, prompt: str, json_mode: bool = False) -> str:
+        generation_config = {"response_mime_type": "application/json"} if json_mode else None
+
+        def request(timeout: float):
+            response = self.model.generate_content(
+                prompt,
+                generation_config=generation_config,
+                request_options={"timeout": timeout},
+            )
+            usage = getattr(response, "usage_metadata", None)
+            tokens = (usage.prompt_token_count, usage.candidates_token_count) if usage else None
+            return response.text.strip(), tokens
+
+        # 동일 프롬프트가 동시에 들어오면 한 번만 호출하고 결과 공유
+        return self._inflight.do((prompt, json_mode), lambda: self._call_with_retry(request, prompt))
     
     def is_configured(self) -> bool:
         """Gemini API 키가 설정되어 있는지 확인합니다."""
@@ -81,39 +279,34 @@ class GeminiProvider(BaseLLMProvider):
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI ChatGPT LLM 제공자"""
+
+    provider_name = "OpenAI"
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-5-nano"):
+    def __init__(self, api_key: Optional[str] = None, model: str = DEFAULT_MODELS["openai"], retry_policy: Optional[RetryPolicy] = None):
         """
         OpenAI Provider를 초기화합니다.
         
         Args:
             api_key: OpenAI API 키 (None이면 환경변수에서 로드)
             model: 사용할 모델 (기본값: gpt-4o-mini)
+            retry_policy: 재시도 정책 (None이면 기본 정책)
         """
         raw_api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.api_key = self._sanitize_api_key(raw_api_key)
         self.model_name = model
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.metrics = LLMMetrics(parent=METRICS_REGISTRY)
+        self._inflight = SingleFlight()
         
         if not self.api_key:
             print("[WARNING] OPENAI_API_KEY not found")
         
         # OpenAI 클라이언트는 lazy import로 처리 (설치되지 않았을 수 있음)
+        # API 키별로 프로세스 전역 풀에서 재사용하여 keep-alive 연결 유지
         self.client = None
         if self.api_key:
             try:
-                from openai import OpenAI
-                import httpx
-                
-                # Custom HTTP client with enforced UTF-8 headers
-                http_client = httpx.Client(
-                    headers={"Content-Type": "application/json; charset=utf-8"},
-                    timeout=60.0
-                )
-                
-                self.client = OpenAI(
-                    api_key=self.api_key,
-                    http_client=http_client
-                )
+                self.client = get_openai_client(self.api_key)
             except ImportError:
                 print("[ERROR] openai 또는 httpx 패키지가 설치되지 않았습니다. pip install openai httpx를 실행하세요.")
 
@@ -148,48 +341,401 @@ class OpenAIProvider(BaseLLMProvider):
         if not self.is_configured():
             raise ValueError("OpenAI API key is not configured")
         
-        try:
-            # 프롬프트가 문자열인지 확인하고 UTF-8로 안전하게 처리
-            if isinstance(prompt, bytes):
-                prompt = prompt.decode('utf-8')
-            
+        # 프롬프트가 문자열인지 확인하고 UTF-8로 안전하게 처리
+        if isinstance(prompt, bytes):
+            prompt = prompt.decode('utf-8')
+        return self._run(prompt)
+
+    def _generate_json(self, prompt: str, schema: Dict) -> str:
+        """OpenAI Structured Outputs(response_format=json_schema)로 생성합니다."""
+        if not self.is_configured():
+            raise ValueError("OpenAI API key is not configured")
+        return self._run(build_json_prompt(prompt, schema), schema=schema)
+
+    def _run(self, prompt: str, schema: Optional[Dict] = None) -> str:
+        extra = {}
+        if schema is not None:
+            extra["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "result", "schema": schema},
+            }
+
+        def request(timeout: float):
             # OpenAI API 호출
             response = self.client.chat.completions.create(
                 model=self.model_name,
                 messages=[
                     {"role": "user", "content": prompt}
                 ],
+                timeout=timeout,
+                **extra,
             )
-            return response.choices[0].message.content.strip()
-        except UnicodeEncodeError as e:
-            import traceback
-            print(f"[ERROR] 인코딩 오류 상세:")
-            print(traceback.format_exc())
-            print(f"[DEBUG] 프롬프트 타입: {type(prompt)}, 길이: {len(prompt)}")
-            raise Exception(f"OpenAI 컨텐츠 생성 중 인코딩 오류: {e}")
-        except Exception as e:
-            import traceback
-            print(f"[ERROR] OpenAI API 호출 실패:")
-            print(traceback.format_exc())
-            raise Exception(f"OpenAI 컨텐츠 생성 중 오류: {e}")
+            usage = getattr(response, "usage", None)
+            tokens = (usage.prompt_tokens, usage.completion_tokens) if usage else None
+            return response.choices[0].message.content.strip(), tokens
+
+        try:
+            # 동일 프롬프트가 동시에 들어오면 한 번만 호출하고 결과 공유
+            return self._inflight.do((prompt, schema is not None), lambda: self._call_with_retry(request, prompt))
+        except LLMError as e:
+            if isinstance(e.cause, UnicodeEncodeError):
+                print(f"[ERROR] 인코딩 오류 상세: {e.cause}")
+                print(f"[DEBUG] 프롬프트 타입: {type(prompt)}, 길이: {len(prompt)}")
+            else:
+                print(f"[ERROR] OpenAI API 호출 실패 ({e.attempts}회 시도): {e}")
+            raise
     
     def is_configured(self) -> bool:
         """OpenAI API 키가 설정되어 있는지 확인합니다."""
         return self.api_key is not None and self.client is not None
 
 
+class LatencyTracker:
+    """최근 성공 호출의 응답 시간을 보관하고 백분위수를 계산합니다."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """표본이 없으면 None을 반환합니다."""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 임계값을 넘으면 일정 시간 동안 호출을 차단하는 회로 차단기.
+    차단 시간이 지나면 한 번의 시험 호출(half-open)을 허용합니다.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            failure_threshold: 회로 차단까지의 연속 실패 횟수
+            reset_timeout: 회로 차단 유지 시간(초)
+            clock: 시각 함수 (테스트에서 교체 가능)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        이번 호출을 보내도 되는지 확인합니다.
+        half-open 상태에서 True를 받으면 시험 호출을 예약한 것이므로 반드시 호출 결과를 기록해야 합니다.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self.clock() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+
+
+# 헤지/Failover 요청용 스레드 수 (프로세스 내 모든 FailoverLLMProvider가 공유)
+HEDGE_MAX_WORKERS = int(os.getenv("LLM_HEDGE_MAX_WORKERS", "16"))
+
+_hedge_executor_instance: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    """프로세스 공용 헤지 요청 스레드 풀 (작업마다 만들지 않음)"""
+    global _hedge_executor_instance
+    with _hedge_executor_lock:
+        if _hedge_executor_instance is None:
+            _hedge_executor_instance = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="llm-hedge")
+        return _hedge_executor_instance
+
+
+class FailoverLLMProvider(BaseLLMProvider):
+    """
+    여러 LLM 제공자를 우선순위대로 묶은 제공자.
+
+    - Hedged Request: 1순위 응답이 지연 임계값(관측 p95)을 넘기면 다음 제공자에도
+      동일 요청을 보내고 먼저 도착한 유효한 응답을 사용합니다.
+    - Failover: 제공자가 실패하면 즉시 다음 제공자로 넘어갑니다.
+    - Circuit Breaker: 연속 실패한 제공자는 일정 시간 호출 대상에서 제외합니다.
+    """
+
+    provider_name = "Failover"
+
+    def __init__(
+        self,
+        providers: List[BaseLLMProvider],
+        hedge_percentile: float = 95.0,
+        default_hedge_delay: float = 10.0,
+        min_hedge_delay: float = 1.0,
+        min_samples: int = 20,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            providers: 우선순위 순서의 제공자 목록 (설정되지 않은 제공자는 제외)
+            hedge_percentile: 헤지 요청 기준 지연 백분위수
+            default_hedge_delay: 관측 표본이 부족할 때 사용할 헤지 대기 시간(초)
+            min_hedge_delay: 헤지 대기 시간 하한(초)
+            min_samples: 관측 p95를 신뢰하기 위한 최소 표본 수
+            failure_threshold: 회로 차단까지의 연속 실패 횟수
+            reset_timeout: 회로 차단 유지 시간(초)
+            clock: 회로 차단기 시각 함수 (테스트에서 교체 가능)
+        """
+        self.providers = [p for p in providers if p.is_configured()]
+        # 하위 제공자의 기록을 하나의 작업 집계기로 모음 (제공자/모델별 구분은 유지)
+        self.metrics = LLMMetrics(parent=METRICS_REGISTRY)
+        for provider in self.providers:
+            provider.metrics = self.metrics
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self._breaker_settings = (failure_threshold, reset_timeout, clock)
+        self._latency = {id(p): LatencyTracker() for p in self.providers}
+        self._breakers = {id(p): CircuitBreaker(*self._breaker_settings) for p in self.providers}
+        self._routed: Dict[Tuple[int, ...], "FailoverLLMProvider"] = {}
+        self._routed_lock = threading.Lock()
+
+    def hedge_delay(self, provider: BaseLLMProvider) -> float:
+        """provider 응답을 기다린 뒤 다음 제공자에 헤지 요청을 보낼 시간(초)"""
+        tracker = self._latency[id(provider)]
+        if len(tracker) < self.min_samples:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, tracker.percentile(self.hedge_percentile))
+
+    def for_task(self, task: str, size: int = 0) -> BaseLLMProvider:
+        """
+        각 하위 제공자를 작업별 모델로 라우팅한 Failover 제공자를 반환합니다.
+        (지연 통계/회로 차단은 라우팅된 모델 조합별로 따로 관리하고, 스레드 풀과 지표는 공유)
+        """
+        routed = [p.for_task(task, size) for p in self.providers]
+        if all(r is p for r, p in zip(routed, self.providers)):
+            return self
+
+        key = tuple(id(p) for p in routed)
+        with self._routed_lock:
+            derived = self._routed.get(key)
+            if derived is None:
+                derived = copy.copy(self)
+                derived.providers = routed
+                derived._latency = {id(p): LatencyTracker() for p in routed}
+                derived._breakers = {id(p): CircuitBreaker(*self._breaker_settings) for p in routed}
+                self._routed[key] = derived
+            return derived
+
+    def _invoke(self, provider: BaseLLMProvider, call: Callable[[BaseLLMProvider], str]) -> str:
+        """제공자를 호출하고 지연/성공 여부를 기록합니다. (헤지 스레드에서 실행)"""
+        started = time.monotonic()
+        try:
+            result = call(provider)
+            if not result or not result.strip():
+                raise LLMError(f"{provider.provider_name} 빈 응답")
+        except Exception:
+            self._breakers[id(provider)].record_failure()
+            raise
+        self._latency[id(provider)].record(time.monotonic() - started)
+        self._breakers[id(provider)].record_success()
+        return result
+
+    def generate_content(self, prompt: str) -> str:
+        """우선순위/헤지/회로 차단 규칙에 따라 컨텐츠를 생성합니다."""
+        return self._hedged(lambda provider: provider.generate_content(prompt))
+
+    def _generate_json(self, prompt: str, schema: Dict) -> str:
+        """각 제공자의 JSON 응답 모드를 동일한 헤지/Failover 규칙으로 호출합니다."""
+        return self._hedged(lambda provider: provider._generate_json(prompt, schema))
+
+    def _hedged(self, call: Callable[[BaseLLMProvider], str]) -> str:
+        if not self.is_configured():
+            raise ValueError("No LLM provider is configured")
+
+        executor = _hedge_executor()
+        pending = {}
+        launched: List[BaseLLMProvider] = []
+        next_index = 0
+        last_error: Optional[Exception] = None
+
+        def launch() -> bool:
+            # 회로 허용 여부는 실제로 보내기 직전에 확인 (half-open 시험 호출을 예약만 하고 버리지 않도록)
+            nonlocal next_index
+            while next_index < len(self.providers):
+                provider = self.providers[next_index]
+                next_index += 1
+                if self._breakers[id(provider)].allow():
+                    launched.append(provider)
+                    pending[executor.submit(self._invoke, provider, call)] = provider
+                    return True
+            return False
+
+        if not launch():
+            raise LLMError("모든 LLM 제공자가 회로 차단 상태입니다.")
+        while pending:
+            can_hedge = next_index < len(self.providers)
+            hedge_delay = self.hedge_delay(launched[-1]) if can_hedge else None
+
+            done, _ = wait(list(pending), timeout=hedge_delay, return_when=FIRST_COMPLETED)
+            if not done:
+                # 가장 최근 요청이 지연 임계값을 넘김 → 다음 제공자에 헤지 요청
+                slow = launched[-1]
+                if launch():
+                    print(f"[INFO] {slow.provider_name} 응답 지연({hedge_delay:.1f}s 초과) → "
+                          f"{launched[-1].provider_name} 헤지 요청")
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    print(f"[WARNING] {provider.provider_name} 호출 실패: {e}")
+                    last_error = e
+
+            if not pending:
+                # 진행 중인 요청이 없으면 기다리지 않고 다음 제공자로 전환
+                launch()
+
+        raise LLMError(f"모든 LLM 제공자 호출 실패: {last_error}", cause=last_error)
+
+    def is_configured(self) -> bool:
+        """하나 이상의 제공자가 설정되어 있는지 확인합니다."""
+        return len(self.providers) > 0
+
+
+class RoutedLLMProvider(BaseLLMProvider):
+    """
+    작업 종류/입력 크기별로 모델을 골라 호출하는 제공자.
+    모델별 하위 제공자는 처음 필요할 때 생성하여 재사용하고, 호출 지표는 하나의 집계기로 모읍니다.
+    라우팅 표에 없는 작업과 generate_content 직접 호출은 기본 모델을 사용합니다.
+    """
+
+    def __init__(self, factory: Callable[[str], BaseLLMProvider], default_model: str, routes: Dict[str, str]):
+        """
+        Args:
+            factory: 모델명을 받아 하위 제공자를 생성하는 함수
+            default_model: 기본 모델
+            routes: 작업 종류 → 모델명 라우팅 표
+        """
+        self._factory = factory
+        self.routes = dict(routes)
+        self._lock = threading.Lock()
+        self._providers: Dict[str, BaseLLMProvider] = {}
+        self._metrics = LLMMetrics(parent=METRICS_REGISTRY)
+        self.default = self._provider(default_model)
+        self.provider_name = self.default.provider_name
+        self.model_name = self.default.model_name
+
+    @property
+    def metrics(self) -> LLMMetrics:
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, value: LLMMetrics):
+        # Failover 등 상위 제공자가 집계기를 바꾸면 모델별 하위 제공자에도 반영
+        with self._lock:
+            self._metrics = value
+            for provider in self._providers.values():
+                provider.metrics = value
+
+    def _provider(self, model: str) -> BaseLLMProvider:
+        with self._lock:
+            provider = self._providers.get(model)
+            if provider is None:
+                provider = self._factory(model)
+                provider.metrics = self._metrics
+                self._providers[model] = provider
+            return provider
+
+    def route(self, task: str, size: int = 0) -> str:
+        """작업에 사용할 모델명을 반환합니다."""
+        if task == TASK_CURATION and size >= LONG_CURATION_SIZE and TASK_CURATION_LONG in self.routes:
+            task = TASK_CURATION_LONG
+        return self.routes.get(task, self.model_name)
+
+    def for_task(self, task: str, size: int = 0) -> BaseLLMProvider:
+        return self._provider(self.route(task, size))
+
+    def generate_content(self, prompt: str) -> str:
+        return self.default.generate_content(prompt)
+
+    def _generate_json(self, prompt: str, schema: Dict) -> str:
+        return self.default._generate_json(prompt, schema)
+
+    def is_configured(self) -> bool:
+        return self.default.is_configured()
+
+
+def resolve_routing(provider_type: str, preference: Union[None, bool, Dict] = None) -> Optional[Dict[str, str]]:
+    """
+    사용자 설정(preferences["llm_routing"])을 반영한 라우팅 표를 만듭니다.
+
+    Args:
+        provider_type: 제공자 타입
+        preference: None/False면 라우팅 사용 안 함 (모든 작업을 사용자가 선택한 모델로 처리),
+                    True면 기본 라우팅 표, 딕셔너리면 기본 표에 덮어쓸 작업별 모델
+                    (예: {"variation": "gemini-2.0-flash"} 또는 {"openai": {"curation": "gpt-5-mini"}})
+
+    Returns:
+        작업 종류 → 모델명 딕셔너리 (라우팅을 사용하지 않으면 None)
+    """
+    if preference is None or preference is False:
+        return None
+
+    provider_type = provider_type.lower()
+    routes = dict(DEFAULT_ROUTES.get(provider_type, {}))
+    if isinstance(preference, dict):
+        overrides = preference.get(provider_type, preference)
+        routes.update({task: model for task, model in overrides.items() if isinstance(model, str) and model})
+    return routes
+
+
 def get_llm_provider(
     provider_type: str = "gemini",
     api_key: Optional[str] = None,
-    model: Optional[str] = None
+    model: Optional[str] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    routing: Optional[Dict[str, str]] = None
 ) -> BaseLLMProvider:
     """
     LLM 제공자 인스턴스를 생성하는 팩토리 함수
     
     Args:
-        provider_type: 제공자 타입 ("gemini" 또는 "openai")
+        provider_type: 제공자 타입 ("gemini", "openai" 또는 부하 테스트용 "fake")
         api_key: API 키 (None이면 환경변수 사용)
-        model: 사용할 모델 (OpenAI 전용, None이면 기본값 사용)
+        model: 사용할 (기본) 모델 (None이면 제공자별 기본값 사용)
+        retry_policy: 재시도 정책 (None이면 기본 정책)
+        routing: 작업 종류 → 모델명 라우팅 표 (resolve_routing 참고, None이면 단일 모델)
         
     Returns:
         BaseLLMProvider 인스턴스
@@ -198,11 +744,24 @@ def get_llm_provider(
         ValueError: 지원하지 않는 제공자 타입인 경우
     """
     provider_type = provider_type.lower()
+
+    if routing:
+        if provider_type not in DEFAULT_MODELS:
+            raise ValueError(f"지원하지 않는 LLM 제공자: {provider_type}")
+        return RoutedLLMProvider(
+            lambda routed_model: get_llm_provider(provider_type, api_key, routed_model, retry_policy),
+            model or DEFAULT_MODELS[provider_type],
+            routing,
+        )
     
     if provider_type == "gemini":
-        return GeminiProvider(api_key=api_key)
+        return GeminiProvider(api_key=api_key, retry_policy=retry_policy, model=model or DEFAULT_MODELS["gemini"])
     elif provider_type == "openai":
-        return OpenAIProvider(api_key=api_key, model=model or "gpt-5-nano")
+        return OpenAIProvider(api_key=api_key, model=model or DEFAULT_MODELS["openai"], retry_policy=retry_policy)
+    elif provider_type == "fake":
+        # 실제 API를 호출하지 않는 부하 테스트용 제공자 (FAKE_LLM_* 환경변수로 설정)
+        from src.fake_llm_provider import FakeLLMProvider
+        return FakeLLMProvider.from_env(model=model, retry_policy=retry_policy)
     else:
         raise ValueError(f"지원하지 않는 LLM 제공자: {provider_type}")
 
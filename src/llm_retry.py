@@ -0,0 +1,204 @@
+"""
+LLM 호출 재시도 정책
+- 지수 백오프 + Full Jitter (동시 재시도 폭주 방지)
+- Retry-After 헤더/메시지 존중
+- 재시도 가능/불가능(치명적) 오류 구분
+- 호출 단위 데드라인
+"""
+
+import random
+import re
+import time
+from typing import Callable, Optional
+
+
+# 재시도 가능한 HTTP 상태 코드 (Rate Limit, 일시적 서버 오류)
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# 재시도해도 결과가 바뀌지 않는 상태 코드 (인증/권한/요청 형식 오류)
+FATAL_STATUS_CODES = {400, 401, 403, 404, 413, 422}
+
+# 상태 코드가 없는 네트워크 계열 예외 클래스명 (SDK 의존 없이 이름으로 판별)
+RETRYABLE_EXCEPTION_NAMES = {
+    "APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError",
+    "ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded",
+    "TooManyRequests", "ConnectTimeout", "ReadTimeout", "ConnectError", "RemoteProtocolError",
+    "ConnectionError", "Timeout", "TimeoutError", "ConnectionResetError",
+}
+
+_RETRY_IN_PATTERN = re.compile(r"retry (?:in|after) ([\d.]+)\s*(ms|s|seconds?)?", re.IGNORECASE)
+
+
+class RetryError(Exception):
+    """재시도 한도 또는 데드라인을 소진한 경우 발생하는 예외"""
+
+    def __init__(self, message: str, last_exception: Exception, attempts: int):
+        super().__init__(message)
+        self.last_exception = last_exception
+        self.attempts = attempts
+
+
+def get_status_code(exc: Exception) -> Optional[int]:
+    """
+    예외에서 HTTP 상태 코드를 추출합니다.
+    (openai: status_code, google api_core: code, requests/httpx: response.status_code)
+    """
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        # openai의 code는 'rate_limit_exceeded' 같은 문자열이므로 정수만 인정
+        if isinstance(value, int) and not isinstance(value, bool):
+            return int(value)
+
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status
+    return None
+
+
+def get_retry_after(exc: Exception) -> Optional[float]:
+    """
+    예외에서 서버가 지시한 재시도 대기 시간(초)을 추출합니다.
+    - Retry-After / retry-after-ms 응답 헤더
+    - 'Please retry in 12.3s' 형태의 오류 메시지 (Gemini)
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or getattr(exc, "headers", None)
+    if headers:
+        try:
+            retry_after_ms = headers.get("retry-after-ms")
+            if retry_after_ms:
+                return float(retry_after_ms) / 1000.0
+            retry_after = headers.get("retry-after")
+            if retry_after:
+                return float(retry_after)
+        except (TypeError, ValueError):
+            # HTTP-date 형식 등은 무시하고 백오프 계산에 맡김
+            pass
+
+    match = _RETRY_IN_PATTERN.search(str(exc))
+    if match:
+        value = float(match.group(1))
+        unit = (match.group(2) or "s").lower()
+        return value / 1000.0 if unit == "ms" else value
+    return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    """예외가 재시도로 회복 가능한 일시적 오류인지 판별합니다."""
+    if isinstance(exc, (ValueError, TypeError, UnicodeError)):
+        return False
+
+    status = get_status_code(exc)
+    if status is not None:
+        if status in RETRYABLE_STATUS_CODES:
+            return True
+        if status in FATAL_STATUS_CODES or 400 <= status < 500:
+            return False
+        if status >= 500:
+            return True
+
+    if type(exc).__name__ in RETRYABLE_EXCEPTION_NAMES:
+        return True
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+
+    # SDK가 상태 코드를 메시지로만 노출하는 경우
+    message = str(exc).lower()
+    return any(token in message for token in ("429", "rate limit", "quota", "503", "overloaded", "timed out", "timeout"))
+
+
+class RetryPolicy:
+    """
+    모든 LLM 제공자가 공유하는 재시도 정책.
+
+    지수 백오프에 Full Jitter를 적용하여(0 ~ base * 2^attempt 사이 균등 분포)
+    여러 스레드가 동시에 재시도하는 현상을 방지하고, 서버가 Retry-After를
+    지정하면 그 값을 우선합니다. 전체 호출은 deadline(초)을 넘지 않습니다.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        deadline: Optional[float] = 120.0,
+        retryable: Callable[[Exception], bool] = is_retryable,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            max_attempts: 최초 시도를 포함한 최대 시도 횟수
+            base_delay: 백오프 기본 대기 시간(초)
+            max_delay: 1회 대기 시간 상한(초)
+            deadline: 호출 전체 제한 시간(초, None이면 무제한)
+            retryable: 예외의 재시도 가능 여부 판별 함수
+            sleep: 대기 함수 (테스트에서 교체 가능)
+            rng: 난수 생성기 (테스트에서 시드 고정 가능)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retryable = retryable
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+
+    def compute_delay(self, attempt: int, exc: Optional[Exception] = None) -> float:
+        """
+        attempt번째 실패(0부터 시작) 이후의 대기 시간을 계산합니다.
+        """
+        if exc is not None:
+            retry_after = get_retry_after(exc)
+            if retry_after is not None:
+                return max(0.0, retry_after)
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return self.rng.uniform(0, cap)
+
+    def call(
+        self,
+        func: Callable[[Optional[float]], object],
+        on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    ):
+        """
+        정책에 따라 func를 호출합니다.
+
+        Args:
+            func: 시도마다 남은 시간(초, 데드라인이 없으면 None)을 인자로 받는 함수
+            on_retry: 재시도 직전에 (시도 번호, 예외, 대기 시간)으로 호출되는 콜백
+
+        Returns:
+            func의 반환값
+
+        Raises:
+            재시도 불가능한 오류는 그대로, 한도/데드라인 소진 시 RetryError
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            remaining = None
+            if self.deadline is not None:
+                remaining = self.deadline - (time.monotonic() - started)
+            try:
+                return func(remaining)
+            except Exception as e:
+                if not self.retryable(e):
+                    raise
+                attempt += 1
+                if attempt >= self.max_attempts:
+                    raise RetryError(f"{attempt}회 시도 후 실패: {e}", e, attempt) from e
+
+                delay = self.compute_delay(attempt - 1, e)
+                if self.deadline is not None:
+                    remaining = self.deadline - (time.monotonic() - started)
+                    if delay >= remaining:
+                        raise RetryError(f"데드라인({self.deadline}s) 초과로 재시도 중단: {e}", e, attempt) from e
+
+                if on_retry:
+                    on_retry(attempt, e, delay)
+                self.sleep(delay)
+
+
+# 제공자가 별도 정책을 받지 않았을 때 사용하는 기본 정책
+DEFAULT_RETRY_POLICY = RetryPolicy()
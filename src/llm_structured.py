@@ -0,0 +1,111 @@
+"""
+LLM 구조화(JSON) 출력 유틸리티
+- 응답 텍스트에서 JSON 추출 (코드펜스/앞뒤 설명 제거)
+- JSON Schema 부분 집합(type/properties/required/items/min*/max*) 로컬 검증
+- 스키마 지시 프롬프트 및 수리(repair) 프롬프트 생성
+"""
+
+import json
+import re
+from typing import Any, Dict, List
+
+_CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+}
+
+
+class StructuredOutputError(ValueError):
+    """LLM 응답이 수리 후에도 스키마를 만족하지 못한 경우 발생하는 예외"""
+
+    def __init__(self, message: str, raw: str = "", errors: List[str] = None):
+        super().__init__(message)
+        self.raw = raw
+        self.errors = errors or []
+
+
+def extract_json(text: str) -> Any:
+    """
+    응답 텍스트에서 JSON 값을 추출합니다.
+
+    Raises:
+        ValueError: JSON을 찾거나 파싱할 수 없는 경우
+    """
+    if not text or not text.strip():
+        raise ValueError("빈 응답")
+
+    cleaned = _CODE_FENCE_PATTERN.sub("", text.strip()).strip()
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        pass
+
+    # 앞뒤에 설명이 붙은 경우 가장 바깥 객체/배열만 잘라서 재시도
+    for open_char, close_char in (("{", "}"), ("[", "]")):
+        start, end = cleaned.find(open_char), cleaned.rfind(close_char)
+        if start != -1 and end > start:
+            try:
+                return json.loads(cleaned[start:end + 1])
+            except json.JSONDecodeError:
+                continue
+    raise ValueError("JSON 파싱 실패")
+
+
+def validate(value: Any, schema: Dict, path: str = "$") -> List[str]:
+    """
+    값이 스키마를 만족하는지 검증합니다.
+
+    Returns:
+        오류 메시지 리스트 (비어 있으면 통과)
+    """
+    errors = []
+    expected = schema.get("type")
+    if expected and not _TYPE_CHECKS[expected](value):
+        return [f"{path}: {expected} 타입이어야 합니다."]
+
+    if expected == "object":
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key}: 필수 항목이 없습니다.")
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value:
+                errors.extend(validate(value[key], sub_schema, f"{path}.{key}"))
+    elif expected == "array":
+        if len(value) < schema.get("minItems", 0):
+            errors.append(f"{path}: 최소 {schema['minItems']}개 항목이 필요합니다.")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            errors.append(f"{path}: 최대 {schema['maxItems']}개 항목까지 허용됩니다.")
+        item_schema = schema.get("items")
+        if item_schema:
+            for i, item in enumerate(value):
+                errors.extend(validate(item, item_schema, f"{path}[{i}]"))
+    elif expected == "string":
+        if len(value.strip()) < schema.get("minLength", 0):
+            errors.append(f"{path}: 최소 {schema['minLength']}자 이상이어야 합니다.")
+
+    return errors
+
+
+def build_json_prompt(prompt: str, schema: Dict) -> str:
+    """스키마에 맞는 JSON만 출력하도록 지시하는 프롬프트를 만듭니다."""
+    return (
+        f"{prompt}\n\n"
+        f"Respond with JSON only (no markdown, no explanation) matching this JSON Schema:\n"
+        f"{json.dumps(schema, ensure_ascii=False)}"
+    )
+
+
+def build_repair_prompt(prompt: str, schema: Dict, raw: str, errors: List[str]) -> str:
+    """스키마 검증에 실패한 응답을 수정하도록 요청하는 프롬프트를 만듭니다."""
+    return (
+        f"{build_json_prompt(prompt, schema)}\n\n"
+        f"Your previous response was invalid:\n{raw[:1000]}\n"
+        f"Problems: {'; '.join(errors[:5])}\n"
+        f"Return corrected JSON only."
+    )
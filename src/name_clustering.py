@@ -0,0 +1,192 @@
+"""
+작업 내 옵션 변형 상품명 묶기
+- 끝에 붙은 색상/사이즈/수량/규격 표기나 괄호 안 옵션만 다른 행(예: "남성 기모 후드티 블랙 XL", "남성 기모 후드티 (그레이/M)")을
+  옵션을 뺀 기본 상품명으로 묶음 (상품명 중간의 단어는 옵션으로 보지 않음)
+- 묶음마다 첫 행의 원래 상품명으로 정제/키워드/카테고리 처리를 하고, 결과를 묶음의 다른 행에 펼침
+  (정제된 상품명 끝의 옵션을 행별 옵션으로 바꿔 붙임)
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+from src.product_name_rules import pre_clean
+from src.result_cache import normalize_key
+
+# 옵션으로 보는 색상 단어 (소문자 비교, "크림"/"와인"/"골드"처럼 상품명으로도 쓰이는 단어는 제외)
+COLOR_WORDS = {
+    "블랙", "화이트", "그레이", "레드", "블루", "네이비", "핑크", "베이지", "브라운", "그린",
+    "옐로우", "퍼플", "바이올렛", "아이보리", "카키", "실버", "차콜", "스카이블루",
+    "검정", "검정색", "흰색", "회색", "빨강", "빨간색", "파랑", "파란색", "분홍", "분홍색", "노랑", "노란색",
+    "초록", "초록색", "갈색", "남색", "보라", "보라색", "하늘색", "연두", "연두색", "주황", "주황색", "금색", "은색",
+    "black", "white", "gray", "grey", "red", "blue", "navy", "pink", "beige", "brown", "green",
+    "yellow", "purple", "ivory", "khaki", "silver", "charcoal",
+}
+
+# 옵션으로 보는 의류 사이즈 표기
+SIZE_WORDS = {"xs", "xl", "xxl", "xxxl", "2xl", "3xl", "4xl", "free", "프리", "프리사이즈"}
+# 한 글자 사이즈는 다른 옵션 바로 뒤, 괄호 안, 옵션 항목 이름 뒤에 있을 때만 옵션으로 봄 ("비타민 C", "티셔츠 L" 보존)
+LETTER_SIZES = {"s", "m", "l", "f"}
+
+# 옵션 값 앞에 붙는 항목 이름 (단어 자체를 제거)
+OPTION_LABELS = {"옵션", "선택", "색상", "컬러", "color", "사이즈", "size", "타입", "type", "수량"}
+
+# 괄호 묶음 또는 일반 토큰 (하이픈은 모델명 "AB-1234" 보존을 위해 단독일 때만 구분자로 취급)
+_UNIT_PATTERN = re.compile(r"[\[(【{<]([^\[\]()【】{}<>]*)[\])】}>]|[^\s\[\](){}<>【】/_,|:·]+")
+_TOKEN_SPLIT_PATTERN = re.compile(r"[\s\[\](){}<>【】/_,|:·]+")
+# 숫자 옵션: 수량(10개, 3p, 2세트), 규격(500ml, 30x40cm, 230mm), 번호/호수/타입(1번, 3호, A타입)
+_OPTION_TOKEN_PATTERN = re.compile(
+    r"^(?:\d+(?:\.\d+)?(?:개|개입|p|pcs|ea|세트|set|팩|매|장|켤레|족|롤|병|봉)"
+    r"|\d+(?:\.\d+)?(?:[x×*]\d+(?:\.\d+)?)*(?:ml|l|cm|mm|m|kg|g|인치|inch|호|번|단|구|인용)"
+    r"|[a-z0-9]{1,2}(?:형|타입|type)"
+    r"|(?:no\.?|#)\d+)$",
+    re.IGNORECASE,
+)
+
+# 대표 행으로 처리하기 위한 최소 기본 상품명 길이
+MIN_BASE_LENGTH = 2
+
+
+def _is_option_token(token: str) -> bool:
+    lowered = token.lower()
+    return (
+        lowered in COLOR_WORDS
+        or lowered in SIZE_WORDS
+        or lowered in OPTION_LABELS
+        or bool(_OPTION_TOKEN_PATTERN.match(token))
+    )
+
+
+def _is_option_group(tokens: List[str]) -> bool:
+    """괄호 안 토큰이 모두 옵션이면 True (항목 이름이 있으면 값은 무엇이든 옵션으로 봄)"""
+    if not tokens:
+        return False
+    if any(token.lower() in OPTION_LABELS for token in tokens):
+        return True
+    return (
+        all(_is_option_token(token) or token.lower() in LETTER_SIZES for token in tokens)
+        and any(_is_option_token(token) for token in tokens)
+    )
+
+
+def split_variant(name: str) -> Tuple[str, List[str]]:
+    """
+    상품명을 기본 상품명과 옵션 부분으로 나눕니다.
+    옵션은 옵션만 들어 있는 괄호 묶음과 상품명 끝에 이어진 옵션 토큰만 인정합니다.
+
+    Returns:
+        (기본 상품명, 옵션 토큰 리스트) - 옵션 항목 이름(색상/사이즈 등)은 옵션에 포함하지 않음
+    """
+    units = []  # (토큰 리스트, 괄호 묶음 여부)
+    for match in _UNIT_PATTERN.finditer(name):
+        if match.group(1) is not None:
+            tokens = [token for token in _TOKEN_SPLIT_PATTERN.split(match.group(1)) if token and token != "-"]
+            if tokens:
+                units.append((tokens, True))
+        elif match.group(0) != "-":
+            units.append(([match.group(0)], False))
+
+    is_option = [group and _is_option_group(tokens) for tokens, group in units]
+    # 끝에서부터 옵션 토큰이 이어지는 동안만 옵션으로 처리
+    end = len(units)
+    while end > 0:
+        tokens, group = units[end - 1]
+        if group:
+            if not is_option[end - 1]:
+                break
+        else:
+            token = tokens[0]
+            weak = token.lower() in LETTER_SIZES and end >= 2 and (
+                is_option[end - 2] or _is_option_token(units[end - 2][0][-1]))
+            if not (_is_option_token(token) or weak):
+                break
+            is_option[end - 1] = True
+        end -= 1
+
+    if all(is_option):
+        # 전부 옵션이면 나누지 않음
+        return " ".join(token for tokens, _ in units for token in tokens), []
+
+    base, options = [], []
+    for (tokens, _), option in zip(units, is_option):
+        if option:
+            options.extend(token for token in tokens if token.lower() not in OPTION_LABELS)
+        else:
+            base.extend(tokens)
+    return " ".join(base), options
+
+
+class VariantCluster:
+    """기본 상품명이 같은 행 묶음"""
+
+    def __init__(self, base_name: str):
+        self.base_name = base_name
+        self.rows: List[Dict] = []
+        self.options: Dict[int, List[str]] = {}  # row_index → 옵션 토큰
+
+    @property
+    def representative(self) -> Dict:
+        """
+        파이프라인에 넣을 대표 행 (첫 행 그대로, 기본 상품명만 정제에 보내면 옵션 분리 오류가 결과에 남음)
+        """
+        return self.rows[0]
+
+    def option_text(self, row_index: int) -> str:
+        """행의 옵션 부분을 규칙 정제한 문자열 (LLM 호출 없음)"""
+        options = self.options.get(row_index)
+        return pre_clean(" ".join(options))[0] if options else ""
+
+
+def cluster_rows(rows: List[Dict]) -> List[VariantCluster]:
+    """
+    ExcelHandler.load_excel 결과 행을 옵션 변형 묶음으로 나눕니다. (첫 등장 순서 유지)
+
+    Args:
+        rows: [{'row_index': 2, 'product_name': '...', ...}, ...]
+
+    Returns:
+        묶음 리스트 (빈 상품명이나 기본 상품명이 너무 짧은 행은 1행짜리 묶음)
+    """
+    clusters: Dict[str, VariantCluster] = {}
+    for row in rows:
+        name = row.get('product_name', '')
+        base_name, options = split_variant(name)
+        if len(base_name) < MIN_BASE_LENGTH or not name.strip():
+            key = f"row:{row['row_index']}"
+        else:
+            key = normalize_key(base_name)
+        cluster = clusters.get(key)
+        if cluster is None:
+            cluster = clusters[key] = VariantCluster(base_name)
+        cluster.rows.append(row)
+        cluster.options[row['row_index']] = options
+    return list(clusters.values())
+
+
+def expand_cluster_results(clusters: List[VariantCluster], results: List[Dict]) -> List[Dict]:
+    """
+    대표 행 처리 결과를 묶음의 모든 행에 펼칩니다.
+    대표 행은 결과 그대로 쓰고, 다른 행의 정제된 상품명은 "대표 정제 결과에서 끝의 옵션을 뺀 이름 + 행별 옵션"으로 만듭니다.
+    키워드/카테고리는 대표 결과를 그대로 사용합니다.
+
+    Args:
+        clusters: cluster_rows 결과
+        results: 대표 행 처리 결과 (row_index로 대표 행과 매핑)
+    """
+    by_row = {item['row_index']: item for item in results}
+    expanded = []
+    for cluster in clusters:
+        result = by_row.get(cluster.rows[0]['row_index'])
+        if result is None:
+            continue
+        if len(cluster.rows) == 1:
+            expanded.append(result)
+            continue
+        expanded.append(result)
+        refined_base = split_variant(result['refined_name'])[0] if 'refined_name' in result else None
+        for row in cluster.rows[1:]:
+            item = dict(result, row_index=row['row_index'])
+            if refined_base is not None:
+                option_text = cluster.option_text(row['row_index'])
+                item['refined_name'] = f"{refined_base} {option_text}".strip()
+            expanded.append(item)
+    return expanded
@@ -1,66 +1,328 @@
+import json
 import os
 import re
+import threading
 from dotenv import load_dotenv
-from typing import Optional
-from src.llm_provider import BaseLLMProvider, get_llm_provider
+from typing import Dict, List, Optional, Tuple
+from src.llm_provider import TASK_REFINE, BaseLLMProvider, get_llm_provider
+from src.product_name_rules import pre_clean
+from src.result_cache import ResultCache, get_result_cache, hash_key, normalize_key
 
 load_dotenv()
 
+# 상품명 정제 결과 스키마
+REFINE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "minLength": 2},
+    },
+    "required": ["name"],
+    "additionalProperties": False,
+}
+
+# 정제 + 검색용 변형 상품명 동시 생성 결과 스키마 (fused 모드, 키워드 시드 수집에 변형을 재사용)
+REFINE_FUSED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "minLength": 2},
+        "variations": {"type": "array", "items": {"type": "string"}, "maxItems": 3},
+    },
+    "required": ["name", "variations"],
+    "additionalProperties": False,
+}
+
+# 여러 상품명 일괄 정제 결과 스키마 (입력 순번 index로 결과를 다시 매핑)
+# 항목별 검증은 refine_many에서 따로 하여, 일부 항목 오류로 전체 응답을 버리지 않도록 함
+REFINE_MANY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    "name": {"type": "string"},
+                },
+                "required": ["index", "name"],
+            },
+        },
+    },
+    "required": ["items"],
+}
+
+# refine_many 1회 요청에 담는 상품명 수
+REFINE_BATCH_SIZE = 30
+
+# 정제 결과 캐시 (키: 모델 + 정규화한 상품명, 범위: 프롬프트)
+REFINE_CACHE_NAMESPACE = "refined_name"
+REFINE_CACHE_TTL = int(os.getenv("REFINE_CACHE_TTL", str(30 * 24 * 3600)))
+# 정제 프롬프트 문구(build_refine_prompt 등)를 바꾸면 올려서 기존 캐시를 무효화
+REFINE_PROMPT_VERSION = "1"
+
+
+def refine_cache_scope(prompt_template: Optional[str] = None) -> str:
+    """정제 결과 캐시 범위를 반환합니다. (사용자 프롬프트가 바뀌면 다른 범위)"""
+    return hash_key(REFINE_PROMPT_VERSION, prompt_template or "")
+
+
+def get_refine_cache() -> ResultCache:
+    """작업/프롬프트 API가 공유하는 정제 결과 캐시를 반환합니다."""
+    return get_result_cache(REFINE_CACHE_NAMESPACE, REFINE_CACHE_TTL)
+
+
+class RefineStats:
+    """상품명 정제 경로별 처리 건수 (스레드 안전, 작업 단위로 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rule_only = 0     # 규칙 정제만으로 끝나 LLM 호출을 생략한 건수
+        self.llm = 0           # LLM 정제가 필요했던 건수
+        self.cache_hits = 0    # LLM 정제 대상 중 캐시에서 찾은 건수
+        self.cache_misses = 0  # LLM 정제 대상 중 캐시에 없던 건수
+
+    def record(self, needs_llm: bool):
+        with self._lock:
+            if needs_llm:
+                self.llm += 1
+            else:
+                self.rule_only += 1
+
+    def record_cache(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def snapshot(self) -> Dict:
+        """meta_data["stats"]["product_name"]에 기록할 딕셔너리를 반환합니다."""
+        with self._lock:
+            total = self.rule_only + self.llm
+            return {
+                "total": total,
+                "rule_only": self.rule_only,
+                "llm": self.llm,
+                "skip_rate": round(self.rule_only / total, 3) if total else 0.0,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+            }
+
+
 class ProductNameProcessor:
-    def __init__(self, llm_provider: Optional[BaseLLMProvider] = None):
+    def __init__(self, llm_provider: Optional[BaseLLMProvider] = None, stats: Optional[RefineStats] = None,
+                 cache: Optional[ResultCache] = None):
         """
         ProductNameProcessor를 초기화합니다.
         
         Args:
             llm_provider: LLM 제공자 인스턴스 (None이면 기본 Gemini 사용)
+            stats: 정제 경로 집계기 (None이면 새로 생성, 작업 내 여러 청크가 공유 가능)
+            cache: 정제 결과 캐시 (None이면 캐시 사용 안 함, 작업에서는 get_refine_cache())
         """
         if llm_provider is None:
             # 기본값: Gemini 사용
             self.llm_provider = get_llm_provider("gemini")
         else:
             self.llm_provider = llm_provider
+        self.stats = stats or RefineStats()
+        self.cache = cache
 
     def refine_product_name(self, original_name: str, prompt_template: str = None) -> str:
         """
-        LLM을 사용하여 상품명을 정제합니다.
+        상품명을 정제합니다. 규칙 정제만으로 충분하면 LLM을 호출하지 않습니다.
         - 브랜드 제거
         - 수량/단위 표준화 (10p -> 10개, 1p -> 제거)
         - 검색 최적화
         """
+        cleaned_name, needs_llm = self.rule_refine(original_name)
+        if not needs_llm:
+            return cleaned_name
+        return self.refine_with_llm(cleaned_name or original_name, prompt_template)
+
+    def rule_refine(self, original_name: str) -> Tuple[str, bool]:
+        """
+        규칙 기반 사전 정제를 수행하고 정제 경로를 집계합니다.
+
+        Returns:
+            (규칙으로 정제된 상품명, LLM 정제 필요 여부)
+        """
+        cleaned_name, needs_llm = pre_clean(original_name)
+        self.stats.record(needs_llm)
+        return cleaned_name, needs_llm
+
+    def refine_with_llm(self, name: str, prompt_template: str = None, lookup_cache: bool = True) -> str:
+        """
+        LLM을 사용하여 상품명을 정제합니다. (실패하면 입력한 상품명 그대로 반환)
+
+        Args:
+            lookup_cache: False면 캐시 조회를 생략 (이미 조회해 미스가 난 경우), 성공 결과는 항상 저장
+        """
+        if lookup_cache:
+            cached_name = self.get_cached(name, prompt_template)
+            if cached_name is not None:
+                return cached_name
+
         if not self.llm_provider.is_configured():
-            return original_name + " (API키 없음)"
+            return name + " (API키 없음)"
+
+        prompt = self.build_refine_prompt(name, prompt_template)
 
         try:
+            # 구조화(JSON) 응답을 사용하여 자유 텍스트 파싱/프롬프트 반복을 제거
+            # 스키마 검증 실패 시에만 Provider가 수리 요청을 1회 보냅니다.
+            result = self.llm_provider.for_task(TASK_REFINE).generate_structured(prompt, REFINE_SCHEMA)
+            refined_name = self.parse_refined_name(result, name)
 
-            # 기본 프롬프트 템플릿 (System Default)
-            # Retry Logic for gpt-5-nano instability
-            prompts = [
-                f"Refine product name: '{original_name}'. Remove brands/special chars. Output only the name.",
-                f"Clean this product name: '{original_name}'. Return string only.",
-                f"Fix: '{original_name}'"
-            ]
-            
-            cleaned_name = original_name # Default fallback
-            
-            for attempt, p_text in enumerate(prompts):
-                try:
-                    result = self.llm_provider.generate_content(p_text)
-                    if result and len(result) > 1:
-                        # Basic cleanup
-                        result = result.replace('"', '').replace("'", "").strip()
-                        # If result is JSON by mistake, try to parse
-                        if result.startswith("{") and "}" in result:
-                            # Try skip
-                            continue
-                        
-                        cleaned_name = result
-                        break
-                except Exception as e:
-                    print(f"   ⚠️ Product Name LLM Error (Attempt {attempt+1}): {e}")
-                    continue
-            
-            return cleaned_name
+        except Exception as e:
+            print(f"상품명 가공 중 오류 발생: {e}")
+            return name
+
+        self.put_cached(name, refined_name, prompt_template)
+        return refined_name
+
+    def refine_with_variations(self, original_name: str, prompt_template: str = None) -> Tuple[str, Optional[List[str]]]:
+        """
+        상품명을 정제하면서 키워드 검색용 변형 상품명도 한 번의 LLM 요청으로 만듭니다. (fused 모드)
+
+        Returns:
+            (정제된 상품명, 변형 상품명 리스트) - 규칙 정제/캐시로 끝나 LLM을 호출하지 않았거나
+            요청이 실패하면 변형은 None (KeywordProcessor가 따로 생성)
+        """
+        cleaned_name, needs_llm = self.rule_refine(original_name)
+        if not needs_llm:
+            return cleaned_name, None
+        name = cleaned_name or original_name
+
+        cached_name = self.get_cached(name, prompt_template)
+        if cached_name is not None:
+            return cached_name, None
+        if not self.llm_provider.is_configured():
+            return name + " (API키 없음)", None
 
+        prompt = (
+            f"Refine product name: '{name}'. Remove brands/special chars. "
+            f"Put only the refined product name in the \"name\" field. "
+            f"In \"variations\", put 2-3 other Korean search phrases a shopper might type for the same product "
+            f"(synonyms, short forms, different viewpoints, no brand names)."
+        )
+        try:
+            result = self.llm_provider.for_task(TASK_REFINE).generate_structured(prompt, REFINE_FUSED_SCHEMA)
         except Exception as e:
             print(f"상품명 가공 중 오류 발생: {e}")
-            return original_name
+            return name, None
+
+        refined_name = self.parse_refined_name(result, name)
+        self.put_cached(name, refined_name, prompt_template)
+        variations = [v.strip() for v in result["variations"] if v.strip()][:3]
+        print(f"   [LLM] 상품명 정제 + 변형 생성: {refined_name} / {variations}")
+        return refined_name, variations
+
+    def get_cached(self, name: str, prompt_template: str = None) -> Optional[str]:
+        """
+        캐시된 정제 결과를 반환하고 적중 여부를 집계합니다. (캐시 미사용/미스 시 None)
+
+        Args:
+            name: 규칙 정제된 상품명 (LLM에 보내는 입력)
+        """
+        if self.cache is None:
+            return None
+        cached_name = self.cache.get(refine_cache_scope(prompt_template), self._cache_key(name))
+        self.stats.record_cache(cached_name is not None)
+        return cached_name
+
+    def put_cached(self, name: str, refined_name: str, prompt_template: str = None):
+        """LLM 정제 결과를 캐시에 저장합니다."""
+        if self.cache is not None:
+            self.cache.set(refine_cache_scope(prompt_template), self._cache_key(name), refined_name)
+
+    def _cache_key(self, name: str) -> str:
+        """캐시 키: 정제에 쓰는 모델 + 정규화한 상품명 (모델이 바뀌면 다시 정제)"""
+        provider = self.llm_provider.for_task(TASK_REFINE)
+        return f"{provider.provider_name}:{provider.model_name}|{normalize_key(name)}"
+
+    def refine_many(self, names: List[str], prompt_template: str = None, batch_size: int = REFINE_BATCH_SIZE) -> List[str]:
+        """
+        여러 상품명을 정제합니다. LLM이 필요하고 캐시에 없는 상품명은 batch_size개씩 묶어
+        한 번의 요청(번호가 붙은 JSON 배열)으로 보내고, 결과가 없거나 잘못된 항목만 개별 재요청합니다.
+
+        Args:
+            names: 원본 상품명 리스트
+            prompt_template: (옵션) 사용자 커스텀 프롬프트
+            batch_size: 요청 1회에 담을 상품명 수 (20~50 권장)
+
+        Returns:
+            names와 같은 순서의 정제된 상품명 리스트
+        """
+        refined: List[Optional[str]] = [None] * len(names)
+        pending = []  # (원래 위치, 규칙 정제된 상품명)
+        for i, name in enumerate(names):
+            cleaned_name, needs_llm = self.rule_refine(name)
+            if not needs_llm:
+                refined[i] = cleaned_name
+                continue
+            cached_name = self.get_cached(cleaned_name or name, prompt_template)
+            if cached_name is not None:
+                refined[i] = cached_name
+            else:
+                pending.append((i, cleaned_name or name))
+
+        for start in range(0, len(pending), batch_size):
+            group = pending[start:start + batch_size]
+            results = self._refine_group([name for _, name in group], prompt_template)
+            retried = 0
+            for k, (i, name) in enumerate(group):
+                if k in results:
+                    refined[i] = results[k]
+                    self.put_cached(name, results[k], prompt_template)
+                else:
+                    refined[i] = self.refine_with_llm(name, prompt_template, lookup_cache=False)
+                    retried += 1
+            print(f"   [LLM] 상품명 일괄 정제 {len(group)}건 (개별 재요청 {retried}건)")
+
+        return refined
+
+    def _refine_group(self, names: List[str], prompt_template: str = None) -> Dict[int, str]:
+        """
+        상품명 묶음을 한 번에 정제합니다.
+
+        Returns:
+            {묶음 내 순번: 정제된 상품명} (검증을 통과한 항목만 포함, 호출 실패 시 빈 딕셔너리)
+        """
+        if len(names) < 2 or not self.llm_provider.is_configured():
+            return {}
+
+        indexed = json.dumps([{"index": k, "name": name} for k, name in enumerate(names)], ensure_ascii=False)
+        prompt = (
+            f"Refine each product name below. Remove brands/special chars.\n"
+            f"Return one item per input with the same \"index\" and only the refined product name in \"name\".\n"
+            f"Names: {indexed}"
+        )
+
+        try:
+            response = self.llm_provider.for_task(TASK_REFINE, len(names)).generate_structured(prompt, REFINE_MANY_SCHEMA)
+        except Exception as e:
+            print(f"상품명 일괄 가공 중 오류 발생: {e}")
+            return {}
+
+        results = {}
+        for item in response["items"]:
+            k = item["index"]
+            if not 0 <= k < len(names) or k in results:
+                continue
+            cleaned_name = item["name"].replace('"', '').replace("'", "").strip()
+            if len(cleaned_name) > 1:
+                results[k] = cleaned_name
+        return results
+
+    def build_refine_prompt(self, original_name: str, prompt_template: str = None) -> str:
+        """상품명 정제 프롬프트를 만듭니다. (REFINE_SCHEMA 구조화 응답용, 배치 모드에서도 사용)"""
+        return (
+            f"Refine product name: '{original_name}'. Remove brands/special chars. "
+            f"Put only the refined product name in the \"name\" field."
+        )
+
+    def parse_refined_name(self, result: dict, original_name: str) -> str:
+        """REFINE_SCHEMA 응답에서 정제된 상품명을 꺼냅니다. (너무 짧으면 원본 유지)"""
+        cleaned_name = result["name"].replace('"', '').replace("'", "").strip()
+        return cleaned_name if len(cleaned_name) > 1 else original_name
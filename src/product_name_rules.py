@@ -0,0 +1,103 @@
+"""
+상품명 규칙 기반 사전 정제
+- 괄호/특수문자 제거, 수량 표기 정리 (1p → 제거, 10p → 10개), 판촉 문구 제거
+- 상표 블랙리스트와 정확히 일치하는 단어 제거
+- 규칙만으로 정제가 끝났는지(LLM 정제가 더 필요한지) 판단
+"""
+
+import re
+from typing import List, Tuple
+
+from src.trademark_blacklist import TRADEMARK_BLACKLIST, contains_trademark
+
+# 이 길이/단어 수를 넘는 상품명은 LLM으로 요약 정제
+MAX_CLEAN_LENGTH = 40
+MAX_CLEAN_WORDS = 8
+
+# 상품명에서 통째로 제거하는 판촉/배송 문구
+PROMO_WORDS = {
+    "무료배송", "무배", "당일발송", "당일배송", "국내발송", "빠른배송", "오늘출발", "로켓배송",
+    "특가", "초특가", "최저가", "할인", "세일", "sale", "이벤트", "행사", "사은품", "증정",
+    "1+1", "2+1", "정품", "신상", "신상품", "인기", "추천", "best", "hot", "new",
+}
+
+# 영문이지만 단위 표기라서 브랜드/모델명 의심 대상에서 제외하는 단어
+UNIT_WORDS = {
+    "ml", "l", "cm", "mm", "m", "kg", "g", "mg", "oz", "inch", "w", "v", "mah",
+    "xs", "s", "xl", "xxl", "xxxl", "led", "usb", "cc",
+}
+
+_BRACKET_PATTERN = re.compile(r"\[[^\]]*\]|【[^】]*】|<[^>]*>|\{[^}]*\}")
+_PAREN_PATTERN = re.compile(r"\(([^)]*)\)")
+_ONE_PIECE_PATTERN = re.compile(r"(?<![\d.])1\s*(?:p|pcs|ea|개입|매입)(?![a-z])", re.IGNORECASE)
+_PIECES_PATTERN = re.compile(r"(?<![\d.])(\d+)\s*(?:p|pcs|ea)(?![a-z])", re.IGNORECASE)
+_SPECIAL_CHARS_PATTERN = re.compile(r"[^\w\s가-힣.+\-/%]")
+_MEASURE_PATTERN = re.compile(r"^[\d.,x×*/~\-]+[a-z가-힣]{0,4}$", re.IGNORECASE)
+_LATIN_PATTERN = re.compile(r"[a-z]{2,}", re.IGNORECASE)
+
+# 여러 단어로 된 브랜드 (예: "new balance")는 구문 단위로 제거
+_MULTI_WORD_BRANDS = sorted((b.lower() for b in TRADEMARK_BLACKLIST if " " in b), key=len, reverse=True)
+_SINGLE_WORD_BRANDS = {b.lower() for b in TRADEMARK_BLACKLIST if " " not in b}
+
+
+def _strip_parentheses(match: "re.Match") -> str:
+    """괄호 안이 규격(500ml, 30x40cm 등)이면 괄호만 벗기고, 그 외(옵션/판촉 문구)는 제거"""
+    inner = match.group(1).strip()
+    return f" {inner} " if _MEASURE_PATTERN.match(inner.replace(" ", "")) else " "
+
+
+def _needs_llm(words: List[str], brand_removed: bool) -> bool:
+    """규칙 정제 결과에 LLM 판단이 필요한 요소가 남아 있는지 확인합니다."""
+    if not words:
+        return True
+    # 브랜드를 빼고 한 단어만 남으면 상품 종류 설명이 부족할 수 있음 (예: "갤럭시 케이스" → "케이스")
+    if brand_removed and len(words) < 2:
+        return True
+    name = " ".join(words)
+    if len(name) > MAX_CLEAN_LENGTH or len(words) > MAX_CLEAN_WORDS:
+        return True
+    # 블랙리스트와 정확히 일치하지 않는 브랜드 포함 단어 (예: "삼성갤럭시케이스")
+    if contains_trademark(name):
+        return True
+    # 단위가 아닌 영문 단어는 미등록 브랜드/모델명일 수 있음
+    for word in words:
+        latin = _LATIN_PATTERN.findall(word)
+        if latin and not (_MEASURE_PATTERN.match(word) or all(t.lower() in UNIT_WORDS for t in latin)):
+            return True
+    return False
+
+
+def pre_clean(name: str) -> Tuple[str, bool]:
+    """
+    상품명을 규칙으로 정제하고 LLM 정제가 더 필요한지 판단합니다.
+
+    Args:
+        name: 원본 상품명
+
+    Returns:
+        (정제된 상품명, LLM 정제 필요 여부)
+    """
+    cleaned = _BRACKET_PATTERN.sub(" ", name)
+    cleaned = _PAREN_PATTERN.sub(_strip_parentheses, cleaned)
+    cleaned = _ONE_PIECE_PATTERN.sub(" ", cleaned)
+    cleaned = _PIECES_PATTERN.sub(r"\1개", cleaned)
+    cleaned = _SPECIAL_CHARS_PATTERN.sub(" ", cleaned)
+
+    brand_removed = False
+    lowered = f" {cleaned.lower()} "
+    for brand in _MULTI_WORD_BRANDS:
+        if f" {brand} " in lowered:
+            cleaned = re.sub(rf"(?i)(^|\s){re.escape(brand)}(?=\s|$)", " ", cleaned)
+            brand_removed = True
+
+    words = []
+    for word in cleaned.split():
+        lowered_word = word.lower()
+        if lowered_word in _SINGLE_WORD_BRANDS:
+            brand_removed = True
+            continue
+        if lowered_word in PROMO_WORDS or word in words:
+            continue
+        words.append(word)
+
+    return " ".join(words), _needs_llm(words, brand_removed)
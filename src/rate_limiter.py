@@ -0,0 +1,65 @@
+"""
+토큰 버킷 속도 제한
+- 초당 rate개까지 요청을 허용하고 최대 burst개까지 몰아서 허용
+- 여러 스레드가 같은 외부 API(네이버 검색 등)를 동시에 호출할 때 초당 호출 한도를 넘지 않도록 대기
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: 초당 허용 요청 수
+            burst: 한 번에 허용하는 최대 요청 수 (None이면 rate를 올림한 값)
+            clock: 시각 함수 (테스트에서 교체 가능)
+            sleep: 대기 함수 (테스트에서 교체 가능)
+        """
+        self.rate = rate
+        self.capacity = float(burst if burst is not None else max(1, int(rate + 0.999)))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """토큰 1개를 예약하고 사용 가능해질 때까지 기다려야 하는 시간(초)을 반환합니다."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """요청 1건을 보낼 수 있을 때까지 대기합니다."""
+        delay = self._reserve()
+        if delay > 0:
+            self.sleep(delay)
+
+
+_lock = threading.Lock()
+_buckets: Dict[Hashable, TokenBucket] = {}
+
+
+def get_rate_limiter(key: Hashable, rate: float, burst: Optional[int] = None) -> TokenBucket:
+    """
+    키(API/자격 증명)별로 프로세스 공용 토큰 버킷을 반환합니다. (없으면 생성)
+
+    Args:
+        key: 제한 단위 (예: ("naver_search", 클라이언트 ID 해시))
+        rate: 초당 허용 요청 수
+        burst: 최대 연속 허용 수
+    """
+    with _lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate, burst)
+        return bucket
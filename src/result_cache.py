@@ -0,0 +1,229 @@
+"""
+영속 결과 캐시
+- LLM/외부 API 결과를 (네임스페이스, 범위(scope), 키) 단위로 TTL과 함께 보관
+- REDIS_URL이 설정되어 있으면 워커와 API 서버가 함께 쓰는 Redis, 없으면 로컬 SQLite 파일 사용
+- 범위(scope) 단위 무효화 지원 (예: 프롬프트가 바뀌면 그 프롬프트로 만든 결과 전체 폐기)
+- 캐시 장애로 작업이 멈추지 않도록 오류는 경고만 출력하고 캐시 미스로 처리
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# 기본 보관 기간(초)
+DEFAULT_TTL = 30 * 24 * 3600
+
+# SQLite 캐시에서 만료 항목을 정리하는 저장 횟수 간격 (파일을 열 때도 한 번 정리)
+PURGE_EVERY_WRITES = int(os.getenv("RESULT_CACHE_PURGE_EVERY", "1000"))
+# Redis 범위 세대 번호를 프로세스 안에서 재사용하는 시간(초)
+# (조회/저장마다 세대 GET을 보내지 않음, 다른 프로세스의 무효화는 최대 이 시간 뒤에 반영)
+GENERATION_CACHE_TTL = float(os.getenv("RESULT_CACHE_GENERATION_TTL", "5"))
+
+# Redis를 쓰지 않을 때 사용하는 SQLite 파일 경로
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join("cache", "result_cache.sqlite3"))
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_key(text: str) -> str:
+    """대소문자/전각 문자/공백 차이를 없앤 캐시 키를 만듭니다."""
+    return _WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFKC", text or "")).strip().lower()
+
+
+def hash_key(*parts: str) -> str:
+    """여러 값을 묶어 고정 길이 해시로 만듭니다. (프롬프트 등 긴 값을 범위/키로 사용할 때)"""
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+class SQLiteCacheBackend:
+    """로컬 SQLite 파일 캐시 (단일 서버/개발 환경용)"""
+
+    def __init__(self, path: str = RESULT_CACHE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT, scope TEXT, key TEXT, value TEXT, expires_at REAL,"
+            " PRIMARY KEY (namespace, scope, key))"
+        )
+        self._writes = 0
+        self.purge_expired()
+
+    def get(self, namespace: str, scope: str, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE namespace = ? AND scope = ? AND key = ?",
+                (namespace, scope, key),
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, namespace: str, scope: str, key: str, value: str, ttl: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (namespace, scope, key, value, time.time() + ttl),
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY_WRITES == 0:
+                self._purge_locked()
+
+    def invalidate(self, namespace: str, scope: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE namespace = ? AND scope = ?", (namespace, scope))
+
+    def purge_expired(self):
+        """만료된 항목을 삭제합니다."""
+        with self._lock:
+            self._purge_locked()
+
+    def _purge_locked(self):
+        self._conn.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+
+
+class RedisCacheBackend:
+    """
+    Redis 캐시 (워커/API 서버 공용).
+    범위 무효화는 범위별 세대(generation) 번호를 올리는 방식으로 처리하고,
+    이전 세대 항목은 TTL로 자연 만료됩니다.
+    세대 번호는 GENERATION_CACHE_TTL 동안 프로세스 안에서 재사용합니다.
+    """
+
+    def __init__(self, client, prefix: str = "result_cache", generation_ttl: float = GENERATION_CACHE_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.client = client
+        self.prefix = prefix
+        self.generation_ttl = generation_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (namespace, scope) → (세대 번호, 읽은 시각)
+        self._generations: Dict[Tuple[str, str], Tuple[int, float]] = {}
+
+    def _generation_key(self, namespace: str, scope: str) -> str:
+        return f"{self.prefix}:{namespace}:gen:{scope}"
+
+    def _generation(self, namespace: str, scope: str) -> int:
+        now = self._clock()
+        with self._lock:
+            cached = self._generations.get((namespace, scope))
+        if cached is not None and now - cached[1] < self.generation_ttl:
+            return cached[0]
+        generation = int(self.client.get(self._generation_key(namespace, scope)) or 0)
+        with self._lock:
+            self._generations[(namespace, scope)] = (generation, now)
+        return generation
+
+    def _entry_key(self, namespace: str, scope: str, key: str) -> str:
+        generation = self._generation(namespace, scope)
+        return f"{self.prefix}:{namespace}:{scope}:{generation}:{hash_key(key)}"
+
+    def get(self, namespace: str, scope: str, key: str) -> Optional[str]:
+        value = self.client.get(self._entry_key(namespace, scope, key))
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, namespace: str, scope: str, key: str, value: str, ttl: float):
+        self.client.set(self._entry_key(namespace, scope, key), value, ex=max(1, int(ttl)))
+
+    def invalidate(self, namespace: str, scope: str):
+        generation = int(self.client.incr(self._generation_key(namespace, scope)))
+        # 이 프로세스에는 바로 반영
+        with self._lock:
+            self._generations[(namespace, scope)] = (generation, self._clock())
+
+
+class ResultCache:
+    """네임스페이스 하나의 결과 캐시 (값은 JSON으로 직렬화)"""
+
+    def __init__(self, namespace: str, backend=None, ttl: float = DEFAULT_TTL):
+        """
+        Args:
+            namespace: 캐시 구분 이름 (예: "refined_name")
+            backend: SQLiteCacheBackend/RedisCacheBackend (None이면 캐시 사용 안 함)
+            ttl: 기본 보관 기간(초)
+        """
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self, scope: str, key: str) -> Optional[Any]:
+        """캐시된 값을 반환합니다. (없거나 만료/오류 시 None)"""
+        if self.backend is None:
+            return None
+        try:
+            raw = self.backend.get(self.namespace, scope, key)
+            return json.loads(raw) if raw is not None else None
+        except Exception as e:
+            print(f"[WARNING] 결과 캐시 조회 실패 ({self.namespace}): {e}")
+            return None
+
+    def set(self, scope: str, key: str, value: Any, ttl: Optional[float] = None):
+        """값을 저장합니다. (ttl이 None이면 기본 보관 기간)"""
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(self.namespace, scope, key, json.dumps(value, ensure_ascii=False),
+                             self.ttl if ttl is None else ttl)
+        except Exception as e:
+            print(f"[WARNING] 결과 캐시 저장 실패 ({self.namespace}): {e}")
+
+    def invalidate(self, scope: str):
+        """범위에 속한 모든 항목을 무효화합니다."""
+        if self.backend is None:
+            return
+        try:
+            self.backend.invalidate(self.namespace, scope)
+        except Exception as e:
+            print(f"[WARNING] 결과 캐시 무효화 실패 ({self.namespace}): {e}")
+
+
+_lock = threading.Lock()
+_backend = None
+_backend_ready = False
+
+
+def _create_backend():
+    """
+    RESULT_CACHE_BACKEND 환경변수("redis", "sqlite", "none")에 따라 백엔드를 만듭니다.
+    지정하지 않으면 REDIS_URL이 있을 때 Redis, 없으면 SQLite를 사용합니다.
+    """
+    kind = os.getenv("RESULT_CACHE_BACKEND", "").lower() or ("redis" if os.getenv("REDIS_URL") else "sqlite")
+    if kind == "none":
+        return None
+    if kind == "redis":
+        try:
+            import redis
+            return RedisCacheBackend(redis.Redis.from_url(os.environ["REDIS_URL"], socket_timeout=2))
+        except Exception as e:
+            print(f"[WARNING] Redis 결과 캐시를 사용할 수 없어 SQLite로 대체합니다: {e}")
+    try:
+        return SQLiteCacheBackend(RESULT_CACHE_PATH)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARNING] 결과 캐시 파일을 열 수 없어 캐시 없이 처리합니다 ({RESULT_CACHE_PATH}): {e}")
+        return None
+
+
+def get_result_cache(namespace: str, ttl: float = DEFAULT_TTL) -> ResultCache:
+    """
+    프로세스 공용 백엔드를 사용하는 결과 캐시를 반환합니다.
+
+    Args:
+        namespace: 캐시 구분 이름
+        ttl: 기본 보관 기간(초)
+    """
+    global _backend, _backend_ready
+    with _lock:
+        if not _backend_ready:
+            _backend = _create_backend()
+            _backend_ready = True
+    return ResultCache(namespace, _backend, ttl)
@@ -0,0 +1,198 @@
+"""
+네이버 쇼핑 검색 공용 조회
+- 정제된 상품명당 한 번만 검색해서 상위 결과(상품명, 카테고리)를 보관
+- 카테고리 매칭(상위 결과 카테고리 다수결)과 키워드 시드 수집(상품명에서 자주 나오는 단어)이 같은 결과를 사용
+- 자격 증명별 keep-alive 세션/속도 제한, 결과 캐시(결과 없음은 짧게 보관), 같은 검색어 동시 요청 합치기
+"""
+
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set
+
+from src.client_pool import get_http_session
+from src.rate_limiter import get_rate_limiter
+from src.result_cache import ResultCache, hash_key, normalize_key
+from src.single_flight import SingleFlight
+
+SHOPPING_SEARCH_URL = "https://openapi.naver.com/v1/search/shop.json"
+# 한 번에 가져오는 검색 결과 수 (카테고리 다수결/상품명 시드에 사용)
+SHOPPING_SEARCH_DISPLAY = int(os.getenv("NAVER_SHOPPING_DISPLAY", "10"))
+
+# 네이버 검색 API 초당 호출 한도 (자격 증명별, 프로세스 내 모든 스레드 합산)
+NAVER_SEARCH_RATE = float(os.getenv("NAVER_SEARCH_RATE", "8"))
+# 네이버 검색 API 타임아웃 (연결, 응답 대기 초)
+NAVER_SEARCH_TIMEOUT = (
+    float(os.getenv("NAVER_SEARCH_CONNECT_TIMEOUT", "3")),
+    float(os.getenv("NAVER_SEARCH_READ_TIMEOUT", "5")),
+)
+
+# 검색 결과 캐시 보관 기간 (검색 결과는 며칠 단위로 안정적, 결과 없음은 상품 등록 후 검색될 수 있어 짧게)
+SHOPPING_SEARCH_CACHE_TTL = int(os.getenv("NAVER_CATEGORY_CACHE_TTL", str(7 * 24 * 3600)))
+SHOPPING_SEARCH_NEGATIVE_TTL = int(os.getenv("NAVER_CATEGORY_NEGATIVE_TTL", str(24 * 3600)))
+
+# 상품명 시드: 검색 결과 중 최소 몇 개 상품명에 나와야 하는지, 최대 몇 개를 쓸지
+TITLE_SEED_MIN_TITLES = 2
+TITLE_SEED_LIMIT = 10
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_TITLE_SPLIT_PATTERN = re.compile(r"[\s\[\](){}<>【】/_,|:·+&]+")
+
+
+def _parse_items(items: List[Dict]) -> List[Dict]:
+    """API 응답 items를 [{"title": 태그 제거한 상품명, "category": "대>중>소>세"}]로 줄입니다."""
+    parsed = []
+    for item in items:
+        categories = [item.get(f"category{i}") for i in range(1, 5)]
+        parsed.append({
+            "title": _TAG_PATTERN.sub("", item.get("title") or "").strip(),
+            "category": ">".join([c for c in categories if c]),
+        })
+    return parsed
+
+
+def vote_category(items: List[Dict]) -> str:
+    """
+    상위 결과 카테고리 중 가장 많이 나온 경로를 반환합니다. (동수면 순위가 높은 결과 우선, 없으면 "")
+    """
+    counts = Counter(item["category"] for item in items if item.get("category"))
+    if not counts:
+        return ""
+    first_rank = {}
+    for rank, item in enumerate(items):
+        first_rank.setdefault(item.get("category"), rank)
+    return max(counts, key=lambda path: (counts[path], -first_rank[path]))
+
+
+def title_keywords(items: List[Dict], limit: int = TITLE_SEED_LIMIT) -> List[str]:
+    """
+    검색 결과 상품명에서 여러 상품이 함께 쓰는 단어/두 단어 묶음을 시드 키워드로 뽑습니다.
+
+    Returns:
+        등장한 상품명 수가 많은 순서의 키워드 (숫자만 있거나 한 글자인 단어 제외)
+    """
+    counts = Counter()
+    for item in items:
+        words = [
+            word for word in _TITLE_SPLIT_PATTERN.split(item.get("title") or "")
+            if len(word) > 1 and not word.isdigit()
+        ]
+        # 같은 상품명 안의 중복은 한 번만 세고, 동수는 먼저 나온 순서 유지
+        counts.update(dict.fromkeys(words + [f"{a} {b}" for a, b in zip(words, words[1:])], 1))
+    return [term for term, count in counts.most_common() if count >= TITLE_SEED_MIN_TITLES][:limit]
+
+
+class ShoppingSearch:
+    """
+    네이버 쇼핑 검색 결과 공용 조회기 (작업 단위로 CategoryProcessor와 KeywordProcessor가 공유)
+    """
+
+    def __init__(self, client_id: Optional[str], client_secret: Optional[str],
+                 cache: Optional[ResultCache] = None, stats=None, display: int = SHOPPING_SEARCH_DISPLAY):
+        """
+        Args:
+            client_id: 네이버 검색 API Client ID
+            client_secret: 네이버 검색 API Client Secret
+            cache: 검색 결과 캐시 (None이면 작업 안에서만 재사용)
+            stats: api_calls/cache_hits/negative_hits를 기록할 집계기 (CategoryStats 등, None이면 기록 안 함)
+            display: 가져올 검색 결과 수
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.cache = cache
+        self.stats = stats
+        self.display = display
+        self._scope = f"shop_items:{display}"
+        self._results: Dict[str, List[Dict]] = {}
+        # 키워드 시드(count_hits=False)가 API로 먼저 가져온 검색어: 이후 카테고리 조회는 캐시 적중으로 세지 않음
+        # (첫 API 호출이 미스이므로 api_calls만 기록)
+        self._fetched_uncounted: Set[str] = set()
+        self._inflight = SingleFlight()
+
+    def _record(self, field: str):
+        if self.stats is not None:
+            self.stats.record(field)
+
+    def _record_hit(self, key: str, items: List[Dict]):
+        try:
+            self._fetched_uncounted.remove(key)
+        except KeyError:
+            self._record("cache_hits" if items else "negative_hits")
+
+    def search(self, query: str, count_hits: bool = True) -> Optional[List[Dict]]:
+        """
+        상위 검색 결과를 반환합니다. (작업 내 재사용 → 캐시 → API 순, 같은 검색어 동시 요청은 한 번만 호출)
+
+        Args:
+            count_hits: API 호출을 생략했을 때 cache_hits/negative_hits에 기록할지 (키워드 시드 재사용은 기록 안 함)
+
+        Returns:
+            [{"title", "category"}, ...] (결과가 없으면 [], 키가 없거나 호출 실패 시 None)
+        """
+        key = normalize_key(query)
+        if not key:
+            return None
+        items = self._results.get(key)
+        if items is not None:
+            if count_hits:
+                self._record_hit(key, items)
+            return items
+        return self._inflight.do(key, lambda: self._search_uncached(query, key, count_hits))
+
+    def _search_uncached(self, query: str, key: str, count_hits: bool) -> Optional[List[Dict]]:
+        items = self._results.get(key)
+        if items is not None:
+            if count_hits:
+                self._record_hit(key, items)
+            return items
+        if self.cache is not None:
+            cached = self.cache.get(self._scope, key)
+            if cached is not None:
+                if count_hits:
+                    self._record_hit(key, cached)
+                self._results[key] = cached
+                return cached
+
+        items = self._request(query)
+        if items is None:
+            # 키 없음/오류는 캐시하지 않음
+            return None
+        if not count_hits:
+            self._fetched_uncounted.add(key)
+        self._results[key] = items
+        if self.cache is not None:
+            ttl = SHOPPING_SEARCH_CACHE_TTL if items else SHOPPING_SEARCH_NEGATIVE_TTL
+            self.cache.set(self._scope, key, items, ttl=ttl)
+        return items
+
+    def _request(self, query: str) -> Optional[List[Dict]]:
+        """네이버 검색 API (쇼핑) 호출"""
+        if not self.client_id or not self.client_secret:
+            return None
+        headers = {
+            "X-Naver-Client-Id": self.client_id,
+            "X-Naver-Client-Secret": self.client_secret,
+        }
+
+        try:
+            # 자격 증명별로 호출 한도와 keep-alive 세션을 따로 사용 (테넌트끼리 서로의 한도를 소모하지 않음)
+            # (풀/한도 키로는 클라이언트 ID 대신 해시만 사용)
+            get_rate_limiter(("naver_search", hash_key(self.client_id)), NAVER_SEARCH_RATE).acquire()
+            self._record("api_calls")
+            session = get_http_session("naver_search", self.client_id)
+            res = session.get(SHOPPING_SEARCH_URL, headers=headers,
+                              params={"query": query, "display": self.display}, timeout=NAVER_SEARCH_TIMEOUT)
+            if res.status_code == 200:
+                return _parse_items(res.json().get("items") or [])
+            return None
+        except Exception:
+            return None
+
+    def category_path(self, query: str) -> Optional[str]:
+        """상위 결과 카테고리 다수결 경로 (결과 없음 "", 검색 불가 None)"""
+        items = self.search(query)
+        return vote_category(items) if items is not None else None
+
+    def seed_keywords(self, query: str) -> List[str]:
+        """검색 결과 상품명에서 뽑은 시드 키워드 (검색 불가/결과 없음이면 빈 리스트)"""
+        return title_keywords(self.search(query, count_hits=False) or [])
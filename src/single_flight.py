@@ -0,0 +1,67 @@
+"""
+Single-flight 요청 병합
+동일한 키의 요청이 동시에 여러 스레드에서 들어오면 한 번만 실행하고
+나머지 스레드는 그 결과(또는 예외)를 함께 받습니다.
+(결과를 보관하지 않으므로 캐시와 달리 실행이 끝나면 다음 요청은 새로 실행됩니다.)
+"""
+
+import threading
+from typing import Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """진행 중인 단일 호출"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키 단위로 동시 실행을 하나로 합치는 그룹"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0  # 다른 호출의 결과를 공유받은 횟수
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        key에 대해 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 func를 실행합니다.
+
+        Args:
+            key: 요청을 구분하는 키 (예: 프롬프트 문자열)
+            func: 실제 요청을 수행하는 함수
+
+        Returns:
+            func의 반환값 (병합된 경우 선행 호출의 반환값)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
@@ -3,7 +3,7 @@
 - Supabase에서 사용자 설정을 조회하고 캐시
 - API 키 복호화 기능 제공
 """
-from typing import Optional, Dict
+from typing import Iterable, Optional, Dict
 import os
 from cryptography.fernet import Fernet
 import base64
@@ -18,32 +18,42 @@ def get_encryption_key():
 cipher = Fernet(get_encryption_key())
 
 def decrypt_api_key(encrypted_key: str) -> str:
-    """암호화된 API 키를 복호화합니다."""
+    """
+    암호화된 API 키를 복호화합니다.
+    키 값은 일부라도 로그에 남기지 않습니다. (길이/실패 여부만 출력)
+    """
     if not encrypted_key:
         return ""
     try:
         decrypted = cipher.decrypt(encrypted_key.encode()).decode()
-        
-        # 복호화 결과 검증
-        print(f"[DEBUG] 복호화 성공: 원본 길이={len(encrypted_key)}, 복호화 후 길이={len(decrypted)}")
-        print(f"[DEBUG] 복호화된 키 앞부분: {decrypted[:10] if len(decrypted) >= 10 else decrypted}...")
-        
-        # ASCII 검증
-        try:
-            decrypted.encode('ascii')
-            print(f"[DEBUG] ASCII 검증 통과")
-        except UnicodeEncodeError as e:
-            print(f"[WARNING] 복호화된 API 키에 비-ASCII 문자 포함: {e}")
-            print(f"[DEBUG] 원본 repr: {repr(decrypted)}")
-            # 비-ASCII 문자 제거
-            decrypted = ''.join(char for char in decrypted if ord(char) < 128).strip()
-            print(f"[INFO] 비-ASCII 문자 제거 후: {decrypted[:10]}...")
-        
-        return decrypted
     except Exception as e:
-        print(f"[ERROR] API 키 복호화 실패: {e}")
+        print(f"[ERROR] API 키 복호화 실패: {type(e).__name__}")
         return ""
 
+    # ASCII 검증 (붙여넣기 중 섞인 비-ASCII 문자 제거)
+    try:
+        decrypted.encode('ascii')
+    except UnicodeEncodeError:
+        print("[WARNING] 복호화된 API 키에 비-ASCII 문자가 포함되어 제거합니다.")
+        decrypted = ''.join(char for char in decrypted if ord(char) < 128).strip()
+    return decrypted
+
+def decrypt_api_keys(api_keys: Optional[Dict[str, str]], key_names: Iterable[str]) -> Dict[str, str]:
+    """
+    user_settings.api_keys(암호화 저장) 중 작업에서 사용하는 키만 복호화해 반환합니다.
+    복호화에 실패한 키는 제외하므로 각 처리기는 환경변수로 폴백합니다.
+
+    Args:
+        api_keys: 암호화된 키 딕셔너리
+        key_names: 복호화할 키 이름 (예: ["naver_client_id", "naver_client_secret"])
+    """
+    decrypted = {}
+    for key_name in key_names:
+        value = decrypt_api_key((api_keys or {}).get(key_name))
+        if value:
+            decrypted[key_name] = value
+    return decrypted
+
 def get_user_setting(supabase, user_id: str, setting_key: str) -> Optional[any]:
     """
     사용자 설정에서 특정 키의 값을 가져옵니다.
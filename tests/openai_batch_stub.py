@@ -0,0 +1,184 @@
+"""
+OpenAI Batch API 로컬 대역(stand-in) 서버
+- /v1/files, /v1/batches 엔드포인트를 흉내 내고 각 요청을 FakeLLMProvider로 응답
+- 테스트에서 OpenAIBatchBackend를 실제 OpenAI SDK로 검증하거나,
+  OPENAI_BASE_URL을 이 서버로 지정해 economy 모드를 오프라인으로 실행할 때 사용
+
+실행: python tests/openai_batch_stub.py [port]
+"""
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_llm_provider import FakeLLMProvider
+from src.llm_metrics import estimate_tokens
+
+
+class BatchStubServer:
+    """Batch API 대역 서버 (스레드에서 실행)"""
+
+    def __init__(self, port: int = 0, polls_until_complete: int = 2, fail_ids=()):
+        """
+        Args:
+            port: 바인딩 포트 (0이면 임의 포트)
+            polls_until_complete: 배치가 completed 상태가 되기까지의 조회 횟수
+            fail_ids: 오류 응답을 돌려줄 custom_id 목록
+        """
+        self.polls_until_complete = polls_until_complete
+        self.fail_ids = set(fail_ids)
+        self.files = {}
+        self.batches = {}
+        self.provider = FakeLLMProvider(latency_median=0, latency_sigma=0, seed=0)
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "BatchStubServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------
+    # 상태 처리
+    # ------------------------------------------------------------
+
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}-{next(self._ids)}"
+
+    def _create_file(self, content: bytes, purpose: str = "batch_output") -> dict:
+        with self._lock:
+            file_id = self._new_id("file")
+            self.files[file_id] = content
+        return {"id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+                "filename": f"{file_id}.jsonl", "purpose": purpose, "status": "processed"}
+
+    def _respond(self, request: dict) -> dict:
+        body = request["body"]
+        prompt = body["messages"][0]["content"]
+        custom_id = request["custom_id"]
+        if custom_id in self.fail_ids:
+            return {"id": self._new_id("req"), "custom_id": custom_id, "response": None,
+                    "error": {"code": "server_error", "message": "stub failure"}}
+
+        response_format = body.get("response_format")
+        if response_format:
+            schema = response_format["json_schema"]["schema"]
+            text = json.dumps(self.provider.generate_structured(prompt, schema), ensure_ascii=False)
+        else:
+            text = self.provider.generate_content(prompt)
+        completion = {
+            "id": self._new_id("chatcmpl"),
+            "object": "chat.completion",
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(text)},
+        }
+        return {"id": self._new_id("req"), "custom_id": custom_id,
+                "response": {"status_code": 200, "body": completion}, "error": None}
+
+    def _complete(self, batch: dict):
+        lines = self.files[batch["input_file_id"]].decode("utf-8").splitlines()
+        outputs = [self._respond(json.loads(line)) for line in lines if line.strip()]
+        output = "\n".join(json.dumps(o, ensure_ascii=False) for o in outputs).encode("utf-8")
+        failed = sum(1 for o in outputs if o["error"])
+        batch.update(
+            status="completed",
+            output_file_id=self._create_file(output)["id"],
+            request_counts={"total": len(outputs), "completed": len(outputs) - failed, "failed": failed},
+        )
+
+    def _retrieve(self, batch_id: str) -> dict:
+        with self._lock:
+            batch = self.batches[batch_id]
+            if batch["status"] not in ("completed", "cancelled"):
+                batch["_polls"] += 1
+                if batch["_polls"] >= self.polls_until_complete:
+                    self._complete(batch)
+                else:
+                    batch["status"] = "in_progress"
+            return {k: v for k, v in batch.items() if not k.startswith("_")}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, payload, raw: bool = False):
+                data = payload if raw else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream" if raw else "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_POST(self):
+                path = self.path.split("?")[0]
+                if path == "/v1/files":
+                    message = BytesParser(policy=default_policy).parsebytes(
+                        f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode("utf-8") + self._body()
+                    )
+                    fields = {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                              for part in message.iter_parts()}
+                    purpose = fields.get("purpose", b"batch").decode("utf-8")
+                    return self._send(200, server._create_file(fields["file"], purpose))
+                if path == "/v1/batches":
+                    request = json.loads(self._body())
+                    with server._lock:
+                        batch = {
+                            "id": server._new_id("batch"), "object": "batch", "status": "validating",
+                            "endpoint": request["endpoint"], "input_file_id": request["input_file_id"],
+                            "completion_window": request["completion_window"], "created_at": int(time.time()),
+                            "output_file_id": None, "error_file_id": None, "_polls": 0,
+                        }
+                        server.batches[batch["id"]] = batch
+                    return self._send(200, {k: v for k, v in batch.items() if not k.startswith("_")})
+                if path.startswith("/v1/batches/") and path.endswith("/cancel"):
+                    batch_id = path.split("/")[3]
+                    with server._lock:
+                        server.batches[batch_id]["status"] = "cancelled"
+                    return self._send(200, server._retrieve(batch_id))
+                self._send(404, {"error": {"message": f"unknown path {path}"}})
+
+            def do_GET(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if parts[:2] == ["v1", "batches"] and len(parts) == 3:
+                    return self._send(200, server._retrieve(parts[2]))
+                if parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[3] == "content":
+                    return self._send(200, server.files[parts[2]], raw=True)
+                self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+
+        return Handler
+
+
+if __name__ == "__main__":
+    stub = BatchStubServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"OpenAI Batch stub listening on {stub.url} (OPENAI_BASE_URL={stub.url})")
+    stub.httpd.serve_forever()
@@ -0,0 +1,111 @@
+"""
+네이버 쇼핑 검색 카테고리 캐시/일괄 조회 검증 (HTTP 세션 대체, 네트워크 호출 없음)
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("dotenv")
+
+from src import category_processor, shopping_search
+from src.category_processor import CategoryProcessor
+from src.shopping_search import ShoppingSearch
+from src.result_cache import ResultCache, SQLiteCacheBackend
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, items):
+        self._items = items
+
+    def json(self):
+        return {"items": self._items}
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+        self.headers = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.calls.append(params["query"])
+        self.headers.append(headers)
+        if params["query"] == "없는 상품":
+            return FakeResponse([])
+        return FakeResponse([{"category1": "생활/건강", "category2": "주방용품", "category3": "냄비", "category4": ""}])
+
+
+def _fake_session(monkeypatch):
+    monkeypatch.setenv("NAVER_CLIENT_ID", "id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "secret")
+    session = FakeSession()
+    monkeypatch.setattr(shopping_search, "get_http_session", lambda name, credential="": session)
+    return session
+
+
+def test_search_results_are_cached(tmp_path, monkeypatch):
+    calls = _fake_session(monkeypatch).calls
+    cache = ResultCache("naver_category", SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")))
+    processor = CategoryProcessor(mapping_file_path=str(tmp_path / "missing.xls"), cache=cache)
+
+    assert processor._search_naver_category("스텐 냄비") == "생활/건강>주방용품>냄비"
+    assert processor._search_naver_category("스텐  냄비") == "생활/건강>주방용품>냄비"  # 정규화된 같은 검색어
+    assert processor._search_naver_category("없는 상품") == ""
+    assert processor._search_naver_category("없는 상품") == ""
+
+    assert calls == ["스텐 냄비", "없는 상품"]
+    assert processor.stats.snapshot() == {"api_calls": 2, "cache_hits": 1, "negative_hits": 1, "local_hits": 0}
+    print("✅ 검색 결과/결과 없음 캐시")
+
+
+def test_get_category_codes_dedups_and_keeps_order(tmp_path, monkeypatch):
+    session = _fake_session(monkeypatch)
+    processor = CategoryProcessor(mapping_file_path=str(tmp_path / "missing.xls"))
+
+    codes = processor.get_category_codes(["스텐 냄비", "없는 상품", "", "스텐 냄비"], concurrency=3)
+
+    assert codes == ["확인필요(생활/건강>주방용품>냄비)", "매핑실패(검색불가)", "", "확인필요(생활/건강>주방용품>냄비)"]
+    assert sorted(session.calls) == ["스텐 냄비", "없는 상품"]
+    print("✅ 중복 제거 후 동시 조회, 입력 순서 유지")
+
+
+def test_tenant_credentials_use_own_session(tmp_path, monkeypatch):
+    monkeypatch.setenv("NAVER_CLIENT_ID", "env-id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "env-secret")
+    sessions = {}
+
+    def get_session(name, credential=""):
+        return sessions.setdefault((name, credential), FakeSession())
+
+    monkeypatch.setattr(shopping_search, "get_http_session", get_session)
+    tenant = CategoryProcessor(mapping_file_path=str(tmp_path / "missing.xls"),
+                               api_keys={"naver_client_id": "tenant-id", "naver_client_secret": "tenant-secret"})
+    default = CategoryProcessor(mapping_file_path=str(tmp_path / "missing.xls"))
+
+    tenant._search_naver_category("스텐 냄비")
+    default._search_naver_category("스텐 냄비")
+
+    assert set(sessions) == {("naver_search", "tenant-id"), ("naver_search", "env-id")}
+    assert sessions[("naver_search", "tenant-id")].headers == [
+        {"X-Naver-Client-Id": "tenant-id", "X-Naver-Client-Secret": "tenant-secret"}]
+    assert sessions[("naver_search", "env-id")].headers[0]["X-Naver-Client-Id"] == "env-id"
+    print("✅ 사용자 자격 증명별 세션 사용")
+
+
+class LowConfidenceClassifier:
+    def predict(self, product_name):
+        return "50000010", 0.3
+
+
+def test_low_confidence_prediction_not_used_without_search(tmp_path, monkeypatch):
+    monkeypatch.setattr(category_processor, "get_category_classifier",
+                        lambda *args, **kwargs: LowConfidenceClassifier())
+    processor = CategoryProcessor(mapping_file_path=str(tmp_path / "missing.xls"), use_classifier=True,
+                                  shopping_search=ShoppingSearch(None, None))
+
+    assert processor.get_category_code("스텐 냄비") == "매핑실패(검색불가)"
+    print("✅ 검색 불가 시 낮은 신뢰도 예측을 그대로 쓰지 않음")
@@ -0,0 +1,64 @@
+"""
+로컬 카테고리 분류기 검증 (네트워크 호출 없음)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import category_classifier
+from src.category_classifier import CategoryClassifier, CategoryExampleStore, get_category_classifier
+
+MAPPING = {
+    "생활/건강>주방용품>냄비>편수냄비": "50000010",
+    "생활/건강>주방용품>프라이팬": "50000011",
+    "패션의류>남성의류>후드티": "50000020",
+    "패션의류>여성의류>원피스": "50000021",
+    "가구/인테리어>수납가구>선반": "50000030",
+}
+
+
+def test_predicts_from_category_paths():
+    classifier = CategoryClassifier(MAPPING.items())
+
+    code, confidence = classifier.predict("스텐 편수냄비 18cm")
+    assert code == "50000010" and confidence > 0
+    assert classifier.predict("남성 기모 후드티")[0] == "50000020"
+    assert classifier.predict("!!!") == (None, 0.0)
+    print("✅ 카테고리 경로 기반 예측")
+
+
+def test_learned_examples_raise_confidence(tmp_path):
+    store = CategoryExampleStore(str(tmp_path / "examples.sqlite3"))
+    classifier = CategoryClassifier(MAPPING.items(), store)
+    before = classifier.predict("원룸 벽걸이 수납 랙")
+
+    classifier.add_example("원룸 벽걸이 수납 랙", "50000030")
+    # 저장된 예시로 새 프로세스에서 만든 분류기
+    reloaded = CategoryClassifier(MAPPING.items(), CategoryExampleStore(str(tmp_path / "examples.sqlite3")))
+    code, confidence = reloaded.predict("원룸 벽걸이 수납 랙")
+
+    assert code == "50000030"
+    assert confidence > before[1] and confidence >= 0.6
+    print("✅ 확정 결과 학습 후 높은 신뢰도로 예측")
+
+
+def test_shared_classifier_rebuilt_on_mapping_swap(tmp_path, monkeypatch):
+    monkeypatch.setattr(category_classifier, "_classifiers", {})
+    monkeypatch.setattr(category_classifier, "CategoryExampleStore",
+                        lambda: CategoryExampleStore(str(tmp_path / "examples.sqlite3")))
+    loads = []
+
+    def categories():
+        loads.append(1)
+        return iter(MAPPING.items())
+
+    first = get_category_classifier("mapping.xls", categories, generation=0)
+    assert get_category_classifier("mapping.xls", categories, generation=0) is first
+    assert len(loads) == 1
+
+    # 매핑 파일 교체(세대 변경) → 새 목록으로 다시 만들고 예시 저장소는 유지
+    rebuilt = get_category_classifier("mapping.xls", categories, generation=1)
+    assert rebuilt is not first and rebuilt.store is first.store
+    assert len(loads) == 2
+    print("✅ 매핑 파일 교체 시 분류기 재생성")
@@ -0,0 +1,171 @@
+"""
+카테고리 매핑 컴파일 파일 검증 (엑셀 파싱 없이 주입한 매핑 사용)
+"""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import category_mapping
+from src.category_mapping import (CategoryIndex, SharedCategoryIndex, artifact_path, compile_mapping, load_mapping,
+                                  prepare_mapping)
+
+MAPPING = {"생활/건강>주방용품>냄비": "50000001", "패션의류>남성의류>티셔츠": "50000002"}
+
+
+def _source(tmp_path, content=b"mapping-v1"):
+    path = tmp_path / "naver_category_mapping.xls"
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_fresh_artifact_skips_parsing(tmp_path, monkeypatch):
+    source = _source(tmp_path)
+    assert compile_mapping(source, MAPPING) == artifact_path(source)
+
+    def fail(path):
+        raise AssertionError("엑셀을 다시 파싱하면 안 됨")
+    monkeypatch.setattr(category_mapping, "parse_mapping_file", fail)
+    assert load_mapping(source) == MAPPING
+
+    # 내용이 같으면 mtime만 바뀌어도 그대로 사용 (해시 확인)
+    later = time.time() + 60
+    os.utime(source, (later, later))
+    assert load_mapping(source) == MAPPING
+    print("✅ 최신 컴파일 파일은 엑셀 파싱 없이 로드")
+
+
+def test_changed_source_recompiles(tmp_path, monkeypatch):
+    source = _source(tmp_path)
+    compile_mapping(source, MAPPING)
+
+    _source(tmp_path, b"mapping-v2-changed")
+    updated = dict(MAPPING, **{"가구/인테리어>수납가구>선반": "50000003"})
+    monkeypatch.setattr(category_mapping, "parse_mapping_file", lambda path: updated)
+
+    assert load_mapping(source) == updated
+    # 다시 컴파일되어 다음 로드부터는 파싱하지 않음
+    monkeypatch.setattr(category_mapping, "parse_mapping_file", None)
+    assert load_mapping(source) == updated
+    print("✅ 원본이 바뀌면 다시 컴파일")
+
+
+def test_unwritable_artifact_falls_back_to_parsed_mapping(tmp_path, monkeypatch):
+    source = _source(tmp_path)
+    parses = []
+
+    def parse(path):
+        parses.append(path)
+        return MAPPING
+    monkeypatch.setattr(category_mapping, "parse_mapping_file", parse)
+    # 쓸 수 없는 위치 → sqlite3.OperationalError
+    monkeypatch.setattr(category_mapping, "artifact_path",
+                        lambda path: str(tmp_path / "missing-dir" / "mapping.sqlite3"))
+
+    assert load_mapping(source) == MAPPING
+    assert prepare_mapping(source) == (None, MAPPING)
+    assert len(parses) == 2  # 호출마다 한 번만 파싱
+    print("✅ 컴파일 파일을 저장할 수 없으면 파싱한 매핑 사용")
+
+
+def test_failed_compile_removes_temp_file(tmp_path, monkeypatch):
+    source = _source(tmp_path)
+
+    def fail_replace(src, dst):
+        raise OSError("read-only")
+    monkeypatch.setattr(category_mapping.os, "replace", fail_replace)
+
+    with pytest.raises(OSError):
+        compile_mapping(source, MAPPING)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    print("✅ 컴파일 실패 시 임시 파일 삭제")
+
+
+def test_processor_parses_once_when_artifact_unwritable(tmp_path, monkeypatch):
+    pytest.importorskip("dotenv")
+    from src.category_processor import CategoryProcessor
+
+    source = _source(tmp_path)
+    parses = []
+
+    def parse(path):
+        parses.append(path)
+        return INDEX_MAPPING
+    monkeypatch.setattr(category_mapping, "parse_mapping_file", parse)
+    monkeypatch.setattr(category_mapping, "artifact_path",
+                        lambda path: str(tmp_path / "missing-dir" / "mapping.sqlite3"))
+    monkeypatch.setattr(CategoryProcessor, "_mapping_cache", {})
+
+    index = CategoryProcessor(mapping_file_path=source).category_index
+    assert isinstance(index, CategoryIndex) and len(index) == len(INDEX_MAPPING)
+    CategoryProcessor(mapping_file_path=source).category_index
+    assert len(parses) == 1
+    print("✅ 컴파일 실패 시에도 엑셀은 한 번만 파싱하고 메모리 색인 사용")
+
+
+INDEX_MAPPING = {
+    "생활/건강>주방용품>냄비": "50000001",
+    "생활/건강>주방용품>냄비>편수냄비": "50000010",
+    "스포츠/레저>캠핑>취사용품>편수냄비": "50000020",
+    "스포츠/레저>캠핑>취사용품>코펠": "50000030",
+    "생활/건강>주방용품": "50000100",
+    "패션의류>남성의류>티셔츠": "50000002",
+}
+
+
+def _check_resolution(index):
+    assert index.resolve("생활/건강>주방용품>냄비>편수냄비") == "50000010"
+    # 중간 분류 이름만 다르면 같은 대분류의 동명 말단 카테고리 (매핑 순서와 무관)
+    assert index.resolve("스포츠/레저>캠핑용품>편수냄비") == "50000020"
+    # 말단 이름이 없으면 경로상 가장 깊은 상위 카테고리
+    assert index.resolve("생활/건강>주방용품>냄비>양수냄비") == "50000001"
+    assert index.resolve("생활/건강>주방용품>프라이팬") == "50000100"
+    # 대분류부터 다른 동명 카테고리보다 같은 대분류의 상위 카테고리 우선
+    assert index.resolve("생활/건강>주방용품>코펠") == "50000100"
+    assert index.resolve("스포츠/레저>등산>코펠") == "50000030"
+    assert index.resolve("가구/인테리어>수납가구>선반") is None
+
+
+def test_index_resolves_leaf_then_deepest_ancestor():
+    _check_resolution(CategoryIndex(INDEX_MAPPING))
+    print("✅ 색인 기반 카테고리 조회")
+
+
+def test_leaf_ties_follow_mapping_order(tmp_path):
+    # 코드 문자열 순서("100000" < "50000010")가 아니라 매핑 파일에서 먼저 나온 카테고리
+    mapping = {"가구/인테리어>수납가구>선반": "50000010", "가구/인테리어>주방가구>선반": "100000"}
+    shared = SharedCategoryIndex(compile_mapping(_source(tmp_path), mapping))
+    for index in (CategoryIndex(mapping), shared):
+        assert index.resolve("가구/인테리어>거실가구>선반") == "50000010"
+    reordered = dict(reversed(list(mapping.items())))
+    assert CategoryIndex(reordered).resolve("가구/인테리어>거실가구>선반") == "100000"
+    print("✅ 동수인 말단 후보는 매핑 순서로 선택")
+
+def test_lookup_requires_storage_methods():
+    class PartialIndex(category_mapping._CategoryLookup):
+        def exact(self, path):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialIndex()
+    print("✅ 조회 메서드를 모두 구현하지 않은 색인은 생성 불가")
+
+
+def test_shared_index_matches_memory_index_and_follows_swap(tmp_path, monkeypatch):
+    source = _source(tmp_path)
+    index = SharedCategoryIndex(compile_mapping(source, INDEX_MAPPING))
+    _check_resolution(index)
+    assert len(index) == len(INDEX_MAPPING)
+    assert dict(index.items()) == INDEX_MAPPING and index.generation == 0
+
+    # 원본 갱신 → 새 파일로 원자적 교체 → 공유 색인이 교체를 감지
+    monkeypatch.setattr("src.category_mapping.SWAP_CHECK_INTERVAL", 0)
+    _source(tmp_path, b"mapping-v2-changed")
+    compile_mapping(source, dict(INDEX_MAPPING, **{"가구/인테리어>수납가구>선반": "50000040"}))
+    assert index.resolve("가구/인테리어>수납가구>선반") == "50000040"
+    assert index.generation == 1
+    assert dict(index.items())["가구/인테리어>수납가구>선반"] == "50000040"
+    print("✅ 읽기 전용 공유 색인 조회 및 파일 교체 반영")
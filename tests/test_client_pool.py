@@ -0,0 +1,97 @@
+"""
+클라이언트 풀 보조 함수 검증 (SDK 대체 객체 사용, 네트워크 호출 없음)
+"""
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import client_pool
+
+
+class FakeModel:
+    def __init__(self):
+        self._client = None
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_attach_gemini_client_sets_private_client():
+    client = object()
+    model = client_pool.attach_gemini_client(FakeModel(), client, "key")
+    assert model._client is client
+    print("✅ GenerativeModel에 키별 클라이언트 주입")
+
+
+def test_attach_gemini_client_falls_back_to_configure(monkeypatch):
+    configured = []
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda api_key: configured.append(api_key)
+    google = types.ModuleType("google")
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+
+    client_pool.attach_gemini_client(object(), object(), "key")
+    assert configured == ["key"]
+    print("✅ _client 속성이 없는 SDK는 genai.configure()로 대체")
+
+
+def test_unpooled_client_is_closed_and_not_pooled(monkeypatch):
+    created = []
+
+    def create(api_key):
+        created.append(FakeClient())
+        return created[-1]
+
+    monkeypatch.setattr(client_pool, "_create_openai_client", create)
+    monkeypatch.setattr(client_pool, "_openai_clients", {})
+
+    with client_pool.unpooled_client("openai", "typed-key") as client:
+        assert not client.closed
+    assert client.closed and client_pool._openai_clients == {}
+    print("✅ 연결 테스트용 클라이언트는 풀에 넣지 않고 종료")
+
+
+class FakeGeminiClient:
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.transport = FakeClient()
+
+
+def test_gemini_providers_get_per_key_clients(monkeypatch):
+    pytest.importorskip("google.generativeai")
+    from src.llm_provider import GeminiProvider
+
+    monkeypatch.setattr(client_pool, "_create_gemini_client", FakeGeminiClient)
+    monkeypatch.setattr(client_pool, "_gemini_clients", {})
+
+    first, again, other = GeminiProvider(api_key="key-a"), GeminiProvider(api_key="key-a"), GeminiProvider(api_key="key-b")
+
+    assert first.model._client.api_key == "key-a" and other.model._client.api_key == "key-b"
+    assert first.model._client is again.model._client  # 같은 키는 풀의 클라이언트 재사용
+    assert first.model._client is not other.model._client
+    assert len(client_pool._gemini_clients) == 2
+    print("✅ API 키별로 분리된 Gemini 클라이언트 주입")
+
+
+def test_gemini_connection_test_client_not_pooled(monkeypatch):
+    monkeypatch.setattr(client_pool, "_create_gemini_client", FakeGeminiClient)
+    monkeypatch.setattr(client_pool, "_gemini_clients", {})
+    pooled = client_pool.get_gemini_client("key-a")
+
+    with client_pool.unpooled_client("gemini", "key-a") as client:
+        model = client_pool.attach_gemini_client(FakeModel(), client, "key-a")
+        assert model._client is client and client is not pooled
+    assert client.transport.closed and not pooled.transport.closed
+    assert client_pool._gemini_clients == {client_pool._key_id("key-a"): pooled}
+    print("✅ 연결 테스트용 Gemini 클라이언트는 풀에 넣지 않고 종료")
@@ -0,0 +1,108 @@
+"""
+쿠팡 카테고리 추천 클라이언트 재시도/지표 검증 (HTTP 세션 대체, 네트워크 호출 없음)
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import coupang_category_processor
+from src.coupang_category_processor import CoupangCategoryProcessor
+from src.llm_retry import RetryPolicy
+
+SUCCESS = {"code": 200, "data": {"autoCategorizationPredictionResultType": "SUCCESS", "predictedCategoryId": "63950"}}
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.text = ""
+        self.headers = {}
+        self._payload = payload
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise FakeHTTPError(self)
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.authorizations = []
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.authorizations.append(headers["Authorization"])
+        return self.responses.pop(0)
+
+
+def make_processor(monkeypatch, responses):
+    session = FakeSession(responses)
+    monkeypatch.setattr(coupang_category_processor, "get_http_session", lambda name, credential="": session)
+    policy = RetryPolicy(max_attempts=3, sleep=lambda delay: None, rng=random.Random(0))
+    processor = CoupangCategoryProcessor("access", "secret", retry_policy=policy)
+    signatures = iter(range(100))
+    monkeypatch.setattr(processor, "_generate_signature", lambda method, path, query="": f"sig-{next(signatures)}")
+    return processor, session
+
+
+def test_retries_transient_errors_with_fresh_signature(monkeypatch):
+    processor, session = make_processor(monkeypatch, [FakeResponse(429), FakeResponse(503), FakeResponse(200, SUCCESS)])
+
+    assert processor.get_category_code("스텐 냄비") == "63950"
+    assert session.authorizations == ["sig-0", "sig-1", "sig-2"]
+    snapshot = processor.stats.snapshot()
+    assert (snapshot["api_calls"], snapshot["retries"], snapshot["errors"]) == (3, 2, 0)
+    print("✅ 429/5xx 재시도 (시도마다 서명 재생성)")
+
+
+def test_exhausted_retries_report_api_error(monkeypatch):
+    processor, session = make_processor(monkeypatch, [FakeResponse(503)] * 3)
+
+    assert processor.get_category_code("스텐 냄비") == "API오류"
+    snapshot = processor.stats.snapshot()
+    assert (snapshot["api_calls"], snapshot["retries"], snapshot["errors"]) == (3, 2, 1)
+    print("✅ 재시도 소진 시 API오류")
+
+
+def test_results_cached_by_request_body(tmp_path, monkeypatch):
+    from src.result_cache import ResultCache, SQLiteCacheBackend
+
+    failure = {"code": 200, "message": "no match", "data": {"autoCategorizationPredictionResultType": "FAILURE"}}
+    processor, session = make_processor(monkeypatch, [FakeResponse(200, SUCCESS), FakeResponse(200, failure)] + [FakeResponse(503)] * 3)
+    processor.cache = ResultCache("coupang_category", SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")))
+
+    assert processor.get_category_code("스텐 냄비") == "63950"
+    assert processor.get_category_code("스텐 냄비") == "63950"
+    assert processor.get_category_code("없는 상품") == "매칭실패(no match)"
+    assert processor.get_category_code("없는 상품") == "매칭실패(no match)"
+    assert processor.get_category_code("스텐 냄비", brand="다른브랜드") == "API오류"  # 본문이 다르면 다시 조회
+
+    assert len(session.authorizations) == 5  # 성공 1 + 매칭실패 1 + 503 재시도 3
+    snapshot = processor.stats.snapshot()
+    assert (snapshot["cache_hits"], snapshot["negative_hits"], snapshot["cache_misses"]) == (1, 1, 3)
+    print("✅ 요청 본문 기준 캐시, 매칭실패 캐시, 오류는 캐시 안 함")
+
+
+def test_gateway_error_body_not_cached(tmp_path, monkeypatch):
+    from src.result_cache import ResultCache, SQLiteCacheBackend
+
+    throttled = {"code": 429, "message": "throttled"}
+    processor, session = make_processor(monkeypatch, [FakeResponse(200, throttled), FakeResponse(200, SUCCESS)])
+    processor.cache = ResultCache("coupang_category", SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")))
+
+    assert processor.get_category_code("스텐 냄비") == "매칭실패(throttled)"
+    # 일시적 오류 응답은 캐시하지 않으므로 다음 조회는 API를 다시 호출
+    assert processor.get_category_code("스텐 냄비") == "63950"
+    assert len(session.authorizations) == 2
+    assert processor.stats.snapshot()["negative_hits"] == 0
+    print("✅ 응답 본문 code가 200이 아닌 실패는 캐시 안 함")
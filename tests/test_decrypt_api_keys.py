@@ -0,0 +1,45 @@
+"""
+사용자 API 키 복호화 검증 (키 값이 로그에 남지 않고, 작업에서 쓰는 키만 복호화)
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("cryptography")
+
+from src import user_settings_utils
+from src.user_settings_utils import cipher, decrypt_api_keys
+
+SECRETS = {
+    "naver_client_id": "client-id-1234567890",
+    "naver_client_secret": "client-secret-abcdefghij",
+    "openai_api_key": "sk-proj-0123456789abcdef",
+}
+
+
+def _encrypted():
+    return {name: cipher.encrypt(value.encode()).decode() for name, value in SECRETS.items()}
+
+
+def test_decrypts_only_requested_keys_without_logging_values(capsys, monkeypatch):
+    calls = []
+    decrypt = user_settings_utils.decrypt_api_key
+    monkeypatch.setattr(user_settings_utils, "decrypt_api_key", lambda value: calls.append(value) or decrypt(value))
+
+    keys = decrypt_api_keys(_encrypted(), ["naver_client_id", "naver_client_secret", "coupang_access_key"])
+
+    assert keys == {name: SECRETS[name] for name in ("naver_client_id", "naver_client_secret")}
+    assert len([value for value in calls if value]) == 2  # openai 키는 복호화하지 않음
+    output = capsys.readouterr().out
+    assert not any(value[:6] in output for value in SECRETS.values())
+    print("✅ 사용하는 키만 조용히 복호화")
+
+
+def test_non_ascii_stripped_without_logging_value(capsys):
+    encrypted = cipher.encrypt("sk-test한글".encode()).decode()
+    assert user_settings_utils.decrypt_api_key(encrypted) == "sk-test"
+    assert "sk-test" not in capsys.readouterr().out
+    print("✅ 비-ASCII 문자 제거 시 키 값 미출력")
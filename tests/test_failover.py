@@ -0,0 +1,135 @@
+"""
+FailoverLLMProvider 헤지/Failover/회로 차단 검증 (가짜 제공자, 네트워크 호출 없음)
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.llm_provider import BaseLLMProvider, CircuitBreaker, FailoverLLMProvider, LLMError
+
+
+class StubProvider(BaseLLMProvider):
+    """호출마다 behavior(prompt)를 실행하는 제공자"""
+
+    def __init__(self, name, behavior):
+        self.provider_name = name
+        self.model_name = name
+        self.behavior = behavior
+        self.calls = 0
+
+    def generate_content(self, prompt: str) -> str:
+        self.calls += 1
+        return self.behavior(prompt)
+
+    def is_configured(self) -> bool:
+        return True
+
+
+def fail(prompt):
+    raise ConnectionError("down")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_failover_on_error():
+    primary = StubProvider("primary", fail)
+    secondary = StubProvider("secondary", lambda prompt: "from secondary")
+    failover = FailoverLLMProvider([primary, secondary])
+
+    assert failover.generate_content("hi") == "from secondary"
+    assert (primary.calls, secondary.calls) == (1, 1)
+    print("✅ 1순위 실패 시 다음 제공자로 전환")
+
+
+def test_hedge_fired_after_delay():
+    release = threading.Event()
+
+    def slow(prompt):
+        release.wait(5)
+        return "from primary"
+
+    primary = StubProvider("primary", slow)
+    secondary = StubProvider("secondary", lambda prompt: "from secondary")
+    failover = FailoverLLMProvider([primary, secondary], default_hedge_delay=0.05, min_hedge_delay=0.0)
+    try:
+        assert failover.generate_content("hi") == "from secondary"
+        assert secondary.calls == 1
+    finally:
+        release.set()
+    print("✅ 지연 임계값 초과 시 헤지 요청")
+
+
+def test_no_hedge_when_primary_answers_in_time():
+    primary = StubProvider("primary", lambda prompt: "from primary")
+    secondary = StubProvider("secondary", lambda prompt: "from secondary")
+    failover = FailoverLLMProvider([primary, secondary], default_hedge_delay=5.0)
+
+    assert failover.generate_content("hi") == "from primary"
+    assert secondary.calls == 0
+    print("✅ 제때 응답하면 헤지 없음")
+
+
+def test_breaker_opens_after_threshold():
+    clock = FakeClock()
+    primary = StubProvider("primary", fail)
+    secondary = StubProvider("secondary", lambda prompt: "ok")
+    failover = FailoverLLMProvider([primary, secondary], failure_threshold=2, reset_timeout=60.0, clock=clock)
+
+    for _ in range(3):
+        assert failover.generate_content("hi") == "ok"
+    assert primary.calls == 2  # 두 번 실패 후 차단되어 세 번째는 호출하지 않음
+
+    secondary.behavior = fail
+    with pytest.raises(LLMError):
+        failover.generate_content("hi")
+    print("✅ 연속 실패 임계값 후 회로 차단")
+
+
+def test_half_open_recovery():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now += 31
+    assert breaker.allow()       # 시험 호출 1회 허용
+    assert not breaker.allow()   # 시험 호출 중에는 차단
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+    primary = StubProvider("primary", fail)
+    failover = FailoverLLMProvider([primary], failure_threshold=1, reset_timeout=30.0, clock=clock)
+    with pytest.raises(LLMError):
+        failover.generate_content("hi")
+    clock.now += 31
+    primary.behavior = lambda prompt: "recovered"
+    assert failover.generate_content("hi") == "recovered"
+    assert failover.generate_content("hi") == "recovered"
+    print("✅ half-open 시험 호출 성공 후 복구")
+
+
+def test_unlaunched_secondary_keeps_half_open_trial():
+    clock = FakeClock()
+    primary = StubProvider("primary", lambda prompt: "from primary")
+    secondary = StubProvider("secondary", fail)
+    failover = FailoverLLMProvider([primary, secondary], failure_threshold=1, reset_timeout=30.0,
+                                   default_hedge_delay=5.0, clock=clock)
+    # 2순위 회로를 차단한 뒤 half-open 상태로 만듦
+    breaker = failover._breakers[id(secondary)]
+    breaker.record_failure()
+    clock.now += 31
+
+    assert failover.generate_content("hi") == "from primary"
+    # 2순위에는 요청을 보내지 않았으므로 시험 호출이 예약된 채 남으면 안 됨
+    assert breaker.allow()
+    print("✅ 보내지 않은 제공자의 시험 호출을 예약하지 않음")
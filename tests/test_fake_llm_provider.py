@@ -0,0 +1,88 @@
+"""
+FakeLLMProvider 검증 (네트워크 호출 없음)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_llm_provider import FakeLLMProvider
+from src.llm_provider import LLMError, get_llm_provider
+from src.llm_retry import RetryPolicy
+
+
+def _no_sleep_policy(max_attempts=3):
+    return RetryPolicy(max_attempts=max_attempts, base_delay=0.01, sleep=lambda _: None)
+
+
+def test_structured_outputs_follow_schema():
+    provider = FakeLLMProvider(latency_median=0, latency_sigma=0, seed=1)
+
+    refined = provider.generate_structured(
+        "Refine product name: '[무료배송] 스텐 텀블러 500ml (1P)'.",
+        {"type": "object", "properties": {"name": {"type": "string", "minLength": 2}}, "required": ["name"]},
+    )
+    assert refined["name"] == "스텐 텀블러 500ml"
+
+    curated = provider.generate_structured(
+        "Select 10 safe keywords from this list for '텀블러'.\nList: 텀블러, 보온병, 스텐컵",
+        {"type": "object", "properties": {"keywords": {"type": "array", "items": {"type": "string"}, "minItems": 1}}},
+    )
+    assert curated["keywords"] == ["텀블러", "보온병", "스텐컵"]
+    print("✅ 스키마에 맞는 결정적 응답")
+
+
+def test_rate_limit_injection_goes_through_retry_policy():
+    provider = FakeLLMProvider(latency_median=0, latency_sigma=0, rate_limit_rate=1.0,
+                               retry_after=0.5, retry_policy=_no_sleep_policy())
+    try:
+        provider.generate_content("상품명: \"텀블러\"")
+        assert False, "LLMError가 발생해야 합니다."
+    except LLMError as e:
+        assert e.attempts == 3
+
+    stats = provider.metrics.snapshot()
+    assert stats["calls"] == 1 and stats["errors"] == 1 and stats["retries"] == 2
+    print("✅ 429 주입 시 재시도 후 실패 기록")
+
+
+def test_seeded_error_rate_is_reproducible():
+    def outcomes(seed):
+        provider = FakeLLMProvider(latency_median=0, latency_sigma=0, error_rate=0.5, seed=seed,
+                                   retry_policy=_no_sleep_policy(max_attempts=1))
+        results = []
+        for i in range(20):
+            try:
+                provider.generate_content(f"상품명: \"상품{i}\"")
+                results.append(True)
+            except LLMError:
+                results.append(False)
+        return results
+
+    first = outcomes(7)
+    assert first == outcomes(7)
+    assert 0 < first.count(False) < 20
+    print("✅ 시드 고정 시 오류 주입 재현")
+
+
+def test_factory_reads_env():
+    os.environ["FAKE_LLM_LATENCY_MEDIAN"] = "0"
+    os.environ["FAKE_LLM_ERROR_RATE"] = "0.25"
+    try:
+        provider = get_llm_provider("fake", model="fake-large")
+    finally:
+        del os.environ["FAKE_LLM_LATENCY_MEDIAN"]
+        del os.environ["FAKE_LLM_ERROR_RATE"]
+
+    assert isinstance(provider, FakeLLMProvider)
+    assert provider.is_configured()
+    assert provider.model_name == "fake-large"
+    assert provider.latency_median == 0 and provider.error_rate == 0.25
+    print("✅ get_llm_provider('fake') 환경변수 설정")
+
+
+if __name__ == "__main__":
+    test_structured_outputs_follow_schema()
+    test_rate_limit_injection_goes_through_retry_policy()
+    test_seeded_error_rate_is_reproducible()
+    test_factory_reads_env()
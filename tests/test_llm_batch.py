@@ -0,0 +1,185 @@
+"""
+LLM 배치 실행 모드 검증 (로컬 대역 서버/FakeLLMProvider 사용, 네트워크 호출 없음)
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_llm_provider import FakeLLMProvider
+from src.llm_batch import BatchCancelled, LLMBatch, OpenAIBatchBackend, ProviderBatchBackend
+from src.llm_metrics import LLMMetrics
+from src.llm_retry import RetryPolicy
+
+REFINE_SCHEMA = {"type": "object", "properties": {"name": {"type": "string", "minLength": 2}}, "required": ["name"]}
+
+
+def _refine_batch(names):
+    batch = LLMBatch()
+    for i, name in enumerate(names):
+        batch.add(str(i), f"Refine product name: '{name}'.", REFINE_SCHEMA)
+    return batch
+
+
+def test_provider_backend_maps_results_to_ids():
+    provider = FakeLLMProvider(latency_median=0, latency_sigma=0, seed=1)
+    results = _refine_batch(["[특가] 텀블러 (1P)", "스텐 냄비 10p"]).run(ProviderBatchBackend(provider))
+
+    assert results == {"0": {"name": "텀블러"}, "1": {"name": "스텐 냄비 10개"}}
+    print("✅ 배치 결과를 custom_id별로 매핑")
+
+
+def test_failed_items_are_left_out():
+    provider = FakeLLMProvider(latency_median=0, latency_sigma=0, error_rate=1.0,
+                               retry_policy=RetryPolicy(max_attempts=1))
+    results = _refine_batch(["텀블러"]).run(ProviderBatchBackend(provider))
+
+    assert results == {}
+    print("✅ 실패 항목은 결과에서 제외 (호출 측 실시간 보완)")
+
+
+def test_openai_backend_against_stub_server():
+    openai = pytest.importorskip("openai")
+    from tests.openai_batch_stub import BatchStubServer
+
+    with BatchStubServer(polls_until_complete=3, fail_ids={"2"}) as stub:
+        client = openai.OpenAI(api_key="sk-test", base_url=stub.url, max_retries=0)
+        metrics = LLMMetrics()
+        backend = OpenAIBatchBackend(client, "gpt-5-nano", metrics=metrics, poll_interval=0)
+        results = _refine_batch(["[특가] 텀블러 (1P)", "스텐 냄비 10p", "실패 상품"]).run(backend)
+
+    assert results == {"0": {"name": "텀블러"}, "1": {"name": "스텐 냄비 10개"}}
+    stats = metrics.snapshot()
+    assert stats["calls"] == 2 and stats["prompt_tokens"] > 0
+    print("✅ OpenAI Batch 제출/폴링/결과 매핑")
+
+
+class FakeBatches:
+    """상태가 계속 진행 중인 배치 API 대역"""
+
+    def __init__(self):
+        self.created = 0
+        self.retrieved = []
+        self.cancelled = []
+
+    def create(self, **kwargs):
+        self.created += 1
+        return type("Batch", (), {"id": "batch_new"})()
+
+    def retrieve(self, batch_id):
+        self.retrieved.append(batch_id)
+        return type("Batch", (), {"status": "in_progress", "output_file_id": None})()
+
+    def cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+
+
+class FakeClient:
+    def __init__(self):
+        self.batches = FakeBatches()
+        self.files = type("Files", (), {"create": lambda self, **kwargs: type("File", (), {"id": "file_1"})()})()
+
+
+def test_openai_backend_stops_when_job_cancelled():
+    client = FakeClient()
+    polls = []
+    submitted = []
+    backend = OpenAIBatchBackend(client, "gpt-5-nano", poll_interval=0, sleep=lambda delay: None,
+                                 should_cancel=lambda: polls.append(1) or len(polls) >= 2,
+                                 on_submit=submitted.append)
+
+    with pytest.raises(BatchCancelled):
+        _refine_batch(["텀블러"]).run(backend)
+
+    assert submitted == ["batch_new"]
+    assert client.batches.cancelled == ["batch_new"]
+    assert len(client.batches.retrieved) == 2
+    print("✅ 작업 취소 시 배치 취소 후 대기 중단")
+
+
+def test_openai_backend_resumes_submitted_batch():
+    client = FakeClient()
+    backend = OpenAIBatchBackend(client, "gpt-5-nano", poll_interval=0, sleep=lambda delay: None,
+                                 should_cancel=lambda: True, resume_batch_id="batch_old")
+
+    with pytest.raises(BatchCancelled):
+        _refine_batch(["텀블러"]).run(backend)
+
+    assert client.batches.created == 0
+    assert client.batches.retrieved == ["batch_old"]
+    print("✅ 이전에 제출한 배치를 다시 제출하지 않고 이어서 대기")
+
+
+class FakeJob:
+    id = "job_1"
+
+    def __init__(self, status="processing"):
+        self.status = status
+        self.meta_data = {}
+
+
+class FakeDB:
+    def __init__(self):
+        self.commits = 0
+
+    def refresh(self, job):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+
+class SubmittingBackend:
+    """on_submit으로 배치 ID를 알린 뒤 결과를 반환하거나 취소되는 배치 백엔드 대역"""
+
+    def __init__(self, cancel=False, on_submit=None, **kwargs):
+        self.cancel = cancel
+        self.on_submit = on_submit
+        self.resume_batch_id = kwargs.get("resume_batch_id")
+
+    def run(self, items):
+        self.on_submit("batch_1")
+        if self.cancel:
+            raise BatchCancelled("cancelled")
+        return {item.custom_id: '{"name": "텀블러"}' for item in items}
+
+
+def test_worker_clears_batch_id_after_results_applied(monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    from src.api import worker
+
+    monkeypatch.setattr(worker, "get_batch_backend", lambda provider, **kwargs: SubmittingBackend(**kwargs))
+    db, job, meta_data = FakeDB(), FakeJob(), {}
+
+    results = worker._run_batch(db, job, meta_data, "refine", _refine_batch(["텀블러"]), provider=None)
+    assert results == {"0": {"name": "텀블러"}}
+    assert meta_data["llm_batches"] == {"refine": "batch_1"}  # 반영 전 재실행은 이어서 대기
+
+    worker._clear_batch_id(db, job, meta_data, "refine")
+    assert meta_data["llm_batches"] == {} and job.meta_data["llm_batches"] == {}
+    print("✅ 배치 결과 반영 후 배치 ID 삭제")
+
+
+def test_worker_propagates_job_cancel(monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    from src.api import worker
+
+    monkeypatch.setattr(worker, "get_batch_backend",
+                        lambda provider, **kwargs: SubmittingBackend(cancel=True, **kwargs))
+    db, job, meta_data = FakeDB(), FakeJob(), {}
+
+    with pytest.raises(worker.JobCancelled):
+        worker._run_batch(db, job, meta_data, "refine", _refine_batch(["텀블러"]), provider=None)
+    assert meta_data["llm_batches"] == {}
+
+    with pytest.raises(worker.JobCancelled):
+        worker._set_economy_progress(db, FakeJob(status="cancelled"), meta_data, 30)
+    print("✅ 작업 취소는 빈 결과 대신 JobCancelled로 전달")
+
+
+if __name__ == "__main__":
+    test_provider_backend_maps_results_to_ids()
+    test_failed_items_are_left_out()
+    test_openai_backend_against_stub_server()
@@ -0,0 +1,46 @@
+"""
+LLM 호출 지표 집계 검증 (네트워크 호출 없음)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.llm_metrics import LLMMetrics
+
+
+def test_snapshot_totals_and_percentiles():
+    metrics = LLMMetrics()
+    for i in range(1, 101):
+        metrics.record("Gemini", "gemini-2.0-flash", latency=i / 100, prompt_tokens=10, completion_tokens=5,
+                       retries=1 if i % 10 == 0 else 0)
+    metrics.record("OpenAI", "gpt-5-nano", latency=2.0, prompt_tokens=7, estimated=True,
+                   error=TimeoutError("timeout"))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["calls"] == 101 and snapshot["errors"] == 1 and snapshot["retries"] == 10
+    assert (snapshot["prompt_tokens"], snapshot["completion_tokens"]) == (1007, 500)
+
+    gemini = snapshot["by_model"]["Gemini:gemini-2.0-flash"]
+    assert gemini["latency_p95"] == 0.96
+    assert gemini["latency_avg"] == 0.505 and gemini["latency_max"] == 1.0
+    openai = snapshot["by_model"]["OpenAI:gpt-5-nano"]
+    assert openai["errors_by_class"] == {"TimeoutError": 1} and openai["estimated_token_calls"] == 1
+    print("✅ 토큰/재시도 합계와 p95 집계")
+
+
+def test_records_propagate_to_parent():
+    registry = LLMMetrics()
+    job_a, job_b = LLMMetrics(parent=registry), LLMMetrics(parent=registry)
+    job_a.record("Gemini", "gemini-2.0-flash", latency=0.2, prompt_tokens=3)
+    job_b.record("Gemini", "gemini-2.0-flash", latency=0.4, prompt_tokens=4, retries=2)
+
+    assert job_a.snapshot()["calls"] == 1
+    totals = registry.snapshot()
+    assert (totals["calls"], totals["prompt_tokens"], totals["retries"]) == (2, 7, 2)
+    print("✅ 작업 지표가 전역 레지스트리에 함께 누적")
+
+
+if __name__ == "__main__":
+    test_snapshot_totals_and_percentiles()
+    test_records_propagate_to_parent()
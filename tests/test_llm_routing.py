@@ -0,0 +1,79 @@
+"""
+작업별 LLM 모델 라우팅 검증 (FakeLLMProvider 사용, 네트워크 호출 없음)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("FAKE_LLM_LATENCY_MEDIAN", "0")
+
+from src.llm_provider import (
+    LONG_CURATION_SIZE,
+    TASK_CURATION,
+    TASK_REFINE,
+    TASK_VARIATION,
+    FailoverLLMProvider,
+    get_llm_provider,
+    resolve_routing,
+)
+
+ROUTES = {
+    TASK_VARIATION: "fake-small",
+    TASK_CURATION: "fake-model",
+    "curation_long": "fake-large",
+}
+
+
+def test_routes_by_task_and_size():
+    provider = get_llm_provider("fake", routing=ROUTES)
+
+    assert provider.for_task(TASK_VARIATION).model_name == "fake-small"
+    assert provider.for_task(TASK_REFINE).model_name == "fake-model"  # 표에 없으면 기본 모델
+    assert provider.for_task(TASK_CURATION, 5).model_name == "fake-model"
+    assert provider.for_task(TASK_CURATION, LONG_CURATION_SIZE).model_name == "fake-large"
+    # 모델별 하위 제공자는 재사용
+    assert provider.for_task(TASK_VARIATION) is provider.for_task(TASK_VARIATION)
+    print("✅ 작업/입력 크기별 모델 선택")
+
+
+def test_routed_calls_share_metrics():
+    provider = get_llm_provider("fake", routing=ROUTES)
+    provider.for_task(TASK_VARIATION).generate_content('상품명: "텀블러"\n변형:')
+    provider.for_task(TASK_CURATION, LONG_CURATION_SIZE).generate_content("keyword List: 텀블러")
+
+    stats = provider.metrics.snapshot()
+    assert stats["calls"] == 2
+    assert set(stats["by_model"]) == {"Fake:fake-small", "Fake:fake-large"}
+    print("✅ 라우팅된 호출 지표가 하나의 집계기로 모임")
+
+
+def test_failover_routes_each_provider():
+    primary = get_llm_provider("fake", routing=ROUTES)
+    secondary = get_llm_provider("fake", model="fake-backup")
+    failover = FailoverLLMProvider([primary, secondary])
+
+    routed = failover.for_task(TASK_VARIATION)
+    assert [p.model_name for p in routed.providers] == ["fake-small", "fake-backup"]
+    assert failover.for_task(TASK_VARIATION) is routed
+    routed.generate_content('상품명: "텀블러"\n변형:')
+    assert failover.metrics.snapshot()["by_model"]["Fake:fake-small"]["calls"] == 1
+    print("✅ Failover 하위 제공자별 라우팅")
+
+
+def test_resolve_routing_preferences():
+    # 설정하지 않으면 사용자가 선택한 모델만 사용
+    assert resolve_routing("gemini") is None
+    assert resolve_routing("gemini", False) is None
+    assert resolve_routing("gemini", True)[TASK_VARIATION] == "gemini-2.0-flash-lite"
+    assert resolve_routing("gemini", {"variation": "gemini-2.0-flash"})[TASK_VARIATION] == "gemini-2.0-flash"
+    routes = resolve_routing("openai", {"openai": {"curation": "gpt-5-mini"}, "gemini": {"curation": "x"}})
+    assert routes[TASK_CURATION] == "gpt-5-mini"
+    print("✅ 사용자 라우팅 설정 반영")
+
+
+if __name__ == "__main__":
+    test_routes_by_task_and_size()
+    test_routed_calls_share_metrics()
+    test_failover_routes_each_provider()
+    test_resolve_routing_preferences()
@@ -0,0 +1,93 @@
+"""
+옵션 변형 상품명 묶기 검증 (네트워크 호출 없음)
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.name_clustering import cluster_rows, expand_cluster_results, split_variant
+
+
+def _rows(names):
+    return [{'row_index': i + 2, 'product_name': name, 'input_keyword': ''} for i, name in enumerate(names)]
+
+
+def test_split_variant():
+    assert split_variant("남성 기모 후드티 블랙 XL") == ("남성 기모 후드티", ["블랙", "XL"])
+    assert split_variant("스텐 냄비 [색상: 실버] 10p") == ("스텐 냄비", ["실버", "10p"])
+    assert split_variant("모델 AB-1234 무선 청소기 - 화이트") == ("모델 AB-1234 무선 청소기", ["화이트"])
+    assert split_variant("욕실 선반 30x40cm / 2단") == ("욕실 선반", ["30x40cm", "2단"])
+    assert split_variant("남성 기모 후드티 (네이비/L)") == ("남성 기모 후드티", ["네이비", "L"])
+    assert split_variant("블랙 가죽 지갑") == ("블랙 가죽 지갑", [])  # 상품명 중간 단어는 옵션 아님
+    assert split_variant("비타민 C") == ("비타민 C", [])  # 한 글자는 다른 옵션 뒤에서만 사이즈
+    print("✅ 기본 상품명/옵션 분리")
+
+
+def test_product_nouns_are_not_options():
+    assert split_variant("핸드 크림 50ml") == ("핸드 크림", ["50ml"])
+    assert split_variant("레드 와인 잔 2개") == ("레드 와인 잔", ["2개"])
+    assert split_variant("와인 오프너 골드") == ("와인 오프너 골드", [])
+
+    clusters = cluster_rows(_rows(["핸드 크림 50ml", "핸드 크림 100ml", "핸드 워시 500ml", "와인 잔", "와인 오프너"]))
+    assert [c.base_name for c in clusters] == ["핸드 크림", "핸드 워시", "와인 잔", "와인 오프너"]
+    assert [len(c.rows) for c in clusters] == [2, 1, 1, 1]
+    print("✅ 크림/와인 같은 상품 명사는 옵션으로 자르지 않음")
+
+
+def test_variants_share_one_representative():
+    rows = _rows([
+        "남성 기모 후드티 블랙 XL",
+        "원목 도마",
+        "남성 기모 후드티 그레이 M",
+        "남성 기모 후드티 (네이비/L)",
+        "",
+    ])
+    clusters = cluster_rows(rows)
+
+    assert [len(c.rows) for c in clusters] == [3, 1, 1]
+    assert clusters[0].base_name == "남성 기모 후드티"
+    assert clusters[0].representative is rows[0]  # 기본 상품명이 아닌 첫 행의 원래 상품명으로 처리
+    assert clusters[1].representative is rows[1]
+    print("✅ 옵션 변형 행 묶기")
+
+
+def test_results_fan_out_with_row_options():
+    rows = _rows(["남성 기모 후드티 블랙 XL", "남성 기모 후드티 그레이 10p", "원목 도마"])
+    clusters = cluster_rows(rows)
+    results = [
+        {'row_index': 2, 'image_url': '', 'refined_name': '기모 후드티 블랙 XL', 'keywords': '후드티', 'category_code': '50000805'},
+        {'row_index': 4, 'image_url': '', 'refined_name': '원목 도마', 'keywords': '도마', 'category_code': '50001234'},
+    ]
+
+    expanded = sorted(expand_cluster_results(clusters, results), key=lambda x: x['row_index'])
+
+    assert [item['refined_name'] for item in expanded] == ["기모 후드티 블랙 XL", "기모 후드티 그레이 10개", "원목 도마"]
+    assert [item['category_code'] for item in expanded] == ["50000805", "50000805", "50001234"]
+    assert expanded[1]['keywords'] == "후드티"
+    print("✅ 대표 결과를 옵션별 행에 펼침")
+
+
+def test_jobs_without_flag_process_every_row():
+    pytest.importorskip("sqlalchemy")
+    from src.api.worker import _plan_variant_clusters
+
+    rows = _rows(["종이컵 10개", "종이컵 100개", "원목 도마"])
+    meta_data = {}
+    # 플래그를 보내지 않는 기존 클라이언트: 행마다 결과 하나 (묶지 않음)
+    clusters, work_list = _plan_variant_clusters(rows, {"refine_name": True}, meta_data)
+    assert clusters is None and work_list == rows and "stats" not in meta_data
+
+    clusters, work_list = _plan_variant_clusters(rows, {"cluster_variants": True}, meta_data)
+    assert len(work_list) == 2 and meta_data["stats"]["variants"] == {"rows": 3, "clusters": 2}
+    print("✅ 옵션 묶기는 켠 작업에만 적용")
+
+
+if __name__ == "__main__":
+    test_split_variant()
+    test_product_nouns_are_not_options()
+    test_variants_share_one_representative()
+    test_results_fan_out_with_row_options()
+    test_jobs_without_flag_process_every_row()
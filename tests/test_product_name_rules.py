@@ -0,0 +1,50 @@
+"""
+상품명 규칙 기반 사전 정제 검증 (네트워크 호출 없음)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_llm_provider import FakeLLMProvider
+from src.product_name_processor import ProductNameProcessor
+from src.product_name_rules import pre_clean
+
+
+def test_clean_names_skip_llm():
+    cases = {
+        "[무료배송] 스텐 텀블러 500ml (1P)": "스텐 텀블러 500ml",
+        "스텐 냄비 10p": "스텐 냄비 10개",
+        "국내발송 1+1 욕실 선반 30x40cm": "욕실 선반 30x40cm",
+        "★특가★ 원목 도마 (화이트)": "원목 도마",
+        "다이소 수납 바구니": "수납 바구니",
+        "New Balance 러닝 운동화": "러닝 운동화",
+    }
+    for original, expected in cases.items():
+        assert pre_clean(original) == (expected, False), original
+    print("✅ 규칙 정제만으로 충분한 상품명")
+
+
+def test_ambiguous_names_need_llm():
+    for name in ["삼성갤럭시케이스", "모델 AB-1234 무선 청소기", "나이키 운동화", "[특가]"]:
+        assert pre_clean(name)[1] is True, name
+    print("✅ 브랜드/모델명 의심 상품명은 LLM 정제")
+
+
+def test_processor_records_skip_rate():
+    provider = FakeLLMProvider(latency_median=0, latency_sigma=0)
+    processor = ProductNameProcessor(llm_provider=provider)
+
+    assert processor.refine_product_name("스텐 냄비 10p") == "스텐 냄비 10개"
+    processor.refine_product_name("모델 AB-1234 무선 청소기")
+
+    assert processor.stats.snapshot() == {"total": 2, "rule_only": 1, "llm": 1, "skip_rate": 0.5,
+                                        "cache_hits": 0, "cache_misses": 0}
+    assert provider.metrics.snapshot()["calls"] == 1
+    print("✅ LLM 생략 건수 집계")
+
+
+if __name__ == "__main__":
+    test_clean_names_skip_llm()
+    test_ambiguous_names_need_llm()
+    test_processor_records_skip_rate()
@@ -0,0 +1,49 @@
+"""
+토큰 버킷 속도 제한 검증 (가짜 시계 사용, 실제 대기 없음)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+def test_burst_then_steady_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(4):
+        bucket.acquire()
+
+    # 처음 2건은 즉시, 이후는 초당 2건 (0.5초 간격)
+    assert clock.sleeps == [0.5, 0.5]
+    print("✅ 버스트 후 초당 한도 유지")
+
+
+def test_tokens_refill_while_idle():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, burst=3, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        bucket.acquire()
+
+    clock.now += 10  # 쉬는 동안 최대 burst까지만 충전
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert clock.sleeps == [1.0]
+    print("✅ 대기 중 토큰 충전")
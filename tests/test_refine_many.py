@@ -0,0 +1,77 @@
+"""
+상품명 일괄 정제(refine_many) 검증 (FakeLLMProvider 사용, 네트워크 호출 없음)
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_llm_provider import FakeLLMProvider
+from src.product_name_processor import ProductNameProcessor
+
+# 규칙 정제만으로는 끝나지 않는 상품명 (영문 모델명 포함)
+NAMES = [f"모델 AB-{i:04d} 무선 청소기" for i in range(5)]
+
+
+class DroppingProvider(FakeLLMProvider):
+    """일괄 요청 응답에서 지정한 순번 항목을 빼거나 망가뜨리는 가짜 제공자"""
+
+    def __init__(self, drop=(), blank=()):
+        super().__init__(latency_median=0, latency_sigma=0)
+        self.drop, self.blank = set(drop), set(blank)
+
+    def _generate_json(self, prompt, schema):
+        raw = super()._generate_json(prompt, schema)
+        if "items" not in schema.get("properties", {}):
+            return raw
+        value = json.loads(raw)
+        value["items"] = [dict(item, name="" if item["index"] in self.blank else item["name"])
+                          for item in value["items"] if item["index"] not in self.drop]
+        return json.dumps(value, ensure_ascii=False)
+
+
+def test_refine_many_uses_one_request_per_group():
+    provider = FakeLLMProvider(latency_median=0, latency_sigma=0)
+    processor = ProductNameProcessor(llm_provider=provider)
+
+    refined = processor.refine_many(NAMES + ["스텐 냄비 10p"], batch_size=3)
+
+    assert refined[:5] == [f"모델 AB {i:04d} 무선 청소기" for i in range(5)]
+    assert refined[5] == "스텐 냄비 10개"  # 규칙 정제만으로 처리
+    # LLM 대상 5건 → 3건 + 2건 두 번의 요청
+    assert provider.metrics.snapshot()["calls"] == 2
+    print("✅ 묶음당 1회 요청으로 정제")
+
+
+def test_only_failed_items_are_retried():
+    provider = DroppingProvider(drop={1}, blank={3})
+    processor = ProductNameProcessor(llm_provider=provider)
+
+    refined = processor.refine_many(NAMES)
+
+    assert refined == [f"모델 AB {i:04d} 무선 청소기" for i in range(5)]
+    # 일괄 요청 1회 + 누락(1)/빈 값(3) 항목 개별 재요청 2회
+    assert provider.metrics.snapshot()["calls"] == 3
+    print("✅ 실패 항목만 개별 재요청")
+
+
+def test_refine_with_variations_uses_one_request():
+    provider = FakeLLMProvider(latency_median=0, latency_sigma=0)
+    processor = ProductNameProcessor(llm_provider=provider)
+
+    refined, variations = processor.refine_with_variations(NAMES[0])
+    assert refined == "모델 AB 0000 무선 청소기"
+    assert variations and all(isinstance(v, str) for v in variations)
+    assert provider.metrics.snapshot()["calls"] == 1
+
+    # 규칙 정제만으로 끝나면 LLM을 호출하지 않고 변형은 키워드 단계에서 생성
+    assert processor.refine_with_variations("스텐 냄비 10p") == ("스텐 냄비 10개", None)
+    assert provider.metrics.snapshot()["calls"] == 1
+    print("✅ 정제 + 변형 생성을 1회 요청으로 처리")
+
+
+if __name__ == "__main__":
+    test_refine_many_uses_one_request_per_group()
+    test_only_failed_items_are_retried()
+    test_refine_with_variations_uses_one_request()
@@ -0,0 +1,154 @@
+"""
+정제 결과 영속 캐시 검증 (SQLite 백엔드, FakeLLMProvider 사용, 네트워크 호출 없음)
+"""
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_llm_provider import FakeLLMProvider
+from src.product_name_processor import ProductNameProcessor, refine_cache_scope
+from src import result_cache
+from src.result_cache import RedisCacheBackend, ResultCache, SQLiteCacheBackend
+
+NAMES = [f"모델 AB-{i:04d} 무선 청소기" for i in range(4)]
+
+
+def _processor(cache, model="fake-model"):
+    provider = FakeLLMProvider(model=model, latency_median=0, latency_sigma=0)
+    return ProductNameProcessor(llm_provider=provider, cache=cache), provider
+
+
+def test_cache_skips_llm_across_processors(tmp_path):
+    cache = ResultCache("refined_name", SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")))
+
+    first, first_provider = _processor(cache)
+    expected = first.refine_many(NAMES)
+    assert first_provider.metrics.snapshot()["calls"] == 1
+
+    # 새 작업(새 프로세서)에서도 같은 상품명/프롬프트/모델이면 LLM을 호출하지 않음
+    second, second_provider = _processor(cache)
+    assert second.refine_many(NAMES) == expected
+    assert second.refine_product_name(NAMES[0]) == expected[0]
+    assert second_provider.metrics.snapshot()["calls"] == 0
+    assert second.stats.snapshot()["cache_hits"] == 5
+    print("✅ 캐시 적중 시 LLM 호출 생략")
+
+
+def test_prompt_and_model_change_miss(tmp_path):
+    cache = ResultCache("refined_name", SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")))
+    processor, _ = _processor(cache)
+    processor.refine_product_name(NAMES[0], prompt_template="A {{product_name}}")
+
+    other_prompt, provider = _processor(cache)
+    other_prompt.refine_product_name(NAMES[0], prompt_template="B {{product_name}}")
+    other_model, model_provider = _processor(cache, model="fake-large")
+    other_model.refine_product_name(NAMES[0], prompt_template="A {{product_name}}")
+
+    assert provider.metrics.snapshot()["calls"] == 1
+    assert model_provider.metrics.snapshot()["calls"] == 1
+
+    # 프롬프트 수정 시 범위 무효화 → 다시 정제
+    cache.invalidate(refine_cache_scope("A {{product_name}}"))
+    again, again_provider = _processor(cache)
+    again.refine_product_name(NAMES[0], prompt_template="A {{product_name}}")
+    assert again_provider.metrics.snapshot()["calls"] == 1
+    print("✅ 프롬프트/모델별 캐시 분리 및 무효화")
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = ResultCache("refined_name", SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")), ttl=0.05)
+    cache.set("scope", "key", "value")
+    assert cache.get("scope", "key") == "value"
+    time.sleep(0.1)
+    assert cache.get("scope", "key") is None
+    print("✅ TTL 만료")
+
+
+def _count_rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def test_expired_rows_purged_on_open_and_every_n_writes(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SQLiteCacheBackend(path)
+    backend.set("ns", "scope", "old", "1", ttl=-1)
+    assert _count_rows(path) == 1
+
+    # 다시 열면 만료 항목 정리
+    backend = SQLiteCacheBackend(path)
+    assert _count_rows(path) == 0
+
+    monkeypatch.setattr(result_cache, "PURGE_EVERY_WRITES", 3)
+    backend.set("ns", "scope", "old", "1", ttl=-1)
+    backend.set("ns", "scope", "a", "1", ttl=60)
+    assert _count_rows(path) == 2
+    backend.set("ns", "scope", "b", "1", ttl=60)
+    assert _count_rows(path) == 2
+    print("✅ 만료 항목 정리 (열 때, N번 저장마다)")
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+
+def test_redis_generation_cached_briefly():
+    now = [0.0]
+    redis = FakeRedis()
+    cache = ResultCache("ns", RedisCacheBackend(redis, generation_ttl=5.0, clock=lambda: now[0]))
+
+    cache.set("scope", "key", "v1")
+    assert cache.get("scope", "key") == "v1"
+    assert redis.gets == 2  # 세대 GET 1회 + 항목 GET 1회
+
+    # 같은 프로세스의 무효화는 바로 반영
+    cache.invalidate("scope")
+    assert cache.get("scope", "key") is None
+
+    # 다른 프로세스의 무효화는 세대 캐시가 만료된 뒤 반영
+    other = ResultCache("ns", RedisCacheBackend(redis, generation_ttl=5.0, clock=lambda: now[0]))
+    cache.set("scope", "key", "v2")
+    assert other.get("scope", "key") == "v2"
+    cache.invalidate("scope")
+    assert other.get("scope", "key") == "v2"
+    now[0] += 6
+    assert other.get("scope", "key") is None
+    print("✅ Redis 세대 번호 단기 캐시")
+
+
+def test_unavailable_cache_file_disables_cache(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_PATH", str(blocker / "cache.sqlite3"))
+    monkeypatch.setenv("RESULT_CACHE_BACKEND", "sqlite")
+    monkeypatch.setattr(result_cache, "_backend", None)
+    monkeypatch.setattr(result_cache, "_backend_ready", False)
+
+    cache = result_cache.get_result_cache("refined_name")
+    assert cache.backend is None
+    cache.set("scope", "key", "value")
+    assert cache.get("scope", "key") is None
+    print("✅ 캐시 파일을 열 수 없으면 캐시 없이 처리")
+
+
+def test_explicit_zero_ttl_not_replaced_by_default(tmp_path):
+    cache = ResultCache("refined_name", SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")), ttl=3600)
+    cache.set("scope", "key", "value", ttl=0)
+    assert cache.get("scope", "key") is None
+    print("✅ ttl=0은 기본 보관 기간으로 바뀌지 않음")
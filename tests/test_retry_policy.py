@@ -0,0 +1,112 @@
+"""
+RetryPolicy 동작 검증 (네트워크 호출 없음)
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.llm_retry import RetryError, RetryPolicy, get_retry_after, is_retryable
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse(status_code, headers)
+
+
+def make_policy(**kwargs):
+    sleeps = []
+    policy = RetryPolicy(sleep=sleeps.append, rng=random.Random(0), **kwargs)
+    return policy, sleeps
+
+
+def test_retries_then_succeeds():
+    policy, sleeps = make_policy(max_attempts=4)
+    calls = []
+
+    def func(remaining):
+        calls.append(remaining)
+        if len(calls) < 3:
+            raise FakeAPIError(429)
+        return "ok"
+
+    assert policy.call(func) == "ok"
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    # Full Jitter: 0 ~ base * 2^attempt 범위
+    assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
+    print("✅ 429 재시도 후 성공")
+
+
+def test_fatal_error_not_retried():
+    policy, sleeps = make_policy()
+    calls = []
+
+    def func(remaining):
+        calls.append(1)
+        raise FakeAPIError(401)
+
+    try:
+        policy.call(func)
+        assert False, "401은 즉시 실패해야 합니다"
+    except FakeAPIError:
+        pass
+    assert len(calls) == 1 and not sleeps
+    print("✅ 401은 재시도하지 않음")
+
+
+def test_retry_after_header_is_honored():
+    policy, sleeps = make_policy(max_attempts=2)
+    calls = []
+
+    def func(remaining):
+        calls.append(1)
+        if len(calls) == 1:
+            raise FakeAPIError(503, headers={"retry-after": "7"})
+        return "ok"
+
+    assert policy.call(func) == "ok"
+    assert sleeps == [7.0]
+    assert get_retry_after(Exception("429 Quota exceeded. Please retry in 12.5s.")) == 12.5
+    print("✅ Retry-After 준수")
+
+
+def test_deadline_stops_retries():
+    policy, sleeps = make_policy(max_attempts=10, deadline=5.0)
+
+    def func(remaining):
+        raise FakeAPIError(429, headers={"retry-after": "30"})
+
+    try:
+        policy.call(func)
+        assert False, "데드라인 초과 시 RetryError가 발생해야 합니다"
+    except RetryError as e:
+        assert e.attempts == 1
+    assert not sleeps
+    print("✅ 데드라인 초과 시 중단")
+
+
+def test_error_classification():
+    assert is_retryable(FakeAPIError(500))
+    assert is_retryable(TimeoutError())
+    assert is_retryable(Exception("429 Resource has been exhausted"))
+    assert not is_retryable(FakeAPIError(400))
+    assert not is_retryable(ValueError("API key is not configured"))
+    print("✅ 오류 분류")
+
+
+if __name__ == "__main__":
+    test_retries_then_succeeds()
+    test_fatal_error_not_retried()
+    test_retry_after_header_is_honored()
+    test_deadline_stops_retries()
+    test_error_classification()
@@ -0,0 +1,92 @@
+"""
+네이버 쇼핑 검색 공용 조회 검증 (카테고리 다수결, 상품명 시드, 검색 1회 공유)
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("dotenv")
+
+from src import shopping_search
+from src.category_processor import CategoryProcessor
+from src.shopping_search import ShoppingSearch, title_keywords, vote_category
+
+ITEMS = [
+    {"title": "<b>스텐</b> 편수 냄비 18cm", "category1": "생활/건강", "category2": "주방용품", "category3": "냄비", "category4": "편수냄비"},
+    {"title": "통3중 <b>스텐</b> 양수 냄비", "category1": "생활/건강", "category2": "주방용품", "category3": "냄비", "category4": "양수냄비"},
+    {"title": "인덕션 스텐 편수 냄비", "category1": "생활/건강", "category2": "주방용품", "category3": "냄비", "category4": "편수냄비"},
+]
+
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {"items": ITEMS}
+
+
+class FakeSession:
+    def __init__(self):
+        self.params = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.params.append(params)
+        return FakeResponse()
+
+
+def test_vote_category_prefers_majority_then_rank():
+    items = shopping_search._parse_items(ITEMS)
+    assert items[0]["title"] == "스텐 편수 냄비 18cm"
+    assert vote_category(items) == "생활/건강>주방용품>냄비>편수냄비"
+    assert vote_category([{"category": "A>B"}, {"category": "A>C"}]) == "A>B"
+    assert vote_category([]) == ""
+    print("✅ 상위 결과 카테고리 다수결")
+
+
+def test_title_keywords_shared_across_titles():
+    seeds = title_keywords(shopping_search._parse_items(ITEMS))
+    assert seeds[:2] == ["스텐", "냄비"]
+    assert "편수 냄비" in seeds and "스텐 편수" in seeds
+    assert "18cm" not in seeds and "통3중" not in seeds  # 한 상품명에만 나온 단어 제외
+    print("✅ 여러 상품명에 나온 단어/두 단어 묶음 시드")
+
+
+def test_category_and_seeds_share_one_request(tmp_path, monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(shopping_search, "get_http_session", lambda name, credential="": session)
+    search = ShoppingSearch("id", "secret")
+    processor = CategoryProcessor(mapping_file_path=str(tmp_path / "missing.xls"), shopping_search=search)
+
+    assert processor.get_category_code("스텐 냄비") == "확인필요(생활/건강>주방용품>냄비>편수냄비)"
+    assert "편수 냄비" in search.seed_keywords("스텐  냄비")
+
+    assert len(session.params) == 1
+    assert session.params[0]["display"] == shopping_search.SHOPPING_SEARCH_DISPLAY
+    print("✅ 카테고리/키워드 시드가 검색 1회 공유")
+
+
+def test_seed_fetch_not_counted_as_category_hit(monkeypatch):
+    session = FakeSession()
+    limiter_keys = []
+    monkeypatch.setattr(shopping_search, "get_http_session", lambda name, credential="": session)
+    real_limiter = shopping_search.get_rate_limiter
+    monkeypatch.setattr(shopping_search, "get_rate_limiter",
+                        lambda key, rate: limiter_keys.append(key) or real_limiter(key, rate))
+    processor = CategoryProcessor(mapping_file_path="missing.xls", api_keys={"naver_client_id": "raw-client-id",
+                                                                               "naver_client_secret": "secret"})
+    search = processor.shopping_search
+
+    # 키워드 시드가 먼저 검색 → 카테고리 조회는 같은 결과를 쓰지만 첫 조회는 API 호출(미스)로만 집계
+    search.seed_keywords("스텐 냄비")
+    processor.get_category_code("스텐 냄비")
+    assert processor.stats.snapshot()["api_calls"] == 1
+    assert processor.stats.snapshot()["cache_hits"] == 0
+
+    # 같은 검색어를 다시 조회하면 호출을 생략했으므로 적중
+    processor.get_category_code("스텐 냄비")
+    assert processor.stats.snapshot()["cache_hits"] == 1
+    assert limiter_keys and all("raw-client-id" not in key for key in limiter_keys)
+    print("✅ 시드 단계의 첫 검색은 카테고리 캐시 적중으로 세지 않음")
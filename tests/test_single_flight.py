@@ -0,0 +1,67 @@
+"""
+SingleFlight 요청 병합 검증 (네트워크 호출 없음)
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.single_flight import SingleFlight
+
+
+def test_concurrent_identical_requests_share_one_call():
+    group = SingleFlight()
+    calls = []
+    results = []
+
+    def slow_request():
+        calls.append(1)
+        time.sleep(0.2)
+        return "정제된 상품명"
+
+    threads = [threading.Thread(target=lambda: results.append(group.do("same prompt", slow_request))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ["정제된 상품명"] * 8
+    assert group.coalesced == 7
+    print("✅ 동시 동일 요청 1회 호출로 병합")
+
+
+def test_errors_are_shared_and_not_cached():
+    group = SingleFlight()
+    calls = []
+
+    def failing_request():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError("429")
+
+    errors = []
+
+    def worker():
+        try:
+            group.do("key", failing_request)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1 and len(errors) == 4
+    # 실행이 끝난 뒤에는 새 호출이 실행되어야 함 (캐시 아님)
+    assert group.do("key", lambda: "ok") == "ok"
+    print("✅ 예외 공유 및 완료 후 재실행")
+
+
+if __name__ == "__main__":
+    test_concurrent_identical_requests_share_one_call()
+    test_errors_are_shared_and_not_cached()
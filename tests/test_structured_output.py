@@ -0,0 +1,43 @@
+"""
+구조화(JSON) 출력 파싱/검증 유틸리티 검증 (네트워크 호출 없음)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.llm_structured import extract_json, validate
+
+CURATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "keywords": {"type": "array", "items": {"type": "string"}, "minItems": 1},
+    },
+    "required": ["keywords"],
+}
+
+
+def test_extract_json_variants():
+    assert extract_json('{"name": "미니 소품함"}') == {"name": "미니 소품함"}
+    assert extract_json('```json\n{"name": "미니 소품함"}\n```') == {"name": "미니 소품함"}
+    assert extract_json('결과입니다: {"keywords": ["원형 건조대"]} 감사합니다') == {"keywords": ["원형 건조대"]}
+    try:
+        extract_json("원형 건조대, 빨래 건조대")
+        assert False, "JSON이 아닌 응답은 ValueError"
+    except ValueError:
+        pass
+    print("✅ JSON 추출")
+
+
+def test_validate_schema():
+    assert validate({"keywords": ["원형 건조대", "빨래 건조대"]}, CURATION_SCHEMA) == []
+    assert validate({"keywords": []}, CURATION_SCHEMA)
+    assert validate({"keywords": [1, 2]}, CURATION_SCHEMA)
+    assert validate({"items": ["원형 건조대"]}, CURATION_SCHEMA)
+    assert validate(["원형 건조대"], CURATION_SCHEMA)
+    print("✅ 스키마 검증")
+
+
+if __name__ == "__main__":
+    test_extract_json_variants()
+    test_validate_schema()